@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import math
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dataset import cache_dir_for
+
+BUCKET_DAYS = {"day": 1, "week": 7}
+SCOPE_COLUMNS = {"all": None, "language": "Detected Language", "media": "Nama Media"}
+ALL_KEY = "Semua"
+DEFAULT_HALFLIFE = {"day": 14, "week": 8}
+MIN_PERIODS = 8
+Z_THRESHOLD = 3.0
+# Media berekor panjang: hanya media terbesar yang dipantau sebagai deret sendiri
+MEDIA_SERIES = 50
+# Skor sentimen dari sedikit berita terlalu berisik untuk dijadikan alarm
+MIN_SCORE_VOLUME = 5
+SCORE_STD_FLOOR = 0.05
+
+HISTORY_FIELDS = ["volume", "vol_expected", "vol_std", "score", "score_expected", "score_std"]
+
+# =============================================================================
+# BUCKETS
+# =============================================================================
+def bucket_ids(days, bucket):
+    """Integer bucket id of every date: days since epoch, or Monday-based weeks since epoch."""
+    d = np.asarray(days, dtype="datetime64[D]").astype(np.int64)
+    # 1970-01-01 adalah hari Kamis; +3 membuat minggu dimulai hari Senin
+    return d if bucket == "day" else (d + 3) // 7
+
+def bucket_start(ids, bucket):
+    ids = np.asarray(ids, dtype=np.int64)
+    d = ids if bucket == "day" else ids * 7 - 3
+    return d.astype("datetime64[D]")
+
+def series_keys(cells, scope):
+    """Series tracked for ``scope``: one overall series, every language, or the largest media."""
+    col = SCOPE_COLUMNS[scope]
+    if col is None:
+        return [ALL_KEY]
+    totals = cells.groupby(col, observed=True)["count"].sum()
+    totals = totals[totals > 0]
+    if scope == "media":
+        return totals.sort_values(ascending=False, kind="stable").head(MEDIA_SERIES).index.astype(str).tolist()
+    return sorted(totals.index.astype(str).tolist())
+
+def series_counts(cells, bucket, scope, keys, since=None):
+    """Dense bucket × series arrays of volume, positive and negative counts.
+
+    ``cells`` are count-cube cells. Buckets run from the first bucket after
+    ``since`` (or the first bucket with data) to the last bucket with data,
+    including empty buckets. Cells of series not in ``keys`` are ignored.
+    """
+    ids = bucket_ids(cells["day"].to_numpy(), bucket)
+    keep = np.ones(len(ids), dtype=bool) if since is None else ids > since
+    col = SCOPE_COLUMNS[scope]
+    if col is None:
+        series = np.zeros(int(keep.sum()), dtype=np.int64)
+    else:
+        series = pd.Index(keys).get_indexer(cells[col].to_numpy()[keep].astype(str)).astype(np.int64)
+    count = cells["count"].to_numpy()[keep].astype(np.float64)
+    positive = (cells["sentiment"] == "positive").to_numpy()[keep]
+    negative = (cells["sentiment"] == "negative").to_numpy()[keep]
+    tracked = series >= 0
+    ids, series, count = ids[keep][tracked], series[tracked], count[tracked]
+    positive, negative = positive[tracked], negative[tracked]
+
+    n_series = len(keys)
+    if len(ids) == 0:
+        empty = np.zeros((0, n_series))
+        return np.zeros(0, dtype=np.int64), empty, empty.copy(), empty.copy()
+    lo = ids.min() if since is None else since + 1
+    buckets = np.arange(lo, ids.max() + 1)
+    flat = (ids - lo) * n_series + series
+    size = len(buckets) * n_series
+
+    def dense(weights):
+        return np.bincount(flat, weights=weights, minlength=size).reshape(len(buckets), n_series)
+
+    return (
+        buckets,
+        dense(count),
+        dense(np.where(positive, count, 0.0)),
+        dense(np.where(negative, count, 0.0)),
+    )
+
+def sent_scores(volume, pos, neg):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(volume > 0, (pos - neg) / volume, np.nan)
+
+# =============================================================================
+# EWMA STATE
+# =============================================================================
+class AnomalyState:
+    """Exponentially weighted baselines of volume and sent_score per series.
+
+    Every complete bucket updates the mean and variance of each series in O(1)
+    (vectorized across series), after recording the baseline it was judged
+    against. The baselines and that per-bucket history are persisted, so a
+    growing archive only feeds its new buckets through ``update``. The last
+    bucket with data may still be incomplete: it is scored against the current
+    baselines (``provisional``) but only committed once a later bucket exists.
+    Rows arriving later for already committed buckets are not re-scored.
+    """
+
+    def __init__(self, bucket, scope, keys, halflife=None):
+        self.bucket = bucket
+        self.scope = scope
+        self.keys = list(keys)
+        self.halflife = float(halflife or DEFAULT_HALFLIFE[bucket])
+        self.alpha = 1.0 - math.exp(math.log(0.5) / self.halflife)
+        self.through = None
+        n = len(self.keys)
+        self.n_volume = np.zeros(n, dtype=np.int64)
+        self.n_score = np.zeros(n, dtype=np.int64)
+        self.vol_mean = np.zeros(n)
+        self.vol_var = np.zeros(n)
+        self.score_mean = np.zeros(n)
+        self.score_var = np.zeros(n)
+        self.history_ids = np.zeros(0, dtype=np.int64)
+        self.history = {f: np.zeros((0, n), dtype=np.float32) for f in HISTORY_FIELDS}
+        self.provisional = None
+
+    def _baseline(self, mean, var, n):
+        expected = np.where(n >= MIN_PERIODS, mean, np.nan)
+        return expected, np.sqrt(var)
+
+    def _step(self, volume, score):
+        """Judge one bucket against the baselines, then fold it into them."""
+        vol_expected, vol_std = self._baseline(self.vol_mean, self.vol_var, self.n_volume)
+        score_expected, score_std = self._baseline(self.score_mean, self.score_var, self.n_score)
+        row = {
+            "volume": volume, "vol_expected": vol_expected, "vol_std": vol_std,
+            "score": score, "score_expected": score_expected, "score_std": score_std,
+        }
+        # Volume dihitung sejak berita pertama deret itu; skor hanya bila ada berita
+        for x, valid, mean, var, n in (
+            (volume, (self.n_volume > 0) | (volume > 0), self.vol_mean, self.vol_var, self.n_volume),
+            (score, ~np.isnan(score), self.score_mean, self.score_var, self.n_score),
+        ):
+            first = valid & (n == 0)
+            mean[first] = x[first]
+            upd = valid & (n > 0)
+            diff = np.where(upd, x - mean, 0.0)
+            incr = self.alpha * diff
+            mean += incr
+            var[upd] = (1.0 - self.alpha) * (var[upd] + diff[upd] * incr[upd])
+            n[valid] += 1
+        return row
+
+    def _add_keys(self, keys):
+        new = [k for k in keys if k not in self.keys]
+        if not new:
+            return
+        self.keys += new
+        grow = len(new)
+        for name in ("n_volume", "n_score"):
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros(grow, dtype=np.int64)]))
+        for name in ("vol_mean", "vol_var", "score_mean", "score_var"):
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros(grow)]))
+        pad = np.zeros((len(self.history_ids), grow), dtype=np.float32)
+        # Deret baru belum punya riwayat: volume 0, sisanya kosong
+        self.history = {
+            f: np.hstack([a, pad if f == "volume" else np.full_like(pad, np.nan)]) for f, a in self.history.items()
+        }
+
+    def update(self, cells):
+        """Feed the buckets of ``cells`` after ``through``; returns the number committed."""
+        if self.scope == "language":
+            self._add_keys(series_keys(cells, self.scope))
+        buckets, volume, pos, neg = series_counts(cells, self.bucket, self.scope, self.keys, since=self.through)
+        score = sent_scores(volume, pos, neg)
+        rows = [self._step(volume[i], score[i]) for i in range(len(buckets) - 1)]
+        if rows:
+            self.history_ids = np.concatenate([self.history_ids, buckets[:-1]])
+            for f in HISTORY_FIELDS:
+                self.history[f] = np.vstack([self.history[f], np.array([r[f] for r in rows], dtype=np.float32)])
+            self.through = int(buckets[-2])
+        self.provisional = None
+        if len(buckets):
+            vol_expected, vol_std = self._baseline(self.vol_mean, self.vol_var, self.n_volume)
+            score_expected, score_std = self._baseline(self.score_mean, self.score_var, self.n_score)
+            self.provisional = (int(buckets[-1]), {
+                "volume": volume[-1], "vol_expected": vol_expected, "vol_std": vol_std,
+                "score": score[-1], "score_expected": score_expected, "score_std": score_std,
+            })
+        return len(rows)
+
+    # -------------------------------------------------------------------------
+    # OUTPUT
+    # -------------------------------------------------------------------------
+    def frame(self, key):
+        """Per-bucket baselines, z-scores and flags of one series, provisional bucket last."""
+        j = self.keys.index(key)
+        ids = self.history_ids
+        cols = {f: self.history[f][:, j].astype(np.float64) for f in HISTORY_FIELDS}
+        provisional = np.zeros(len(ids), dtype=bool)
+        if self.provisional is not None:
+            pid, row = self.provisional
+            ids = np.append(ids, pid)
+            cols = {f: np.append(cols[f], np.float64(row[f][j])) for f in HISTORY_FIELDS}
+            provisional = np.append(provisional, True)
+        out = pd.DataFrame({"bucket": bucket_start(ids, self.bucket), **cols, "provisional": provisional})
+        return score_frame(out)
+
+    def alerts(self, since=None):
+        """Flagged buckets of every series (after bucket id ``since``), newest first."""
+        parts = []
+        for j, key in enumerate(self.keys):
+            f = self.frame(key)
+            f.insert(1, "series", key)
+            parts.append(f[f["flag_volume"] | f["flag_score"]])
+        if not parts:
+            return pd.DataFrame()
+        alerts = pd.concat(parts, ignore_index=True)
+        if since is not None:
+            alerts = alerts[alerts["bucket"] > bucket_start([since], self.bucket)[0]]
+        return alerts.sort_values(["bucket", "series"], ascending=[False, True]).reset_index(drop=True)
+
+def score_frame(f):
+    """Add z-scores and flags to a frame of values and baselines."""
+    # Batas bawah std volume mengikuti Poisson (sqrt dari ekspektasi), supaya
+    # deret kecil yang hampir konstan tidak memicu alarm karena std ~ 0
+    vol_std = np.maximum(f["vol_std"], np.sqrt(f["vol_expected"].clip(lower=1.0)))
+    score_std = np.maximum(f["score_std"], SCORE_STD_FLOOR)
+    f["z_volume"] = (f["volume"] - f["vol_expected"]) / vol_std
+    f["z_score"] = (f["score"] - f["score_expected"]) / score_std
+    f["flag_volume"] = f["z_volume"].abs() >= Z_THRESHOLD
+    f["flag_score"] = (f["z_score"].abs() >= Z_THRESHOLD) & (f["volume"] >= MIN_SCORE_VOLUME)
+    return f
+
+# =============================================================================
+# PERSISTENCE
+# =============================================================================
+def anomaly_state_path(path, bucket, scope):
+    # Tidak memakai versi dataset: state ikut tumbuh bersama arsip (lihat update)
+    return cache_dir_for(path) / f"anomaly-{bucket}-{scope}.npz"
+
+def save_anomaly_state(state, target):
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    arrays = {
+        "config": np.array([state.bucket, state.scope], dtype=object).astype(str),
+        "halflife": np.array(state.halflife),
+        "through": np.array(-1 if state.through is None else state.through, dtype=np.int64),
+        "keys": np.frombuffer("\n".join(state.keys).encode("utf-8"), dtype=np.uint8),
+        "history_ids": state.history_ids,
+    }
+    for name in ("n_volume", "n_score", "vol_mean", "vol_var", "score_mean", "score_var"):
+        arrays[name] = getattr(state, name)
+    for f in HISTORY_FIELDS:
+        arrays[f"history_{f}"] = state.history[f]
+    tmp = target.with_name(target.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        np.savez(fh, **arrays)
+    os.replace(tmp, target)
+
+def read_anomaly_state(source):
+    with np.load(source) as z:
+        bucket, scope = z["config"].tolist()
+        raw = z["keys"].tobytes().decode("utf-8")
+        state = AnomalyState(bucket, scope, raw.split("\n") if raw else [], float(z["halflife"]))
+        through = int(z["through"])
+        state.through = None if through < 0 else through
+        for name in ("n_volume", "n_score", "vol_mean", "vol_var", "score_mean", "score_var"):
+            setattr(state, name, z[name])
+        state.history_ids = z["history_ids"]
+        state.history = {f: z[f"history_{f}"] for f in HISTORY_FIELDS}
+    return state
+
+def _consistent(state, cells):
+    """The last committed bucket still has the counts it was scored with."""
+    if state.through is None:
+        return True
+    _, volume, _, _ = series_counts(cells, state.bucket, state.scope, state.keys, since=state.through - 1)
+    if len(volume) == 0:
+        return False
+    return np.array_equal(volume[0].astype(np.float32), state.history["volume"][-1])
+
+def load_anomaly_state(path, cells, bucket="day", scope="all"):
+    """Load the persisted state of dataset ``path``, bring it up to date with ``cells`` and save it.
+
+    ``cells`` is the full count cube. Only buckets after the last committed one
+    are processed; the state is rebuilt from scratch when it is missing,
+    unreadable, or no longer matches the data (e.g. the CSV was replaced).
+    """
+    target = anomaly_state_path(path, bucket, scope)
+    state = None
+    if target.exists():
+        try:
+            state = read_anomaly_state(target)
+            if not _consistent(state, cells):
+                state = None
+        except (OSError, ValueError, KeyError):
+            state = None
+    if state is None:
+        state = AnomalyState(bucket, scope, series_keys(cells, scope))
+    if state.update(cells):
+        try:
+            save_anomaly_state(state, target)
+        except OSError:
+            pass
+    return state
+
+def refresh_anomaly_states(path, cells):
+    """Bring every persisted state of dataset ``path`` up to date.
+
+    Returns ``{(bucket, scope): alerts}`` with the alerts of the buckets that
+    were not committed before (including the provisional one).
+    """
+    out = {}
+    for target in sorted(cache_dir_for(path).glob("anomaly-*.npz")):
+        _, bucket, scope = target.stem.split("-", 2)
+        if bucket not in BUCKET_DAYS or scope not in SCOPE_COLUMNS:
+            continue
+        try:
+            before = read_anomaly_state(target).through
+        except (OSError, ValueError, KeyError):
+            before = None
+        out[(bucket, scope)] = load_anomaly_state(path, cells, bucket, scope).alerts(since=before)
+    return out
+
+if __name__ == "__main__":
+    # Pemakaian: python anomaly.py "publik persepsi.csv"
+    # Membandingkan pembaruan inkremental dengan membangun ulang dari awal, lalu
+    # mencetak alarm terbaru.
+    from cube import build_cube
+    from dataset import load_dataset
+
+    df = load_dataset(sys.argv[1])
+    cells = build_cube(df)
+    for bucket in BUCKET_DAYS:
+        for scope in SCOPE_COLUMNS:
+            keys = series_keys(cells, scope)
+            t0 = time.perf_counter()
+            full = AnomalyState(bucket, scope, keys)
+            full.update(cells)
+            t1 = time.perf_counter()
+            # Setengah pertama, lalu sisanya secara inkremental
+            cut = cells["day"].quantile(0.5)
+            inc = AnomalyState(bucket, scope, keys)
+            inc.update(cells[cells["day"] <= cut])
+            t2 = time.perf_counter()
+            n_tail = inc.update(cells)
+            t3 = time.perf_counter()
+            for f in HISTORY_FIELDS:
+                assert np.allclose(full.history[f], inc.history[f], equal_nan=True), (bucket, scope, f)
+            print(
+                f"{bucket}/{scope}: {len(keys)} series, full {len(full.history_ids)} buckets in {(t1 - t0) * 1000:.0f} ms,"
+                f" tail {n_tail} buckets in {(t3 - t2) * 1000:.0f} ms · {len(full.alerts())} alerts"
+            )
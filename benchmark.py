@@ -0,0 +1,153 @@
+"""Benchmark fungsi inti dashboard tanpa Streamlit, di atas korpus sintetis.
+
+    python benchmark.py --rows 10000 100000 1000000 --output bench/baseline.json
+    python benchmark.py --rows 10000 100000 1000000 --compare bench/baseline.json
+
+Setiap ukuran memakai korpus dari synthetic.py (dibuat sekali di --workdir
+dan dipakai ulang). Waktu dan pertumbuhan memori puncak dicatat per fungsi
+dan ditulis ke JSON, sehingga hasil sebelum dan sesudah perubahan bisa
+dibandingkan dengan --compare.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cube import build_cube, ratio_by_time
+from dataset import cache_path, load_dataset
+from instrumentation import measure
+from ngram_index import build_ngram_index
+from synthetic import write_corpus
+from text_normalize import normalize_series
+from wordclouds import render_wordcloud, wordcloud_frequencies
+
+DEFAULT_ROWS = [10_000, 100_000]
+DEFAULT_WORKDIR = "bench"
+DEFAULT_TOLERANCE = 1.2
+
+# =============================================================================
+# CASES
+# =============================================================================
+def corpus_path(workdir, n_rows, seed):
+    return Path(workdir) / f"corpus-{n_rows}-seed{seed}" / "publik persepsi.csv"
+
+def bench_cases(path):
+    """Yield ``(name, fn, repeat)``; cases run in order and may reuse earlier results."""
+    state = {}
+
+    def load_cold():
+        cache_path(path).unlink(missing_ok=True)
+        state["df"] = load_dataset(path)
+
+    yield "load_data (cold: CSV + derive)", load_cold, 1
+    yield "load_data (warm: Arrow cache)", lambda: load_dataset(path), 3
+    df = state["df"]
+    rows = np.arange(len(df))
+
+    yield "clean_text (normalize_series)", lambda: normalize_series(df["Judul Berita"]), 1
+
+    def build_ngrams():
+        state["ngrams"] = build_ngram_index(df["processed_text"])
+
+    yield "top_ngrams (build index)", build_ngrams, 1
+    yield "top_ngrams (bigram top 20, all rows)", lambda: state["ngrams"].top(rows, n=2, top_n=20), 3
+    yield "top_ngrams (bigram top 20, 10% rows)", lambda: state["ngrams"].top(rows[::10], n=2, top_n=20), 3
+
+    def build():
+        state["cube"] = build_cube(df)
+
+    yield "compute_ratio_by_time (build cube)", build, 1
+    for granularity in ("week", "month", "quarter", "year"):
+        yield f"compute_ratio_by_time ({granularity})", lambda g=granularity: ratio_by_time(state["cube"], g), 3
+
+    yield "render_wordcloud (frequencies)", lambda: wordcloud_frequencies(state["ngrams"], rows, 120), 3
+    frequencies = wordcloud_frequencies(state["ngrams"], rows, 120)
+    yield "render_wordcloud (png)", lambda: render_wordcloud(frequencies, "#0b1220", "Greens", 120), 1
+
+def run_benchmarks(row_counts, workdir=DEFAULT_WORKDIR, seed=0, progress=print):
+    results = []
+    for n_rows in row_counts:
+        path = corpus_path(workdir, n_rows, seed)
+        if not path.exists():
+            t0 = time.perf_counter()
+            write_corpus(path, n_rows, seed)
+            progress(f"korpus {n_rows:,} baris dibuat dalam {time.perf_counter() - t0:.1f} s")
+        for name, fn, repeat in bench_cases(path):
+            elapsed, peak = measure(fn, repeat=repeat)
+            results.append({"name": name, "rows": n_rows, "ms": elapsed * 1000, "peak_mb": peak / 2**20, "repeat": repeat})
+            progress(f"{n_rows:>10,}  {name:<42} {elapsed * 1000:>10.1f} ms  {peak / 2**20:>8.1f} MB")
+    return results
+
+# =============================================================================
+# REPORT
+# =============================================================================
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Pair every result with the baseline entry of the same name and size.
+
+    Returns ``[(result, baseline_result, ratio)]`` and the pairs slower than
+    ``tolerance`` × baseline.
+    """
+    previous = {(r["name"], r["rows"]): r for r in baseline["results"]}
+    pairs = []
+    for r in results:
+        old = previous.get((r["name"], r["rows"]))
+        if old:
+            pairs.append((r, old, r["ms"] / max(old["ms"], 1e-9)))
+    return pairs, [p for p in pairs if p[2] > tolerance]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark fungsi inti dashboard di atas korpus sintetis.")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="Ukuran korpus, mis. 10000 100000 10000000")
+    parser.add_argument("--workdir", default=DEFAULT_WORKDIR, help="Direktori korpus sintetis dan cache-nya")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Tulis hasil ke file JSON ini (baseline)")
+    parser.add_argument("--compare", help="Bandingkan dengan baseline JSON ini")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Rasio waktu yang dianggap regresi")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run_benchmarks(args.rows, args.workdir, args.seed)
+    report = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "seed": args.seed, "environment": environment(), "results": results}
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"hasil ditulis ke {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        pairs, regressions = compare(results, baseline, args.tolerance)
+        print(f"\nDibandingkan dengan {args.compare} (commit {baseline['environment'].get('commit')}):")
+        for r, old, ratio in pairs:
+            flag = "  REGRESI" if ratio > args.tolerance else ""
+            print(f"{r['rows']:>10,}  {r['name']:<42} {old['ms']:>10.1f} -> {r['ms']:>10.1f} ms ({ratio:.2f}x){flag}")
+        if regressions:
+            sys.exit(f"{len(regressions)} benchmark lebih lambat dari {args.tolerance:.2f}x baseline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from dataset import SENTIMENT_ORDER, cache_dir_for, dataset_version, read_arrow, write_arrow
+from time_buckets import PERIOD_COLUMNS, add_period_keys, period_labels, period_start
+
+CUBE_DIMENSIONS = ["day", "sentiment", "Detected Language", "Nama Media"]
+CUBE_MEASURES = ["count", "conf_sum", "conf_n", "words_sum", "words_n", "title_words_sum"]
+
+# =============================================================================
+# COUNT CUBE
+# =============================================================================
+def build_cube(df):
+    """Aggregate articles into day × sentiment × language × media cells.
+
+    Every cell carries the article count plus the sums needed to rebuild the
+    KPI averages (confidence, text_word_count, title_word_count) without going
+    back to the articles. Empty combinations are not stored. Calendar columns
+    (year, year_month, quarter, day_name) and the integer period keys of
+    time_buckets are derived per cell so every time-series chart is a groupby
+    over the cube only.
+    """
+    base = pd.DataFrame({
+        "day": df["Waktu Terbit"].dt.normalize(),
+        "sentiment": df["sentiment"],
+        "Detected Language": df["Detected Language"],
+        "Nama Media": df["Nama Media"],
+        "confidence": df["confidence"],
+        "text_word_count": df["text_word_count"],
+        "title_word_count": df["title_word_count"],
+    })
+    cube = (
+        base.groupby(CUBE_DIMENSIONS, observed=True, sort=True)
+        .agg(
+            count=("sentiment", "size"),
+            conf_sum=("confidence", "sum"),
+            conf_n=("confidence", "count"),
+            words_sum=("text_word_count", "sum"),
+            words_n=("text_word_count", "count"),
+            title_words_sum=("title_word_count", "sum"),
+        )
+        .reset_index()
+    )
+    return add_calendar_columns(cube)
+
+def merge_cubes(cube, other):
+    """Add the cells of ``other`` (e.g. the cube of newly ingested rows) to ``cube``."""
+    cells = pd.concat([cube[CUBE_DIMENSIONS + CUBE_MEASURES], other[CUBE_DIMENSIONS + CUBE_MEASURES]], ignore_index=True)
+    for col in CUBE_DIMENSIONS[1:]:
+        cells[col] = cells[col].astype(str).astype("category")
+    merged = cells.groupby(CUBE_DIMENSIONS, observed=True, sort=True)[CUBE_MEASURES].sum().reset_index()
+    return add_calendar_columns(merged)
+
+def add_calendar_columns(cube):
+    day = cube["day"]
+    cube["year"] = day.dt.year
+    cube["month"] = day.dt.month
+    cube["year_month"] = day.dt.strftime("%Y-%m")
+    cube["quarter"] = day.dt.to_period("Q").astype(str)
+    cube["day_name"] = day.dt.day_name()
+    return add_period_keys(cube, "day")
+
+def sentiment_counts(cells, key):
+    """Article counts per ``key`` value (rows) and sentiment (columns)."""
+    return (
+        cells.groupby([key, "sentiment"], observed=True)["count"].sum()
+        .unstack(fill_value=0)
+    )
+
+def ratio_by_time(cells, granularity="month"):
+    """Return DataFrame with time column and positive/negative ratio.
+
+    ``cells`` is a slice of the count cube, so groups are summed over
+    ``count``. Groups are keyed on the integer period key of ``granularity``
+    (month, quarter, week or year), which already sorts chronologically.
+    """
+    ratio = sentiment_counts(cells, PERIOD_COLUMNS[granularity])
+    ratio.columns = [str(c) for c in ratio.columns]
+    # Ensure columns exist
+    for s in SENTIMENT_ORDER:
+        if s not in ratio.columns:
+            ratio[s] = 0
+    ratio["positive_ratio"] = ratio["positive"] / (ratio["positive"] + ratio["negative"] + 1e-9) * 100
+    ratio["negative_ratio"] = ratio["negative"] / (ratio["positive"] + ratio["negative"] + 1e-9) * 100
+    keys = ratio.index.to_numpy()
+    ratio.insert(0, "time_period", period_labels(keys, granularity))
+    ratio["sort_key"] = period_start(keys, granularity)
+    return ratio.reset_index(drop=True)
+
+# =============================================================================
+# PERSISTENCE
+# =============================================================================
+def cube_cache_path(path):
+    path = Path(path)
+    return cache_dir_for(path) / f"{path.stem}-{dataset_version(path)}.cube.arrow"
+
+def load_cube(path, df):
+    """Load the cached cube of dataset ``path``, building it from ``df`` if needed."""
+    target = cube_cache_path(path)
+    if target.exists():
+        try:
+            cube = read_arrow(target)
+            if int(cube["count"].sum()) == len(df):
+                return cube
+        except (OSError, pa.ArrowInvalid):
+            pass
+
+    cube = build_cube(df)
+    try:
+        write_arrow(cube, target)
+    except OSError:
+        pass
+    return cube
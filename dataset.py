@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import os
+import json
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from text_normalize import normalize_series
+from time_buckets import add_period_keys
+
+# Naikkan angka ini setiap kali logika turunan kolom di build_dataset berubah,
+# supaya cache lama otomatis tidak dipakai lagi.
+PREPROCESS_VERSION = 2
+
+SENTIMENT_ORDER = ["positive", "neutral", "negative"]
+CATEGORICAL_COLUMNS = ["Nama Media", "sentiment", "Detected Language"]
+CACHE_DIRNAME = ".cache"
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+def norm_sentiment(s):
+    if pd.isna(s):
+        return np.nan
+    s = str(s).strip().lower()
+    s = (
+        s.replace("positif", "positive")
+         .replace("negatif", "negative")
+         .replace("netral", "neutral")
+    )
+    return s if s in SENTIMENT_ORDER else np.nan
+
+# =============================================================================
+# BUILD
+# =============================================================================
+def build_dataset(path, n_jobs=1):
+    """Parse the raw CSV and derive every column the dashboard uses."""
+    return derive_columns(pd.read_csv(path), n_jobs=n_jobs)
+
+def derive_columns(df, n_jobs=1):
+    """Derive the dashboard columns from raw CSV rows.
+
+    Every derived value depends on its own row only (plus whether the
+    ``stopword`` column has any text), so rows derived in separate batches can
+    be concatenated; see ``append_rows``.
+    """
+    df["Waktu Terbit"] = pd.to_datetime(df["Waktu Terbit"], errors="coerce")
+    df["sentiment"] = df["sentiment"].apply(norm_sentiment)
+    df = df.dropna(subset=["Waktu Terbit", "sentiment"]).copy()
+
+    for col in ["Judul Berita", "Nama Media", "Link Berita", "Clean Text", "Detected Language", "stopword"]:
+        if col not in df.columns:
+            df[col] = ""
+    if "confidence" not in df.columns:
+        df["confidence"] = np.nan
+    if "text_word_count" not in df.columns:
+        df["text_word_count"] = np.nan
+    if "word_count" not in df.columns:
+        df["word_count"] = np.nan
+
+    df["Judul Berita"] = df["Judul Berita"].fillna("(tanpa judul)").astype(str)
+    df["Nama Media"] = df["Nama Media"].fillna("Unknown").astype(str)
+    df["Link Berita"] = df["Link Berita"].fillna("").astype(str)
+    df["Clean Text"] = df["Clean Text"].fillna("").astype(str)
+    df["Detected Language"] = df["Detected Language"].fillna("").astype(str).str.lower()
+    df["stopword"] = df["stopword"].fillna("").astype(str)
+
+    for col in ["confidence", "text_word_count", "word_count"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    df["year"] = df["Waktu Terbit"].dt.year
+    df["month"] = df["Waktu Terbit"].dt.month
+    df["year_month"] = df["Waktu Terbit"].dt.strftime("%Y-%m")
+    df["year_month_dt"] = pd.to_datetime(df["year_month"] + "-01")
+    df["quarter"] = df["Waktu Terbit"].dt.to_period("Q").astype(str)
+    df["day_name"] = df["Waktu Terbit"].dt.day_name()
+    df["week"] = df["Waktu Terbit"].dt.isocalendar().week.astype(int)
+    # Kunci periode integer (month_key, quarter_key, week_key, year_key) untuk grouping
+    add_period_keys(df, "Waktu Terbit")
+    df["sent_score"] = df["sentiment"].map({"positive": 1, "neutral": 0, "negative": -1}).fillna(0)
+
+    if df["stopword"].str.len().sum() > 0:
+        df["processed_text"] = normalize_series(df["stopword"], n_jobs=n_jobs)
+    else:
+        df["processed_text"] = normalize_series(df["Clean Text"], n_jobs=n_jobs)
+
+    df["title_word_count"] = df["Judul Berita"].str.split().apply(len)
+    df["title_len"] = df["Judul Berita"].str.len()
+
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = df[col].astype("category")
+    return df.reset_index(drop=True)
+
+def append_rows(df, new_rows):
+    """Concatenate derived rows after ``df``; row ids of ``df`` are unchanged."""
+    out = pd.concat([df, new_rows], ignore_index=True)
+    for col in CATEGORICAL_COLUMNS:
+        # concat kategori yang berbeda menghasilkan object; gabungkan lewat kodenya
+        parts = [df[col].astype("category"), new_rows[col].astype("category")]
+        categories = parts[0].cat.categories.union(parts[1].cat.categories)
+        codes = [
+            np.append(categories.get_indexer(p.cat.categories), -1)[p.cat.codes.to_numpy()]
+            for p in parts
+        ]
+        out[col] = pd.Categorical.from_codes(np.concatenate(codes), categories=categories)
+    return out
+
+# =============================================================================
+# COLUMNAR CACHE
+# =============================================================================
+def file_digest(path, chunk_size=1 << 20):
+    """Return the sha256 hex digest of a file's content."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def cache_dir_for(path):
+    return Path(path).parent / CACHE_DIRNAME
+
+def source_digest(path):
+    """Content hash of the source file, memoized by (size, mtime) in a sidecar manifest.
+
+    Re-hashing a multi-gigabyte CSV on every start would defeat the cache, so the
+    digest is only recomputed when the file's size or modification time changes.
+    """
+    path = Path(path)
+    stat = path.stat()
+    manifest_path = cache_dir_for(path) / f"{path.name}.digest.json"
+    try:
+        manifest = json.loads(manifest_path.read_text())
+        if manifest["size"] == stat.st_size and manifest["mtime_ns"] == stat.st_mtime_ns:
+            return manifest["sha256"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    digest = file_digest(path)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps({"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}))
+    return digest
+
+def dataset_version(path):
+    """Identifier of the derived dataset: source content hash + preprocessing version."""
+    return f"{source_digest(path)[:16]}-v{PREPROCESS_VERSION}"
+
+def cache_path(path):
+    path = Path(path)
+    return cache_dir_for(path) / f"{path.stem}-{dataset_version(path)}.arrow"
+
+def write_arrow(df, target):
+    """Write a DataFrame as an Arrow IPC file, atomically."""
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp = target.with_suffix(target.suffix + ".tmp")
+    with pa.OSFile(str(tmp), "wb") as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, target)
+
+def read_arrow(source):
+    """Memory-map an Arrow IPC file and return it as a read-only DataFrame.
+
+    ``split_blocks`` keeps every numeric and datetime column a view of the
+    mapping and string columns keep their Arrow buffers, so the data lives in
+    the OS page cache and is shared by every process on the host that maps the
+    same file instead of being copied into each one.
+    """
+    with pa.memory_map(str(source), "r") as mm:
+        table = ipc.open_file(mm).read_all()
+    return table.to_pandas(split_blocks=True, self_destruct=False)
+
+def prune_cache(path, version):
+    """Remove cache artifacts of this source built for any other dataset version."""
+    path = Path(path)
+    for old in cache_dir_for(path).glob(f"{path.stem}-*"):
+        if not old.name.startswith(f"{path.stem}-{version}."):
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+def load_dataset(path):
+    """Load the derived dataset, building and caching it on the first call.
+
+    The cache is an Arrow IPC file next to the source CSV whose name encodes the
+    source content hash and PREPROCESS_VERSION, so an edited CSV or a change in
+    the derivation logic transparently triggers a rebuild. A fresh build is
+    read back from that file, so callers always get the shared mapped frame
+    (see ``read_arrow``) and must treat it as read-only.
+    """
+    target = cache_path(path)
+    if target.exists():
+        try:
+            return read_arrow(target)
+        except (OSError, pa.ArrowInvalid):
+            pass
+
+    df = build_dataset(path)
+    try:
+        write_arrow(df, target)
+        prune_cache(path, dataset_version(path))
+    except OSError:
+        # Direktori read-only: tetap jalan tanpa cache (salinan privat per proses)
+        return df
+    return read_arrow(target)
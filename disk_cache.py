@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+# =============================================================================
+# DISK LRU
+# =============================================================================
+class DiskLRU:
+    """Bytes cache in a directory, bounded by entry count and total size.
+
+    Each entry is one file named after a hash of its key. Reading an entry
+    touches its mtime, so eviction (oldest mtime first) is least-recently-used.
+    Entries survive restarts and are shared by every process using the same
+    directory. An entry larger than ``max_bytes`` is never cached, so it
+    cannot push every other entry out.
+    """
+
+    def __init__(self, directory, suffix=".bin", max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.suffix = suffix
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key):
+        return self.directory / (hashlib.sha256(repr(key).encode("utf-8")).hexdigest()[:32] + self.suffix)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError:
+            # Direktori read-only: tetap jalan tanpa cache
+            return
+        self._evict(keep=path)
+
+    def _evict(self, keep=None):
+        with self._lock:
+            entries = []
+            for p in self.directory.glob("*" + self.suffix):
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, p))
+            entries.sort()
+            total = sum(size for _, size, _ in entries)
+            # Entri yang baru ditulis (keep) tetap dihitung tetapi tidak pernah dibuang;
+            # ukurannya <= max_bytes, jadi loop berhenti paling lambat saat hanya keep tersisa
+            entries = [e for e in entries if e[2] != keep]
+            while entries and (len(entries) + (keep is not None) > self.max_entries or total > self.max_bytes):
+                _, size, p = entries.pop(0)
+                try:
+                    p.unlink()
+                except OSError:
+                    pass
+                total -= size
+                self.evictions += 1
+
+    def get_or_compute(self, key, fn):
+        """Return the cached bytes for ``key``, computing them with ``fn`` on a miss.
+
+        ``fn`` may return None (nothing to cache), which is passed through.
+        """
+        data = self.get(key)
+        if data is None:
+            data = fn()
+            if data is not None:
+                self.put(key, data)
+        return data
+
+    def get_or_write(self, key, write):
+        """Bytes of the entry for ``key``, creating it with ``write(tmp_path)`` on a miss.
+
+        ``write`` streams straight to a temporary file, so the data is never
+        built in memory in another form. The file is renamed into place when
+        complete; if it is larger than ``max_bytes`` it is read back and
+        deleted instead of cached.
+        """
+        data = self.get(key)
+        if data is not None:
+            return data
+        path = self._path(key)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            write(tmp)
+            if tmp.stat().st_size > self.max_bytes:
+                return tmp.read_bytes()
+            os.replace(tmp, path)
+            data = path.read_bytes()
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        self._evict(keep=path)
+        return data
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
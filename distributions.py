@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+KDE_POINTS = 128
+# Sama dengan spanmode="soft" milik go.Violin: kurva diperpanjang 2 bandwidth
+SPAN_BANDWIDTHS = 2.0
+
+# =============================================================================
+# BIN COUNTS
+# =============================================================================
+# Jumlah kata judul adalah bilangan bulat kecil, jadi distribusi lengkap per
+# sentimen cukup disimpan sebagai hitungan per nilai: satu np.bincount atas
+# (grup, nilai). Kuantil, rata-rata dan KDE dihitung dari hitungan itu,
+# sehingga yang dikirim ke Plotly tidak bergantung pada jumlah baris.
+
+def grouped_bincount(values, groups, n_groups, mask=None):
+    """Counts ``[group, value]`` of non-negative integer ``values`` in one ``np.bincount``.
+
+    Rows with a negative group (unknown label) or outside ``mask`` are skipped.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    groups = np.asarray(groups, dtype=np.int64)
+    keep = groups >= 0
+    if mask is not None:
+        keep &= mask
+    values, groups = values[keep], groups[keep]
+    width = int(values.max()) + 1 if len(values) else 1
+    counts = np.bincount(groups * width + values, minlength=n_groups * width)
+    return counts.reshape(n_groups, width)
+
+# =============================================================================
+# SUMMARIES
+# =============================================================================
+def count_quantiles(counts, qs):
+    """Quantiles (``method="lower"``) of every row of a ``[group, value]`` count table.
+
+    Returns ``[group, len(qs)]``; rows without observations get NaN.
+    """
+    cum = np.cumsum(counts, axis=1)
+    n = cum[:, -1:]
+    # Posisi urut ke-k (0-based) dari kuantil q, seperti np.quantile(method="lower")
+    k = np.floor(np.asarray(qs, dtype=np.float64)[None, :] * (n - 1))
+    out = (cum[:, None, :] <= k[:, :, None]).sum(axis=2).astype(np.float64)
+    out[n[:, 0] == 0] = np.nan
+    return out
+
+def silverman_bandwidth(n, std, iqr):
+    """Bandwidth rule used by ``go.Violin``: 1.059 · min(std, IQR / 1.349) · n^(-1/5)."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        spread = np.where(iqr > 0, np.minimum(std, iqr / 1.349), std)
+        return 1.059 * spread * np.power(n, -0.2)
+
+def distribution_summary(counts):
+    """Box statistics of every row of a ``[group, value]`` count table.
+
+    Returns a frame indexed by group position with ``n``, ``mean``, ``std``,
+    ``min``, ``q1``, ``median``, ``q3``, ``max``, ``lowerfence``, ``upperfence``
+    (Tukey fences clipped to the data, as box plots draw them) and ``bandwidth``.
+    """
+    values = np.arange(counts.shape[1], dtype=np.float64)
+    n = counts.sum(axis=1).astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = counts @ values / n
+        std = np.sqrt(counts @ values ** 2 / n - mean ** 2)
+    q = count_quantiles(counts, [0.0, 0.25, 0.5, 0.75, 1.0])
+    out = pd.DataFrame({"n": n, "mean": mean, "std": std, "min": q[:, 0], "q1": q[:, 1], "median": q[:, 2], "q3": q[:, 3], "max": q[:, 4]})
+    iqr = out["q3"] - out["q1"]
+
+    # Pagar Tukey = nilai data terjauh yang masih di dalam 1.5 × IQR dari kuartil
+    present = counts > 0
+    low_limit = (out["q1"] - 1.5 * iqr).to_numpy()[:, None]
+    high_limit = (out["q3"] + 1.5 * iqr).to_numpy()[:, None]
+    inside_low = np.where(present & (values[None, :] >= low_limit), values[None, :], np.inf).min(axis=1)
+    inside_high = np.where(present & (values[None, :] <= high_limit), values[None, :], -np.inf).max(axis=1)
+    out["lowerfence"] = np.where(np.isfinite(inside_low), inside_low, np.nan)
+    out["upperfence"] = np.where(np.isfinite(inside_high), inside_high, np.nan)
+    out["bandwidth"] = silverman_bandwidth(n, std, iqr.to_numpy())
+    return out
+
+def kde_grid(counts, bandwidth, grid):
+    """Gaussian KDE of every row of a count table, evaluated on a shared ``grid``.
+
+    Each distinct value is one kernel weighted by its count, so the cost is
+    ``groups × distinct values × grid points`` whatever the number of rows.
+    """
+    values = np.arange(counts.shape[1], dtype=np.float64)
+    bw = np.where(np.asarray(bandwidth) > 0, bandwidth, 1.0)[:, None, None]
+    z = (grid[None, None, :] - values[None, :, None]) / bw
+    kernels = np.exp(-0.5 * z ** 2) / (bw * np.sqrt(2 * np.pi))
+    n = counts.sum(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.einsum("gv,gvx->gx", counts, kernels) / n
+
+def violin_stats(counts, labels, n_points=KDE_POINTS):
+    """Everything a violin + box chart needs, per group, from a count table.
+
+    Returns ``(summary, grid, density)``: the ``distribution_summary`` frame
+    indexed by ``labels``, the shared KDE grid and ``density[group, grid]``.
+    Density outside a group's soft span (min/max ± 2 bandwidths) is NaN.
+    """
+    summary = distribution_summary(counts)
+    summary.index = pd.Index(labels)
+    bw = summary["bandwidth"].fillna(1.0).to_numpy()
+    lo = np.nanmin(summary["min"] - SPAN_BANDWIDTHS * bw) if summary["n"].sum() else 0.0
+    hi = np.nanmax(summary["max"] + SPAN_BANDWIDTHS * bw) if summary["n"].sum() else 1.0
+    grid = np.linspace(lo, hi, n_points)
+    density = kde_grid(counts, bw, grid)
+    span_lo = (summary["min"] - SPAN_BANDWIDTHS * bw).to_numpy()[:, None]
+    span_hi = (summary["max"] + SPAN_BANDWIDTHS * bw).to_numpy()[:, None]
+    density[(grid[None, :] < span_lo) | (grid[None, :] > span_hi)] = np.nan
+    return summary, grid, density
+
+if __name__ == "__main__":
+    # Pemakaian: python distributions.py "publik persepsi.csv"
+    # Membandingkan ringkasan dari bincount dengan pandas atas baris mentah.
+    from dataset import SENTIMENT_ORDER, load_dataset
+
+    df = load_dataset(sys.argv[1])
+    wc = df["title_word_count"].to_numpy()
+    groups = pd.Index(SENTIMENT_ORDER).get_indexer(df["sentiment"].astype(str))
+
+    t0 = time.perf_counter()
+    counts = grouped_bincount(wc, groups, len(SENTIMENT_ORDER))
+    summary, grid, density = violin_stats(counts, SENTIMENT_ORDER)
+    t1 = time.perf_counter()
+    for i, sent in enumerate(SENTIMENT_ORDER):
+        vals = wc[groups == i]
+        expected = [vals.min(), *np.quantile(vals, [0.25, 0.5, 0.75], method="lower"), vals.max()]
+        assert np.allclose(summary.loc[sent, ["min", "q1", "median", "q3", "max"]], expected), sent
+        assert np.isclose(summary.loc[sent, "mean"], vals.mean()) and np.isclose(summary.loc[sent, "std"], vals.std())
+        # Luas di bawah KDE ≈ 1
+        assert abs(np.nansum(density[i]) * (grid[1] - grid[0]) - 1) < 0.02, sent
+    print(
+        f"{len(df):,} rows -> counts {counts.shape}, KDE {density.shape}"
+        f" · {(t1 - t0) * 1000:.1f} ms · raw payload {len(wc) * 8 / 1024:.0f} KB"
+        f" -> summary {(counts.size + density.size) * 8 / 1024:.1f} KB"
+    )
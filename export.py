@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import gzip
+import sys
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+EXPORT_COLUMNS = [
+    "Judul Berita", "Nama Media", "Waktu Terbit", "Link Berita", "Detected Language", "confidence",
+    "text_word_count", "sentiment", "year", "month", "year_month", "quarter",
+]
+DEFAULT_CHUNK_ROWS = 50_000
+
+# Format -> (ekstensi file, MIME type)
+EXPORT_FORMATS = {
+    "csv.gz": (".csv.gz", "application/gzip"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+    "arrow": (".arrow", "application/vnd.apache.arrow.file"),
+}
+
+# =============================================================================
+# CHUNKED WRITERS
+# =============================================================================
+def _chunks(df, rows, columns, chunk_rows):
+    for start in range(0, len(rows), chunk_rows):
+        yield df.iloc[rows[start:start + chunk_rows]][columns]
+
+def write_export(df, rows, columns, fmt, target, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Write ``df.iloc[rows][columns]`` to ``target`` in ``fmt``, one chunk at a time.
+
+    Only one chunk of rows is materialized at once, so memory stays flat no
+    matter how large the filtered set is.
+    """
+    rows = np.asarray(rows)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"unknown export format: {fmt}")
+    if fmt == "csv.gz":
+        with gzip.open(target, "wt", encoding="utf-8", newline="", compresslevel=1) as f:
+            df.iloc[:0][columns].to_csv(f, index=False)
+            for chunk in _chunks(df, rows, columns, chunk_rows):
+                chunk.to_csv(f, index=False, header=False)
+        return
+
+    schema = pa.Schema.from_pandas(df.iloc[:0][columns], preserve_index=False)
+    with pa.OSFile(str(target), "wb") as sink:
+        if fmt == "parquet":
+            writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        else:
+            writer = ipc.new_file(sink, schema)
+        with writer:
+            for chunk in _chunks(df, rows, columns, chunk_rows):
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+def export_bytes(cache, signature, df, rows, fmt, columns=None):
+    """Contents of the export for a filter signature, writing it on the first request.
+
+    ``cache`` is a ``DiskLRU``; an unchanged filter reuses the file on disk.
+    An export larger than the cache is written, read back and deleted.
+    """
+    columns = [c for c in (columns or EXPORT_COLUMNS) if c in df.columns]
+    return cache.get_or_write((signature, fmt, tuple(columns)), lambda tmp: write_export(df, rows, columns, fmt, tmp))
+
+if __name__ == "__main__":
+    # Pemakaian: python export.py "publik persepsi.csv"
+    # Membandingkan export lama (to_csv penuh di memori) dengan writer per chunk.
+    import tempfile
+    from pathlib import Path
+
+    from dataset import load_dataset
+    from instrumentation import measure
+
+    df = load_dataset(sys.argv[1])
+    rows = np.arange(len(df))
+    columns = [c for c in EXPORT_COLUMNS if c in df.columns]
+    with tempfile.TemporaryDirectory() as tmp:
+        elapsed, peak = measure(lambda: df.iloc[rows][columns].copy().to_csv(index=False).encode("utf-8"), repeat=1)
+        print(f"legacy csv: {elapsed * 1000:.0f} ms, peak RSS growth {peak / 2**20:.1f} MB")
+        for fmt, (ext, _) in EXPORT_FORMATS.items():
+            target = Path(tmp) / f"export{ext}"
+            elapsed, peak = measure(lambda: write_export(df, rows, columns, fmt, target), repeat=1)
+            print(f"{fmt}: {elapsed * 1000:.0f} ms, peak RSS growth {peak / 2**20:.1f} MB, {target.stat().st_size / 2**20:.1f} MB on disk")
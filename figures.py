@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Di atas jumlah titik ini sebuah trace digambar dengan WebGL (Scattergl)
+GL_THRESHOLD = 1000
+# Garis lebih panjang dari ini diringkas dengan LTTB sebelum dikirim ke browser
+MAX_LINE_POINTS = 1500
+FIGURE_CACHE_ENTRIES = 64
+FIGURE_CACHE_BYTES = 64 * 2**20
+
+# =============================================================================
+# LTTB DOWNSAMPLING
+# =============================================================================
+def _as_float(values):
+    values = np.asarray(values)
+    if values.dtype.kind == "M":
+        values = values.astype("datetime64[ns]").view(np.int64)
+    return values.astype(np.float64)
+
+def lttb_indices(x, y, n_out):
+    """Indices of ``n_out`` points chosen by Largest-Triangle-Three-Buckets.
+
+    The first and last points are kept. The points in between are split into
+    ``n_out - 2`` buckets; from each bucket the point forming the largest
+    triangle with the previously kept point and the average of the next bucket
+    is kept, so peaks and dips survive. ``x`` may be numeric or datetime64.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x, y = _as_float(x), _as_float(y)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    lengths = np.diff(edges)
+    # Rata-rata tiap bucket; bucket "berikutnya" dari bucket terakhir adalah titik terakhir
+    avg_x = np.append(np.add.reduceat(x[:n - 1], edges[:-1]) / lengths, x[-1])[1:]
+    avg_y = np.append(np.add.reduceat(np.nan_to_num(y[:n - 1]), edges[:-1]) / lengths, y[-1])[1:]
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - avg_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[i] - y[a]))
+        a = lo + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        out[i + 1] = a
+    return out
+
+# =============================================================================
+# TRACES
+# =============================================================================
+def line_trace(x, y, max_points=MAX_LINE_POINTS, gl_threshold=GL_THRESHOLD, **kwargs):
+    """A line ``go.Scatter``, LTTB-downsampled to ``max_points`` and WebGL when long.
+
+    Array-valued ``customdata``/``text`` follow the kept points. A categorical
+    ``x`` (period labels) is downsampled by position; whole-day datetimes are
+    sent as plain dates to keep the payload small.
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    # Sumbu kategori (label periode) diringkas menurut posisinya
+    basis = x if x.dtype.kind in "iufM" else np.arange(len(x))
+    keep = lttb_indices(basis, y, max_points) if len(x) > max_points else None
+    if keep is not None:
+        x, y = x[keep], y[keep]
+        for name in ("customdata", "text"):
+            if isinstance(kwargs.get(name), np.ndarray):
+                kwargs[name] = kwargs[name][keep]
+    if x.dtype.kind == "M" and (x == x.astype("datetime64[D]")).all():
+        # Tanggal tanpa jam dikirim sebagai "2024-03-01", bukan "2024-03-01T00:00:00"
+        x = np.datetime_as_string(x, unit="D").tolist()
+    trace = go.Scattergl if len(x) > gl_threshold else go.Scatter
+    return trace(x=x, y=y, **kwargs)
+
+# =============================================================================
+# FIGURE CACHE
+# =============================================================================
+class CachedFigure:
+    """A built figure and the size of its JSON payload.
+
+    Streamlit serializes the figure itself on every ``st.plotly_chart``; the
+    cache saves rebuilding it, and ``__sizeof__`` reports the payload so a
+    ``result_cache.LRUCache`` can bound the cache by bytes.
+    """
+
+    __slots__ = ("figure", "payload_bytes")
+
+    def __init__(self, figure):
+        self.figure = figure
+        self.payload_bytes = len(pio.to_json(figure, validate=False))
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + self.payload_bytes
+
+def cached_figure(cache, chart_id, signature, build):
+    """Return the ``CachedFigure`` of ``build()`` for ``(chart_id, signature)``.
+
+    ``signature`` must cover everything the figure depends on: the filter
+    signature plus the chart's own widget values.
+    """
+    return cache.get_or_compute(("figure", chart_id, signature), lambda: CachedFigure(build()))
+
+if __name__ == "__main__":
+    # Pemakaian: python figures.py [jumlah titik]
+    # Membandingkan ukuran payload dan waktu serialisasi garis harian penuh dengan LTTB.
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5 * 365
+    rng = np.random.default_rng(0)
+    x = np.datetime64("2019-10-20") + np.arange(n)
+    y = rng.poisson(50, n).astype(float)
+    y[n // 3] = 400
+
+    keep = lttb_indices(x, y, 300)
+    assert keep[0] == 0 and keep[-1] == n - 1 and np.all(np.diff(keep) > 0)
+    assert n // 3 in keep, "LTTB dropped the spike"
+
+    for label, trace in (("full Scatter", go.Scatter(x=x, y=y, mode="lines")), ("line_trace", line_trace(x, y, mode="lines"))):
+        t0 = time.perf_counter()
+        payload = pio.to_json(go.Figure(trace), validate=False)
+        t1 = time.perf_counter()
+        print(f"{label:<13} {type(trace).__name__:<10} {len(trace.x):>6,} points · {len(payload) / 1024:7.1f} KB · to_json {(t1 - t0) * 1000:.1f} ms")
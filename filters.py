@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import measure
+
+# Dimensi berkardinalitas rendah yang disimpan sebagai bitmap per nilai
+BITMAP_COLUMNS = {
+    "year": "year",
+    "sentiment": "sentiment",
+    "language": "Detected Language",
+}
+
+# =============================================================================
+# FILTER ENGINE
+# =============================================================================
+class FilterEngine:
+    """Global filter over the dataset built from precomputed per-value bitmaps.
+
+    Year, sentiment and language each keep one packed bitmap (``np.packbits``)
+    per distinct value; a filter is an OR of the selected values inside a
+    dimension and an AND across dimensions, done on packed bytes. Media has
+    thousands of values, so it is matched through its categorical codes with a
+    lookup table instead. The result is a boolean mask / row-id array over the
+    rows of the dataset that every tab can share.
+    """
+
+    def __init__(self, df):
+        self.n_rows = len(df)
+        self.bitmaps = {}
+        for dim, col in BITMAP_COLUMNS.items():
+            codes, uniques = pd.factorize(df[col])
+            self.bitmaps[dim] = {
+                (v.item() if hasattr(v, "item") else v): np.packbits(codes == i)
+                for i, v in enumerate(uniques)
+            }
+        media = df["Nama Media"].astype("category")
+        self.media_codes = media.cat.codes.to_numpy()
+        self.media_lookup = {m: i for i, m in enumerate(media.cat.categories)}
+
+    def values(self, dim):
+        return list(self.bitmaps[dim])
+
+    def _union(self, dim, values):
+        out = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        for v in values:
+            bits = self.bitmaps[dim].get(v)
+            if bits is not None:
+                np.bitwise_or(out, bits, out=out)
+        return out
+
+    def mask(self, year_range=None, sentiments=None, languages=None, media=None):
+        """Boolean mask of rows passing every given filter (None/empty = no filter)."""
+        years = None
+        if year_range:
+            years = [y for y in self.bitmaps["year"] if year_range[0] <= y <= year_range[1]]
+        selections = [
+            ("year", years),
+            ("sentiment", sentiments or None),
+            ("language", languages or None),
+        ]
+        bits = None
+        for dim, values in selections:
+            if values is None:
+                continue
+            dim_bits = self._union(dim, values)
+            bits = dim_bits if bits is None else np.bitwise_and(bits, dim_bits, out=bits)
+
+        if bits is None:
+            mask = np.ones(self.n_rows, dtype=bool)
+        else:
+            mask = np.unpackbits(bits, count=self.n_rows).view(bool)
+
+        if media:
+            lut = np.zeros(len(self.media_lookup) + 1, dtype=bool)
+            lut[[self.media_lookup[m] for m in media if m in self.media_lookup]] = True
+            # Kode -1 (nilai kosong) jatuh ke elemen terakhir lut yang selalu False
+            mask &= lut[self.media_codes]
+        return mask
+
+    def rows(self, **filters):
+        """Ascending row ids passing the filters; see ``mask``."""
+        return np.flatnonzero(self.mask(**filters))
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+def legacy_filter(df, year_range, sentiments, languages):
+    """The original dashboard filter chain, kept for comparison."""
+    dff = df.copy()
+    dff = dff[dff["year"].between(year_range[0], year_range[1])]
+    if sentiments:
+        dff = dff[dff["sentiment"].isin(sentiments)]
+    if languages:
+        dff = dff[dff["Detected Language"].isin(languages)]
+    return dff
+
+def benchmark(df, engine, year_range, sentiments, languages):
+    legacy_s, legacy_peak = measure(lambda: legacy_filter(df, year_range, sentiments, languages))
+    engine_s, engine_peak = measure(lambda: df.iloc[engine.rows(year_range=year_range, sentiments=sentiments, languages=languages)])
+    return {
+        "legacy_ms": legacy_s * 1000,
+        "engine_ms": engine_s * 1000,
+        "legacy_peak_rss_mb": legacy_peak / 2**20,
+        "engine_peak_rss_mb": engine_peak / 2**20,
+    }
+
+if __name__ == "__main__":
+    # Pemakaian: python filters.py "publik persepsi.csv"
+    from dataset import load_dataset
+
+    df = load_dataset(sys.argv[1])
+    engine = FilterEngine(df)
+    years = sorted(engine.values("year"))
+    cases = [
+        ((years[0], years[-1]), ["positive", "neutral", "negative"], ["id", "en"]),
+        ((years[0], years[-1]), ["negative"], ["id"]),
+        ((years[-1], years[-1]), ["positive", "negative"], []),
+    ]
+    for year_range, sentiments, languages in cases:
+        assert (engine.rows(year_range=year_range, sentiments=sentiments, languages=languages)
+                == legacy_filter(df, year_range, sentiments, languages).index.to_numpy()).all()
+        res = benchmark(df, engine, year_range, sentiments, languages)
+        print(
+            f"{year_range} {sentiments} {languages}: "
+            f"latency {res['legacy_ms']:.1f} -> {res['engine_ms']:.1f} ms, "
+            f"peak RSS growth {res['legacy_peak_rss_mb']:.1f} -> {res['engine_peak_rss_mb']:.1f} MB"
+        )
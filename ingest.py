@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import argparse
+import io
+import re
+import string
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from anomaly import refresh_anomaly_states
+from cube import build_cube, cube_cache_path, load_cube, merge_cubes
+from dataset import (
+    append_rows, cache_path, dataset_version, derive_columns, load_dataset, prune_cache, write_arrow,
+)
+from language_id import detect_languages, load_language_model, open_language_cache
+from ngram_index import extend_ngram_index, load_ngram_index, ngram_cache_path, save_ngram_index
+from search_index import extend_inverted_index, index_cache_path, load_inverted_index, save_inverted_index
+from sentiment import TransformersBackend, label_sentiments, load_local_classifier, open_sentiment_cache
+
+PUNCT_TABLE = str.maketrans("", "", string.punctuation)
+# Bahasa yang stopword-nya dibuang oleh notebook (daftar nltk.corpus.stopwords)
+STOPWORD_LANGUAGES = {"en": "english", "id": "indonesian"}
+
+class StopwordsUnavailable(RuntimeError):
+    """The NLTK stopword lists needed for the ``stopword`` column are missing."""
+
+# =============================================================================
+# LABELLING NEW ROWS
+# =============================================================================
+def notebook_clean_text(text):
+    """The notebook's ``clean_text``, which produced the ``Clean Text`` column."""
+    text = str(text).lower()
+    text = re.sub(r"\[.*?\]", "", text)
+    text = re.sub(r"https?://\S+|www\.\S+", "", text)
+    text = re.sub(r"<.*?>+", "", text)
+    text = re.sub("[«»]", "", text)
+    text = text.translate(PUNCT_TABLE)
+    text = re.sub("\n", "", text)
+    text = re.sub(r"\w*\d\w*", "", text)
+    return text
+
+def load_stopwords():
+    """The notebook's stopword sets per language code, from ``nltk.corpus.stopwords``.
+
+    Raises ``StopwordsUnavailable`` when nltk or its ``stopwords`` corpus is not
+    installed: new rows without stopword removal would not match the archive.
+    """
+    try:
+        from nltk.corpus import stopwords
+
+        return {lang: set(stopwords.words(name)) for lang, name in STOPWORD_LANGUAGES.items()}
+    except (ImportError, LookupError) as e:
+        raise StopwordsUnavailable(
+            "Daftar stopword nltk tidak tersedia; jalankan `pip install nltk` lalu "
+            "`python -m nltk.downloader stopwords` sebelum ingest."
+        ) from e
+
+def remove_stopwords(texts, languages, stop_words):
+    """The notebook's ``remove_stopwords``: drop stopwords of the row's language, if listed."""
+    out = []
+    for text, lang in zip(texts, languages):
+        words = stop_words.get(lang)
+        out.append(" ".join(w for w in text.split() if w.lower() not in words) if words is not None else text)
+    return out
+
+def read_new_rows(source):
+    """Read scraper output: a CSV file or a directory of Parquet parts."""
+    source = Path(source)
+    if source.is_dir():
+        return pd.read_parquet(source)
+    return pd.read_csv(source)
+
+def label_rows(raw, header, date_format, stop_words, lang_model, lang_cache, backend, sent_cache, progress=None):
+    """Turn scraped rows into rows of the source CSV (columns ``header``).
+
+    Same steps as the notebook: clean the title, detect its language, remove
+    the stopwords of that language, label its sentiment. ``stop_words`` is the
+    ``load_stopwords`` mapping, or None when the archive has no ``stopword``
+    text. ``confidence`` stays the language-detection confidence, as in the
+    existing archive.
+    """
+    published = pd.to_datetime(raw["Waktu Terbit"].astype(str).str.replace("Sept", "Sep"), errors="coerce", format="mixed")
+    raw, published = raw[published.notna()], published[published.notna()]
+    rows = pd.DataFrame(index=raw.index)
+    rows["Judul Berita"] = raw["Judul Berita"].fillna("").astype(str)
+    rows["Nama Media"] = raw["Nama Media"]
+    rows["Waktu Terbit"] = published.dt.strftime(date_format)
+    rows["Link Berita"] = raw["Link Berita"]
+    rows["Clean Text"] = rows["Judul Berita"].map(notebook_clean_text)
+    rows[["Detected Language", "confidence"]] = detect_languages(rows["Judul Berita"], lang_model, lang_cache)
+    if stop_words is None:
+        rows["stopword"] = ""
+    else:
+        rows["stopword"] = remove_stopwords(rows["Clean Text"].tolist(), rows["Detected Language"].tolist(), stop_words)
+    rows["sentiment"] = label_sentiments(rows["Clean Text"], backend, sent_cache, progress=progress)["sentiment"]
+    word_count = rows["Clean Text"].str.split().str.len()
+    rows["text_word_count"] = word_count
+    rows["word_count"] = word_count
+    return rows.reindex(columns=header)
+
+# =============================================================================
+# INGEST
+# =============================================================================
+def append_csv(path, csv_text):
+    """Append CSV rows (no header) to ``path``, keeping the last line intact."""
+    with open(path, "rb+") as f:
+        f.seek(0, 2)
+        if f.tell():
+            f.seek(-1, 2)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+        f.write(csv_text.encode("utf-8"))
+
+def ingest(path, source, backend=None, progress=print):
+    """Add the new rows of ``source`` to dataset ``path`` incrementally.
+
+    Only the new rows are cleaned, labelled and derived. The columnar store,
+    n-gram matrices, inverted indexes and count cube of the current version
+    are extended in memory, the rows are appended to the source CSV, and the
+    extended artifacts are written under the new dataset version, so the
+    dashboard loads them directly instead of rebuilding. Returns the number of
+    rows added.
+    """
+    path = Path(path)
+    t0 = time.perf_counter()
+    df = load_dataset(path)
+    ngrams = load_ngram_index(path, df["processed_text"])
+    phrase_index = load_inverted_index(path, df["processed_text"], "phrase")
+    title_index = load_inverted_index(path, df["Judul Berita"], "title")
+    cube = load_cube(path, df)
+
+    raw = read_new_rows(source)
+    links = raw["Link Berita"].fillna("").astype(str)
+    fresh = ~links.isin(set(df["Link Berita"])) & ~(links.duplicated() & (links != ""))
+    raw = raw[fresh]
+    if raw.empty:
+        progress("Tidak ada berita baru.")
+        return 0
+
+    sample = pd.read_csv(path, nrows=1)
+    header = sample.columns.tolist()
+    date_format = "%Y-%m-%d %H:%M:%S" if len(str(sample["Waktu Terbit"].iloc[0])) > 10 else "%Y-%m-%d"
+    # Arsip yang punya kolom stopword terisi menurunkan processed_text dari kolom itu,
+    # jadi baris baru wajib melewati penghapusan stopword yang sama
+    stop_words = load_stopwords() if (df["stopword"].str.len() > 0).any() else None
+    lang_cache, sent_cache = open_language_cache(path), open_sentiment_cache(path)
+    try:
+        rows = label_rows(
+            raw, header, date_format, stop_words,
+            load_language_model(path), lang_cache, backend or load_local_classifier(path), sent_cache, progress,
+        )
+    finally:
+        lang_cache.close()
+        sent_cache.close()
+    if rows.empty:
+        progress("Tidak ada berita baru dengan tanggal terbit yang valid.")
+        return 0
+
+    # Baris baru diturunkan dari teks CSV yang persis sama dengan yang ditambahkan,
+    # sehingga hasilnya sama dengan build ulang penuh dari CSV
+    csv_text = rows.to_csv(index=False, header=False)
+    derived = derive_columns(pd.read_csv(io.StringIO(",".join(header) + "\n" + csv_text)))
+    full = append_rows(df, derived)
+    ngrams = extend_ngram_index(ngrams, derived["processed_text"])
+    phrase_index = extend_inverted_index(phrase_index, derived["processed_text"])
+    title_index = extend_inverted_index(title_index, derived["Judul Berita"])
+    cube = merge_cubes(cube, build_cube(derived))
+
+    append_csv(path, csv_text)
+    version = dataset_version(path)
+    write_arrow(full, cache_path(path))
+    save_ngram_index(ngrams, ngram_cache_path(path))
+    save_inverted_index(phrase_index, index_cache_path(path, "phrase"))
+    save_inverted_index(title_index, index_cache_path(path, "title"))
+    write_arrow(cube, cube_cache_path(path))
+    prune_cache(path, version)
+    progress(f"{len(derived)} berita baru ditambahkan ({len(full):,} total, versi {version}) dalam {time.perf_counter() - t0:.1f} s")
+    # State anomali yang sudah ada hanya memproses periode baru
+    for (bucket, scope), alerts in refresh_anomaly_states(path, cube).items():
+        if len(alerts):
+            progress(f"anomali {bucket}/{scope}: {len(alerts)} periode baru ditandai, terbaru {alerts['bucket'].iloc[0]:%Y-%m-%d} ({alerts['series'].iloc[0]})")
+    return len(derived)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tambahkan berita hasil scraping ke dataset dashboard secara inkremental.")
+    parser.add_argument("source", help="Output scraping.py: file CSV atau direktori Parquet")
+    parser.add_argument("--data", default="publik persepsi.csv", help="CSV dataset dashboard")
+    parser.add_argument("--backend", choices=["local", "transformers"], default="local")
+    parser.add_argument("--model", default="google/gemma-2-2b-it", help="Model untuk --backend transformers")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    backend = TransformersBackend(args.model) if args.backend == "transformers" else None
+    try:
+        ingest(args.data, args.source, backend)
+    except StopwordsUnavailable as e:
+        sys.exit(str(e))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+
+# =============================================================================
+# MEMORY
+# =============================================================================
+def proc_status_kb(field):
+    """Read one ``kB`` field (VmRSS, VmHWM, ...) of /proc/self/status."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+def reset_peak_rss():
+    """Reset the RSS high-water mark (VmHWM); returns False where unsupported."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+def memory_breakdown_mb():
+    """Resident memory split into private (anonymous) and file-backed pages, in MB.
+
+    File-backed pages of memory-mapped caches sit in the OS page cache and are
+    shared with every other process mapping the same file. Empty where
+    /proc is unavailable.
+    """
+    try:
+        return {field: proc_status_kb(field) / 1024 for field in ("VmRSS", "RssAnon", "RssFile")}
+    except (OSError, KeyError):
+        return {}
+
+def _rss_kb():
+    try:
+        return proc_status_kb("VmRSS")
+    except (OSError, KeyError):
+        return None
+
+def measure(fn, repeat=5):
+    """Return (mean seconds, peak memory growth in bytes) of ``fn``.
+
+    On Linux the peak is the RSS high-water mark after resetting it through
+    /proc/self/clear_refs; elsewhere it falls back to tracemalloc. The reset is
+    process-wide, so this is for single-session benchmark scripts, not the app.
+    """
+    use_rss = reset_peak_rss()
+    if use_rss:
+        rss_before = proc_status_kb("VmRSS")
+    else:
+        tracemalloc.start()
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - t0) / repeat
+
+    if use_rss:
+        peak = (proc_status_kb("VmHWM") - rss_before) * 1024
+    else:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak
+
+# =============================================================================
+# PROFILER
+# =============================================================================
+class Profiler:
+    """Per-rerun stage timers with memory and cache counters.
+
+    ``stage(name)`` measures wall time, the RSS change summed over calls and
+    the largest RSS change of a single call (Linux only), plus the hit/miss
+    deltas of every tracked cache. Entering the same name again adds to its
+    record, so a stage can wrap many small calls (e.g. every Plotly chart).
+
+    The high-water mark (VmHWM) is deliberately not used: resetting it is
+    process-wide and would corrupt the peak of every other Streamlit session
+    served by the same process. RSS is process-wide too, so a delta also
+    includes whatever concurrent sessions allocated meanwhile.
+    """
+
+    def __init__(self, caches=None):
+        self.started = time.perf_counter()
+        self.caches = dict(caches or {})
+        self.records = {}
+        self._lock = threading.Lock()
+
+    def track(self, name, cache):
+        """Include the hits/misses counters of ``cache`` in every stage record."""
+        self.caches[name] = cache
+
+    def _cache_counts(self):
+        return {name: (cache.hits, cache.misses) for name, cache in self.caches.items()}
+
+    @contextmanager
+    def stage(self, name):
+        rss0 = _rss_kb()
+        counts0 = self._cache_counts()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            rss1 = _rss_kb()
+            counts1 = self._cache_counts()
+            with self._lock:
+                rec = self.records.setdefault(name, {
+                    "stage": name, "calls": 0, "ms": 0.0, "rss_delta_mb": 0.0, "rss_max_delta_mb": None, "hits": 0, "misses": 0,
+                })
+                rec["calls"] += 1
+                rec["ms"] += elapsed * 1000
+                if rss0 is not None and rss1 is not None:
+                    delta = (rss1 - rss0) / 1024
+                    rec["rss_delta_mb"] += delta
+                    rec["rss_max_delta_mb"] = max(rec["rss_max_delta_mb"] or 0.0, delta)
+                for cache, (h0, m0) in counts0.items():
+                    h1, m1 = counts1.get(cache, (h0, m0))
+                    rec["hits"] += h1 - h0
+                    rec["misses"] += m1 - m0
+
+    def timed(self, fn=None, *, name=None):
+        """Decorator form of ``stage``; the stage is named after the function by default."""
+        def decorator(fn):
+            stage_name = name or fn.__name__
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.stage(stage_name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator(fn) if fn is not None else decorator
+
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def to_json_line(self, **meta):
+        """One JSON object for the whole rerun: ``meta`` fields plus every stage."""
+        payload = {
+            "ts": time.time(),
+            **meta,
+            "total_ms": round(self.total_ms(), 2),
+            "stages": [
+                {k: (round(v, 2) if isinstance(v, float) else v) for k, v in rec.items()}
+                for rec in self.records.values()
+            ],
+        }
+        return json.dumps(payload, default=str)
+
+    def emit(self, path, **meta):
+        """Append the rerun as one JSON line to ``path`` (no-op when ``path`` is empty)."""
+        if not path:
+            return
+        line = self.to_json_line(**meta) + "\n"
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError:
+            pass
+
+def admin_enabled(query_params):
+    """The profiling panel is hidden unless ``?admin=1`` or JOKOWI_ADMIN=1."""
+    return query_params.get("admin") == "1" or os.environ.get("JOKOWI_ADMIN") == "1"
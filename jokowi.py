@@ -1,19 +1,34 @@
 from __future__ import annotations
 
-import re
+import os
 import math
 import warnings
-from io import BytesIO
 from pathlib import Path
-from collections import Counter, defaultdict
+from collections import defaultdict
 
 import numpy as np
 import pandas as pd
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
+
+from dataset import SENTIMENT_ORDER, cache_dir_for, dataset_version, load_dataset
+from ngram_index import load_ngram_index
+from search_index import load_inverted_index
+from figures import FIGURE_CACHE_BYTES, FIGURE_CACHE_ENTRIES, cached_figure, line_trace
+from filters import FilterEngine
+from cube import load_cube, ratio_by_time, sentiment_counts
+from anomaly import ALL_KEY, load_anomaly_state
+from result_cache import LRUCache, cached_by_signature, filter_signature
+from disk_cache import DiskLRU
+from distributions import grouped_bincount, violin_stats
+from concentration import ALL_SENTIMENTS, media_concentration
+from media_index import load_media_index, media_sentiment_month
+from news_cards import newest_page, news_cards_html, publish_times
+from time_buckets import period_labels, period_start
+from wordclouds import render_wordcloud, wordcloud_frequencies
+from export import EXPORT_COLUMNS, EXPORT_FORMATS, export_bytes
+from instrumentation import Profiler, admin_enabled, memory_breakdown_mb
 
 warnings.filterwarnings("ignore")
 
@@ -348,7 +363,6 @@ COLORS = {
     "grid": "rgba(255,255,255,0.08)",
 }
 
-SENTIMENT_ORDER = ["positive", "neutral", "negative"]
 SENTIMENT_LABEL = {
     "positive": "Positif",
     "neutral": "Netral",
@@ -408,11 +422,6 @@ def human_int(n):
     except Exception:
         return str(n)
 
-def safe_lower(x):
-    if pd.isna(x):
-        return ""
-    return str(x).lower()
-
 def pick_data_file():
     candidates = [
         Path("publik persepsi.csv"),
@@ -425,49 +434,9 @@ def pick_data_file():
             return p
     raise FileNotFoundError("File CSV tidak ditemukan. Pastikan nama file 'publik persepsi.csv' tersedia.")
 
-def norm_sentiment(s):
-    if pd.isna(s):
-        return np.nan
-    s = str(s).strip().lower()
-    s = (
-        s.replace("positif", "positive")
-         .replace("negatif", "negative")
-         .replace("netral", "neutral")
-    )
-    return s if s in SENTIMENT_ORDER else np.nan
-
-def clean_text(text):
-    text = safe_lower(text)
-    text = text.replace("\n", " ").replace("\t", " ")
-    text = re.sub(r"http\S+|www\.\S+", " ", text)
-    text = re.sub(r"[^0-9a-zA-Z\s]", " ", text)
-    tokens = [t for t in text.split() if len(t) > 1]
-    tokens = [t for t in tokens if not t.isdigit()]
-    return " ".join(tokens)
-
-def tokenize_text(text):
-    text = clean_text(text)
-    return [t for t in text.split() if t]
-
-def hhi_from_shares(counts: pd.Series) -> float:
-    total = counts.sum()
-    if total <= 0:
-        return np.nan
-    shares = (counts / total) * 100
-    return float((shares ** 2).sum())
-
-def top_ngrams_from_texts(texts, n=2, top_n=20):
-    token_stream = []
-    for t in texts:
-        token_stream.extend(tokenize_text(t))
-    if len(token_stream) < n:
-        return []
-    grams = [" ".join(token_stream[i:i+n]) for i in range(len(token_stream) - n + 1)]
-    return Counter(grams).most_common(top_n)
-
-def ngram_df_from_series(series, n=2, top_n=20, sentiment=None):
+def ngram_df_from_index(index, row_ids, n=2, top_n=20, sentiment=None):
     rows = []
-    for phrase, freq in top_ngrams_from_texts(series, n=n, top_n=top_n):
+    for phrase, freq in index.top(row_ids, n=n, top_n=top_n):
         rows.append({"phrase": phrase, "freq": int(freq), "ngram": n, "sentiment": sentiment})
     return pd.DataFrame(rows)
 
@@ -482,110 +451,144 @@ def make_plotly_layout(height=350, xaxis_updates=None, yaxis_updates=None, legen
     layout["height"] = height
     return layout
 
-def render_wordcloud(text, bg_color, cmap, max_words=120):
-    text = clean_text(text)
-    if not text.strip():
-        return None
-    try:
-        wc = WordCloud(
-            width=1000,
-            height=560,
-            background_color=bg_color,
-            max_words=max_words,
-            prefer_horizontal=0.86,
-            collocations=False,
-            colormap=cmap,
-            min_font_size=8,
-        ).generate(text)
-        buf = BytesIO()
-        fig, ax = plt.subplots(figsize=(10, 5.4), facecolor=bg_color)
-        ax.imshow(wc, interpolation="bilinear")
-        ax.axis("off")
-        plt.tight_layout(pad=0)
-        plt.savefig(buf, format="png", dpi=140, bbox_inches="tight", facecolor=bg_color)
-        plt.close(fig)
-        buf.seek(0)
-        return buf
-    except Exception:
-        return None
-
-def style_sentiment_badge(s):
-    cls = {"positive": "badge-pos", "neutral": "badge-neu", "negative": "badge-neg"}.get(s, "badge-neu")
-    return f'<span class="badge {cls}">{SENTIMENT_LABEL.get(s, s)}</span>'
-
-def download_csv(df):
-    return df.to_csv(index=False).encode("utf-8")
-
 def plot_blank_message(msg: str):
     st.info(msg)
 
+def rows_between_dates(rows, start, end):
+    """Row ids of ``rows`` published between the dates ``start`` and ``end`` (inclusive)."""
+    t = df["Waktu Terbit"].to_numpy()[rows]
+    return rows[(t >= np.datetime64(start)) & (t < np.datetime64(end) + np.timedelta64(1, "D"))]
+
+def date_bounds(rows):
+    """First and last publish date of ``rows`` (today twice when there are none)."""
+    if len(rows) == 0:
+        today = pd.Timestamp.now().date()
+        return today, today
+    t = df["Waktu Terbit"].to_numpy()[rows]
+    return pd.Timestamp(t.min()).date(), pd.Timestamp(t.max()).date()
+
+def news_pager(key, rows, query, page_size=20, show_media=True):
+    """Newest-first news cards of ``rows``, one page per rerun as a single HTML block.
+
+    The page is picked after a (time, row id) cursor, so the cost per rerun does
+    not depend on how many rows match. ``query`` identifies the result set;
+    when it changes, paging restarts at the first page.
+    """
+    state = st.session_state.setdefault(f"news_pager_{key}", {"query": None, "cursors": [None]})
+    if state["query"] != query:
+        state.update(query=query, cursors=[None])
+    page, next_cursor = newest_page(publish_ns, rows, page_size, state["cursors"][-1])
+    st.markdown(news_cards_html(df, page, show_media=show_media), unsafe_allow_html=True)
+
+    n_pages = max(-(-len(rows) // page_size), 1)
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if st.button("← Sebelumnya", key=f"{key}_prev", disabled=len(state["cursors"]) == 1):
+            state["cursors"].pop()
+            st.rerun()
+    with col_info:
+        st.markdown(
+            f"<div class='small-muted' style='text-align:center;'>Halaman {len(state['cursors'])} dari {n_pages} · {human_int(len(rows))} berita</div>",
+            unsafe_allow_html=True,
+        )
+    with col_next:
+        if st.button("Berikutnya →", key=f"{key}_next", disabled=next_cursor is None):
+            state["cursors"].append(next_cursor)
+            st.rerun()
+    return page
+
 # =============================================================================
 # DATA LOADING
 # =============================================================================
-@st.cache_data(show_spinner=False)
-def load_data(path_str):
-    path = Path(path_str)
-    df = pd.read_csv(path)
-
-    df["Waktu Terbit"] = pd.to_datetime(df["Waktu Terbit"], errors="coerce")
-    df["sentiment"] = df["sentiment"].apply(norm_sentiment)
-    df = df.dropna(subset=["Waktu Terbit", "sentiment"]).copy()
-
-    for col in ["Judul Berita", "Nama Media", "Link Berita", "Clean Text", "Detected Language", "stopword"]:
-        if col not in df.columns:
-            df[col] = ""
-    if "confidence" not in df.columns:
-        df["confidence"] = np.nan
-    if "text_word_count" not in df.columns:
-        df["text_word_count"] = np.nan
-    if "word_count" not in df.columns:
-        df["word_count"] = np.nan
-
-    df["Judul Berita"] = df["Judul Berita"].fillna("(tanpa judul)").astype(str)
-    df["Nama Media"] = df["Nama Media"].fillna("Unknown").astype(str)
-    df["Link Berita"] = df["Link Berita"].fillna("").astype(str)
-    df["Clean Text"] = df["Clean Text"].fillna("").astype(str)
-    df["Detected Language"] = df["Detected Language"].fillna("").astype(str).str.lower()
-    df["stopword"] = df["stopword"].fillna("").astype(str)
-
-    for col in ["confidence", "text_word_count", "word_count"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    df["year"] = df["Waktu Terbit"].dt.year
-    df["month"] = df["Waktu Terbit"].dt.month
-    df["year_month"] = df["Waktu Terbit"].dt.strftime("%Y-%m")
-    df["year_month_dt"] = pd.to_datetime(df["year_month"] + "-01")
-    df["quarter"] = df["Waktu Terbit"].dt.to_period("Q").astype(str)
-    df["day_name"] = df["Waktu Terbit"].dt.day_name()
-    df["week"] = df["Waktu Terbit"].dt.isocalendar().week.astype(int)
-    df["sent_score"] = df["sentiment"].map({"positive": 1, "neutral": 0, "negative": -1}).fillna(0)
-
-    if df["stopword"].str.len().sum() > 0:
-        df["processed_text"] = df["stopword"].apply(clean_text)
-    else:
-        df["processed_text"] = df["Clean Text"].apply(clean_text)
-
-    df["title_word_count"] = df["Judul Berita"].str.split().apply(len)
-    df["title_len"] = df["Judul Berita"].str.len()
-    return df
-
-@st.cache_data(show_spinner=False)
-def compute_overview(df):
-    total = len(df)
-    counts = df["sentiment"].value_counts().to_dict()
+# Semua loader dikunci dengan versi dataset: setelah ingest.py menambah berita,
+# versi berubah dan artefak versi baru (yang sudah ditulis ingest) langsung dimuat.
+# Dataset dipakai bersama semua sesi tanpa salinan (cache_resource, bukan
+# cache_data yang mem-pickle per pemanggil). Kolomnya view read-only dari file
+# Arrow yang di-memory-map, jadi proses Streamlit lain di host yang sama berbagi
+# page cache yang sama. Per sesi hanya mask / row id yang disimpan.
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_data(path_str, version):
+    return load_dataset(Path(path_str))
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def get_ngram_index(path_str, version, _texts):
+    return load_ngram_index(Path(path_str), _texts)
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def get_search_index(path_str, version, kind, _texts):
+    return load_inverted_index(Path(path_str), _texts, kind)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def get_filter_engine(path_str, version, _df):
+    return FilterEngine(_df)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def get_media_index(path_str, version, _df):
+    return load_media_index(Path(path_str), _df)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def get_cube(path_str, version, _df):
+    cube = load_cube(Path(path_str), _df)
+    return cube, FilterEngine(cube)
+
+@st.cache_resource(show_spinner=False, max_entries=12)
+def get_anomaly_state(path_str, version, bucket, scope, _cells):
+    # State EWMA disimpan di .cache; versi baru hanya memproses bucket baru
+    return load_anomaly_state(Path(path_str), _cells, bucket, scope)
+
+@st.cache_resource(show_spinner=False)
+def get_result_cache():
+    return LRUCache()
+
+result_cache = get_result_cache()
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    return LRUCache(max_entries=FIGURE_CACHE_ENTRIES, max_bytes=FIGURE_CACHE_BYTES)
+
+figure_cache = get_figure_cache()
+
+# Profil satu rerun: waktu, memori, dan hit/miss cache per tahap
+profiler = Profiler(caches={"result": result_cache, "figure": figure_cache})
+
+def plotly_chart(fig, **kwargs):
+    with profiler.stage("plotly"):
+        return st.plotly_chart(fig, **kwargs)
+
+def cached_plotly_chart(chart_id, params, build, **kwargs):
+    """``plotly_chart`` of ``build()``, rebuilt only when the filter or ``params`` change."""
+    with profiler.stage("plotly"):
+        cached = cached_figure(figure_cache, chart_id, (filter_sig, params), build)
+        return st.plotly_chart(cached.figure, **kwargs)
+
+@st.cache_resource(show_spinner=False)
+def get_wordcloud_cache(path_str):
+    return DiskLRU(cache_dir_for(Path(path_str)) / "wordclouds", suffix=".png")
+
+@st.cache_resource(show_spinner=False)
+def get_export_cache(path_str):
+    return DiskLRU(cache_dir_for(Path(path_str)) / "exports", suffix=".export", max_entries=32, max_bytes=1 << 30)
+
+@profiler.timed
+@cached_by_signature(result_cache)
+def compute_overview(cells):
+    total = int(cells["count"].sum())
+    counts = cells.groupby("sentiment", observed=True)["count"].sum().to_dict()
     pos = int(counts.get("positive", 0))
     neu = int(counts.get("neutral", 0))
     neg = int(counts.get("negative", 0))
-    media_n = int(df["Nama Media"].nunique())
-    lang_n = int(df["Detected Language"].nunique())
+    media_n = int(cells["Nama Media"].nunique())
+    lang_n = int(cells["Detected Language"].nunique())
 
     pos_share = pos / total * 100 if total else 0
     neg_share = neg / total * 100 if total else 0
     neu_share = neu / total * 100 if total else 0
     sentiment_balance = (pos - neg) / total * 100 if total else 0
-    avg_conf = float(df["confidence"].mean()) if "confidence" in df.columns and total else np.nan
-    avg_words = float(df["text_word_count"].mean()) if "text_word_count" in df.columns and total else np.nan
-    avg_title_words = float(df["title_word_count"].mean()) if total else np.nan
+    conf_n = cells["conf_n"].sum()
+    words_n = cells["words_n"].sum()
+    avg_conf = float(cells["conf_sum"].sum() / conf_n) if conf_n else np.nan
+    avg_words = float(cells["words_sum"].sum() / words_n) if words_n else np.nan
+    avg_title_words = float(cells["title_words_sum"].sum() / total) if total else np.nan
     dominant = max([(pos, "positive"), (neu, "neutral"), (neg, "negative")], key=lambda x: x[0])[1] if total else None
     return {
         "total": total,
@@ -604,19 +607,17 @@ def compute_overview(df):
         "avg_title_words": avg_title_words,
     }
 
-@st.cache_data(show_spinner=False)
-def compute_monthly(df):
-    monthly = (
-        df.groupby(["year_month", "sentiment"])
-        .size().reset_index(name="count")
-        .pivot(index="year_month", columns="sentiment", values="count")
-        .fillna(0).reset_index()
-    )
+@profiler.timed
+@cached_by_signature(result_cache)
+def compute_monthly(cells):
+    # Dikelompokkan per month_key (integer), yang sudah urut kronologis
+    monthly = sentiment_counts(cells, "month_key").reset_index()
+    monthly.columns = [str(c) for c in monthly.columns]
     for s in SENTIMENT_ORDER:
         if s not in monthly.columns:
             monthly[s] = 0
-    monthly["year_month_dt"] = pd.to_datetime(monthly["year_month"] + "-01")
-    monthly = monthly.sort_values("year_month_dt").reset_index(drop=True)
+    monthly["year_month"] = period_labels(monthly["month_key"], "month")
+    monthly["year_month_dt"] = period_start(monthly["month_key"], "month")
     monthly["total"] = monthly[SENTIMENT_ORDER].sum(axis=1)
     monthly["pos_share"] = np.where(monthly["total"] > 0, monthly["positive"] / monthly["total"] * 100, 0)
     monthly["neg_share"] = np.where(monthly["total"] > 0, monthly["negative"] / monthly["total"] * 100, 0)
@@ -625,14 +626,11 @@ def compute_monthly(df):
     monthly["ma3_score"] = monthly["net_score"].rolling(3, min_periods=1, center=True).mean()
     return monthly
 
-@st.cache_data(show_spinner=False)
-def compute_yearly(df):
-    yearly = (
-        df.groupby(["year", "sentiment"])
-        .size().reset_index(name="count")
-        .pivot(index="year", columns="sentiment", values="count")
-        .fillna(0).reset_index()
-    )
+@profiler.timed
+@cached_by_signature(result_cache)
+def compute_yearly(cells):
+    yearly = sentiment_counts(cells, "year").reset_index()
+    yearly.columns = [str(c) for c in yearly.columns]
     for s in SENTIMENT_ORDER:
         if s not in yearly.columns:
             yearly[s] = 0
@@ -645,96 +643,55 @@ def compute_yearly(df):
     yearly["change_neg"] = yearly["negative"].diff()
     return yearly.sort_values("year")
 
-@st.cache_data(show_spinner=False)
-def compute_media_summary(df, top_n=10):
-    media_counts = df["Nama Media"].value_counts()
-    top_media = media_counts.head(top_n).reset_index()
-    top_media.columns = ["Nama Media", "count"]
-    return top_media
-
-@st.cache_data(show_spinner=False)
-def compute_anomalies(df):
-    monthly_vol = df.groupby("year_month")["sentiment"].size().reset_index(name="volume")
-    monthly_score = df.groupby("year_month")["sent_score"].mean().reset_index(name="sent_score")
-    merged = monthly_vol.merge(monthly_score, on="year_month", how="left").sort_values("year_month")
-    merged["z_volume"] = (merged["volume"] - merged["volume"].mean()) / (merged["volume"].std(ddof=0) + 1e-9)
-    merged["z_score"] = (merged["sent_score"] - merged["sent_score"].mean()) / (merged["sent_score"].std(ddof=0) + 1e-9)
-    merged["flag_volume"] = merged["z_volume"].abs() >= 2.0
-    merged["flag_score"] = merged["z_score"].abs() >= 2.0
-    return merged
-
-@st.cache_data(show_spinner=False)
-def compute_ratio_by_time(df, granularity="month"):
-    """Return DataFrame with time column and positive/negative ratio."""
-    df_temp = df.copy()
-    if granularity == "month":
-        df_temp["time_period"] = df_temp["year_month"]
-        df_temp["sort_key"] = pd.to_datetime(df_temp["year_month"] + "-01")
-    elif granularity == "quarter":
-        # Handle various quarter formats: "Q1 2020", "2020Q1", "2020-Q1", "Q1-2020"
-        quarter_series = df_temp["quarter"].astype(str)
-        
-        def parse_quarter(q):
-            q_str = str(q)
-            # Pattern: Q1 2020 or Q1-2020
-            match = re.search(r'Q(\d)[\s\-]?(\d{4})', q_str)
-            if match:
-                q_num = int(match.group(1))
-                year = int(match.group(2))
-                return year, q_num
-            # Pattern: 2020Q1 or 2020-Q1
-            match = re.search(r'(\d{4})[\s\-]?Q(\d)', q_str)
-            if match:
-                year = int(match.group(1))
-                q_num = int(match.group(2))
-                return year, q_num
-            # Pattern: 2020 Q1
-            parts = q_str.split()
-            if len(parts) == 2:
-                year = int(parts[0])
-                q_num = int(parts[1].replace('Q', ''))
-                return year, q_num
-            return None, None
-        
-        years = []
-        q_nums = []
-        for q in quarter_series:
-            y, qn = parse_quarter(q)
-            years.append(y)
-            q_nums.append(qn)
-        
-        sort_keys = []
-        for y, qn in zip(years, q_nums):
-            if y is None or qn is None:
-                sort_keys.append(pd.NaT)
-            else:
-                month = (qn - 1) * 3 + 1
-                sort_keys.append(pd.to_datetime(f"{y}-{month:02d}-01"))
-        df_temp["sort_key"] = sort_keys
-        df_temp["time_period"] = df_temp["quarter"]
-    else:  # year
-        df_temp["time_period"] = df_temp["year"].astype(str)
-        df_temp["sort_key"] = pd.to_datetime(df_temp["year"].astype(str) + "-01-01")
-
-    ratio = df_temp.groupby(["time_period", "sentiment"]).size().unstack(fill_value=0)
-    # Ensure columns exist
-    for s in SENTIMENT_ORDER:
-        if s not in ratio.columns:
-            ratio[s] = 0
-    ratio["positive_ratio"] = ratio["positive"] / (ratio["positive"] + ratio["negative"] + 1e-9) * 100
-    ratio["negative_ratio"] = ratio["negative"] / (ratio["positive"] + ratio["negative"] + 1e-9) * 100
-    ratio = ratio.reset_index()
-    # Attach sort_key
-    sort_df = df_temp[["time_period", "sort_key"]].drop_duplicates()
-    ratio = ratio.merge(sort_df, on="time_period", how="left")
-    ratio = ratio.sort_values("sort_key")
-    return ratio
+@profiler.timed
+@cached_by_signature(result_cache)
+def compute_media_table(cells):
+    # Tabel media × sentimen × bulan untuk tab Analisis Media (id media = kode kategori)
+    return media_sentiment_month(cells, media_index.names)
+
+@profiler.timed
+@cached_by_signature(result_cache)
+def compute_media_concentration(media_table):
+    # HHI, pangsa top-k dan Gini per bulan × sentimen dari tabel media yang sama
+    table, months = media_table
+    out = media_concentration(table, months)
+    out["period_start"] = period_start(out["month_key"], "month")
+    return out
+
+@profiler.timed
+@cached_by_signature(result_cache)
+def compute_title_length_stats(mask):
+    # Hitungan (sentimen, jumlah kata judul) dalam satu bincount; Plotly hanya menerima ringkasannya
+    sentiment = df["sentiment"].astype("category")
+    lookup = np.append(pd.Index(SENTIMENT_ORDER).get_indexer(sentiment.cat.categories), -1)
+    groups = lookup[sentiment.cat.codes.to_numpy()]
+    counts = grouped_bincount(df["title_word_count"].to_numpy(), groups, len(SENTIMENT_ORDER), mask)
+    summary, grid, density = violin_stats(counts, SENTIMENT_ORDER)
+    return counts, summary, grid, density
+
+@profiler.timed
+@cached_by_signature(result_cache)
+def compute_ratio_by_time(cells, granularity="month"):
+    return ratio_by_time(cells, granularity)
 
 # =============================================================================
 # LOAD DATA
 # =============================================================================
-data_path = pick_data_file()
-df = load_data(str(data_path))
+with profiler.stage("load_data"):
+    data_path = pick_data_file()
+    data_version = dataset_version(data_path)
+    df = load_data(str(data_path), data_version)
+    ngram_index = get_ngram_index(str(data_path), data_version, df["processed_text"])
+    phrase_index = get_search_index(str(data_path), data_version, "phrase", df["processed_text"])
+    title_index = get_search_index(str(data_path), data_version, "title", df["Judul Berita"])
+    filter_engine = get_filter_engine(str(data_path), data_version, df)
+    cube, cube_engine = get_cube(str(data_path), data_version, df)
+    media_index = get_media_index(str(data_path), data_version, df)
+    publish_ns = publish_times(df)
+wordcloud_cache = get_wordcloud_cache(str(data_path))
+export_cache = get_export_cache(str(data_path))
+profiler.track("wordcloud", wordcloud_cache)
+profiler.track("export", export_cache)
 
 # =============================================================================
 # SIDEBAR
@@ -779,18 +736,17 @@ with st.sidebar:
 # =============================================================================
 # FILTER DATA GLOBAL
 # =============================================================================
-dff = df.copy()
-dff = dff[dff["year"].between(year_range[0], year_range[1])]
-if sentiments_sel:
-    dff = dff[dff["sentiment"].isin(sentiments_sel)]
-if lang_sel:
-    dff = dff[dff["Detected Language"].isin(lang_sel)]
-
-overview = compute_overview(dff)
-monthly = compute_monthly(dff) if len(dff) else pd.DataFrame()
-yearly = compute_yearly(dff) if len(dff) else pd.DataFrame()
-top_media_df = compute_media_summary(dff, top_n=10) if len(dff) else pd.DataFrame()
-anomalies = compute_anomalies(dff) if len(dff) else pd.DataFrame()
+# Satu mask global dari bitmap yang sudah dihitung. Tidak ada salinan df per
+# sesi: tab memakai row id ini untuk mengambil baris dari df bersama.
+with profiler.stage("filter"):
+    active_mask = filter_engine.mask(year_range=year_range, sentiments=sentiments_sel, languages=lang_sel)
+    active_rows = np.flatnonzero(active_mask)
+    n_active = len(active_rows)
+
+    # Grafik waktu & KPI dihitung dari potongan cube dengan filter yang sama
+    cells = cube[cube_engine.mask(year_range=year_range, sentiments=sentiments_sel, languages=lang_sel)]
+filter_sig = filter_signature(data_version, year_range, sentiments_sel, lang_sel)
+overview = compute_overview(filter_sig, cells)
 
 # =============================================================================
 # HERO
@@ -802,7 +758,7 @@ st.markdown(
     <h1 class="hero-title">Persepsi Publik terhadap Jokowi<br>2019–2024</h1>
     <div class="hero-subtitle">
         Dashboard ini merangkum sentimen pemberitaan, dominasi media, pola waktu, dan konteks frasa sampai tiga kata
-        dari <strong style="color:#93c5fd">{len(dff):,} berita</strong> yang lolos filter saat ini.
+        dari <strong style="color:#93c5fd">{n_active:,} berita</strong> yang lolos filter saat ini.
     </div>
     <div class="accent-line"></div>
 </div>
@@ -860,6 +816,10 @@ st.write("")
 # =============================================================================
 # NAVIGATION TABS
 # =============================================================================
+# on_change="rerun" membuat tab punya state (butuh streamlit>=1.55). Setiap
+# interaksi tetap menjalankan ulang seluruh skrip, tetapi hanya isi tab yang
+# aktif (tab.open) yang dijalankan. Hasil tab lain tetap tersimpan di
+# result_cache/wordcloud_cache.
 tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
     "📈 Tren & Dinamika",
     "🗞️ Analisis Media",
@@ -867,7 +827,16 @@ tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
     "📊 Rasio Sentimen",
     "📰 Jelajahi Berita",
     "💾 Export Data"
-])
+], key="active_tab", on_change="rerun")
+skipped_tabs = []
+
+def run_tab(tab, name, render):
+    """Run ``render`` inside ``tab`` only when it is the selected tab, and time it."""
+    if tab.open is False:
+        skipped_tabs.append(name)
+        return
+    with tab, profiler.stage(f"tab:{name}"):
+        render()
 
 # =============================================================================
 # FUNGSI BANTU UNTUK MEMBUNGKUS KONTEN TAB DENGAN CARD
@@ -884,38 +853,42 @@ def tab_content(func):
 # =============================================================================
 # TAB 1 — TREN & DINAMIKA
 # =============================================================================
-with tab1:
+def render_tab1():
+    monthly = compute_monthly(filter_sig, cells) if n_active else pd.DataFrame()
+    yearly = compute_yearly(filter_sig, cells) if n_active else pd.DataFrame()
     with st.container():
         st.markdown('<div class="tab-content-card">', unsafe_allow_html=True)
         st.markdown("### Tren Sentimen Bulanan")
         st.markdown("<div class='section-note'>Dinamika berita positif, netral, dan negatif dari waktu ke waktu.</div>", unsafe_allow_html=True)
 
         if len(monthly):
-            fig_trend = go.Figure()
-            for sent in SENTIMENT_ORDER:
-                if sent in monthly.columns:
-                    c = COLOR_MAP[sent]
-                    fig_trend.add_trace(
-                        go.Scatter(
-                            x=monthly["year_month_dt"],
-                            y=monthly[sent],
-                            name=SENTIMENT_LABEL[sent],
-                            mode="lines",
-                            line=dict(color=c, width=2.8),
-                            fill="tozeroy",
-                            fillcolor=rgba_from_hex(c, 0.12),
-                            hovertemplate="<b>%{x|%b %Y}</b><br>%{fullData.name}: %{y:,}<extra></extra>",
+            def build_trend():
+                fig_trend = go.Figure()
+                for sent in SENTIMENT_ORDER:
+                    if sent in monthly.columns:
+                        c = COLOR_MAP[sent]
+                        fig_trend.add_trace(
+                            line_trace(
+                                monthly["year_month_dt"],
+                                monthly[sent],
+                                name=SENTIMENT_LABEL[sent],
+                                mode="lines",
+                                line=dict(color=c, width=2.8),
+                                fill="tozeroy",
+                                fillcolor=rgba_from_hex(c, 0.12),
+                                hovertemplate="<b>%{x|%b %Y}</b><br>%{fullData.name}: %{y:,}<extra></extra>",
+                            )
                         )
-                    )
-            fig_trend.update_layout(
-                **PLOT_LAYOUT,
-                height=360,
-                hovermode="x unified",
-                xaxis_title=None,
-                yaxis_title="Jumlah berita",
-            )
-            fig_trend.update_xaxes(tickformat="%b\n%Y", tickangle=0)
-            st.plotly_chart(fig_trend, use_container_width=True)
+                fig_trend.update_layout(
+                    **PLOT_LAYOUT,
+                    height=360,
+                    hovermode="x unified",
+                    xaxis_title=None,
+                    yaxis_title="Jumlah berita",
+                )
+                fig_trend.update_xaxes(tickformat="%b\n%Y", tickangle=0)
+                return fig_trend
+            cached_plotly_chart("trend", (), build_trend, use_container_width=True)
         else:
             plot_blank_message("Tidak ada data untuk ditampilkan pada tren bulanan.")
 
@@ -923,8 +896,7 @@ with tab1:
         with c1:
             st.markdown("### Distribusi Sentimen")
             st.markdown("<hr class='section-divider'>", unsafe_allow_html=True)
-            s = dff["sentiment"].value_counts().reindex(SENTIMENT_ORDER).fillna(0).reset_index()
-            s.columns = ["sentiment", "count"]
+            s = pd.DataFrame({"sentiment": SENTIMENT_ORDER, "count": [overview["pos"], overview["neu"], overview["neg"]]})
             fig_donut = go.Figure(go.Pie(
                 labels=[SENTIMENT_LABEL[x] for x in s["sentiment"]],
                 values=s["count"],
@@ -936,7 +908,7 @@ with tab1:
                 **make_plotly_layout(height=300),
                 annotations=[dict(text=f"<b>{human_int(overview['total'])}</b><br>berita", x=0.5, y=0.5, showarrow=False, font=dict(color="#f8fafc", size=14))]
             )
-            st.plotly_chart(fig_donut, use_container_width=True)
+            plotly_chart(fig_donut, use_container_width=True)
 
         with c2:
             st.markdown("### Volume & Komposisi per Tahun")
@@ -954,7 +926,7 @@ with tab1:
                 layout = make_plotly_layout(height=300, xaxis_updates={"tickmode": "linear", "dtick": 1})
                 fig_year.update_layout(**layout)
                 fig_year.update_coloraxes(showscale=False)
-                st.plotly_chart(fig_year, use_container_width=True)
+                plotly_chart(fig_year, use_container_width=True)
             else:
                 st.info("Tidak ada data tahunan.")
 
@@ -962,108 +934,232 @@ with tab1:
         st.markdown("<div class='section-note'>Skor rata-rata (+1 positif, 0 netral, −1 negatif).</div>", unsafe_allow_html=True)
         st.markdown("<hr class='section-divider'>", unsafe_allow_html=True)
         if len(monthly):
-            fig_score = go.Figure()
-            fig_score.add_hline(y=0, line_color="rgba(255,255,255,0.15)", line_dash="dash", line_width=1)
-            fig_score.add_trace(go.Bar(
-                x=monthly["year_month_dt"],
-                y=monthly["net_score"],
-                marker_color=monthly["net_score"].apply(lambda x: COLORS["positive"] if x > 0.05 else (COLORS["negative"] if x < -0.05 else COLORS["neutral"])),
-                marker_line_width=0,
-                hovertemplate="<b>%{x|%b %Y}</b><br>Skor: %{y:.2f}<extra></extra>",
-                name="Skor",
-            ))
-            fig_score.add_trace(go.Scatter(
-                x=monthly["year_month_dt"],
-                y=monthly["ma3_score"],
-                mode="lines",
-                name="MA-3",
-                line=dict(color="#f59e0b", width=2.5, dash="dot"),
-                hovertemplate="MA-3: %{y:.2f}<extra></extra>",
-            ))
-            fig_score.update_layout(**make_plotly_layout(height=280), yaxis_title="Skor sentimen")
-            st.plotly_chart(fig_score, use_container_width=True)
+            def build_score():
+                fig_score = go.Figure()
+                fig_score.add_hline(y=0, line_color="rgba(255,255,255,0.15)", line_dash="dash", line_width=1)
+                # Warna batang per bulan dipilih dengan np.select, bukan Series.apply
+                score = monthly["net_score"].to_numpy()
+                fig_score.add_trace(go.Bar(
+                    x=monthly["year_month_dt"],
+                    y=score,
+                    marker_color=np.select([score > 0.05, score < -0.05], [COLORS["positive"], COLORS["negative"]], COLORS["neutral"]),
+                    marker_line_width=0,
+                    hovertemplate="<b>%{x|%b %Y}</b><br>Skor: %{y:.2f}<extra></extra>",
+                    name="Skor",
+                ))
+                fig_score.add_trace(line_trace(
+                    monthly["year_month_dt"],
+                    monthly["ma3_score"],
+                    mode="lines",
+                    name="MA-3",
+                    line=dict(color="#f59e0b", width=2.5, dash="dot"),
+                    hovertemplate="MA-3: %{y:.2f}<extra></extra>",
+                ))
+                fig_score.update_layout(**make_plotly_layout(height=280), yaxis_title="Skor sentimen")
+                return fig_score
+            cached_plotly_chart("net_score", (), build_score, use_container_width=True)
+
+        st.markdown("### Deteksi Anomali")
+        st.markdown(
+            "<div class='section-note'>Volume dan skor sentimen tiap periode dibandingkan dengan baseline EWMA "
+            "periode-periode sebelumnya (|z| ≥ 3). Dihitung atas seluruh arsip; hanya rentang tahun yang mengikuti filter global.</div>",
+            unsafe_allow_html=True,
+        )
+        col_bucket, col_scope, col_series = st.columns(3)
+        with col_bucket:
+            bucket = st.radio("Periode", ["day", "week"], format_func={"day": "Harian", "week": "Mingguan"}.get, horizontal=True, key="anomaly_bucket")
+        with col_scope:
+            scope = st.selectbox("Deret", ["all", "language", "media"], format_func={"all": "Semua berita", "language": "Per bahasa", "media": "Per media (terbesar)"}.get, key="anomaly_scope")
+        with profiler.stage("anomaly"):
+            anomaly_state = get_anomaly_state(str(data_path), data_version, bucket, scope, cube)
+        with col_series:
+            series_key = st.selectbox("Pilih deret", anomaly_state.keys, key=f"anomaly_series_{scope}") if scope != "all" else ALL_KEY
+        in_range = lambda f: f[f["bucket"].dt.year.between(year_range[0], year_range[1])]
+        series_df = in_range(anomaly_state.frame(series_key))
+        if len(series_df):
+            def build_anomaly():
+                band = series_df["vol_expected"] + 3 * np.maximum(series_df["vol_std"], np.sqrt(series_df["vol_expected"].clip(lower=1.0)))
+                flagged = series_df[series_df["flag_volume"] | series_df["flag_score"]]
+                fig_anom = go.Figure()
+                # Deret harian 5 tahun: garis diringkas LTTB, titik anomali tetap dikirim semua
+                fig_anom.add_trace(line_trace(series_df["bucket"], band, mode="lines", name="Batas atas (z=3)", line=dict(color="rgba(248,113,113,0.45)", width=1, dash="dot")))
+                fig_anom.add_trace(line_trace(series_df["bucket"], series_df["volume"], mode="lines", name="Volume", line=dict(color=COLORS["info"], width=1.5)))
+                fig_anom.add_trace(line_trace(series_df["bucket"], series_df["vol_expected"], mode="lines", name="Baseline EWMA", line=dict(color="#f59e0b", width=2)))
+                fig_anom.add_trace(go.Scatter(
+                    x=flagged["bucket"], y=flagged["volume"], mode="markers", name="Anomali",
+                    marker=dict(color=COLORS["negative"], size=9, symbol="diamond"),
+                    customdata=np.stack([flagged["z_volume"], flagged["z_score"]], axis=-1) if len(flagged) else None,
+                    hovertemplate="<b>%{x|%d %b %Y}</b><br>Volume: %{y}<br>z volume: %{customdata[0]:.1f}<br>z skor: %{customdata[1]:.1f}<extra></extra>",
+                ))
+                fig_anom.update_layout(**make_plotly_layout(height=320), yaxis_title="Jumlah berita")
+                return fig_anom
+            # Data baru mengubah versi dataset di filter_sig, jadi state lama tidak terpakai ulang
+            cached_plotly_chart("anomaly", (bucket, scope, series_key), build_anomaly, use_container_width=True)
+
+            alerts = in_range(anomaly_state.alerts()).head(20)
+            if len(alerts):
+                st.markdown("#### Anomali terbaru")
+                alerts_view = alerts[["bucket", "series", "volume", "vol_expected", "z_volume", "score", "z_score", "provisional"]].copy()
+                alerts_view.columns = ["Periode", "Deret", "Volume", "Baseline", "z volume", "Skor", "z skor", "Sementara"]
+                st.dataframe(alerts_view.round(2), use_container_width=True, hide_index=True)
+        else:
+            st.info("Tidak ada data untuk deret ini pada rentang tahun yang dipilih.")
 
         st.markdown("### Insight Tambahan")
         st.markdown("<hr class='section-divider'>", unsafe_allow_html=True)
 
         st.markdown("#### Distribusi Hari Publikasi")
-        if len(dff):
+        if n_active:
             dow_order = ["Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]
             dow_id = {"Monday":"Sen","Tuesday":"Sel","Wednesday":"Rab","Thursday":"Kam","Friday":"Jum","Saturday":"Sab","Sunday":"Min"}
-            dow = dff["day_name"].value_counts().reindex(dow_order).fillna(0).reset_index()
+            dow = cells.groupby("day_name")["count"].sum().reindex(dow_order).fillna(0).reset_index()
             dow.columns = ["Hari", "Jumlah"]
             dow["Hari_ID"] = dow["Hari"].map(dow_id)
             fig_dow = px.bar(dow, x="Hari_ID", y="Jumlah", color="Jumlah", color_continuous_scale=[[0, "#111827"], [1, COLORS["info"]]])
             fig_dow.update_coloraxes(showscale=False)
             fig_dow.update_layout(**make_plotly_layout(height=300), xaxis_title=None, yaxis_title="Jumlah berita")
             fig_dow.update_traces(marker_line_width=0)
-            st.plotly_chart(fig_dow, use_container_width=True)
+            plotly_chart(fig_dow, use_container_width=True)
         else:
             st.info("Tidak ada data.")
 
+        if n_active:
+            title_counts, title_summary, title_grid, title_density = compute_title_length_stats(filter_sig, active_mask)
         col_left, col_right = st.columns(2)
         with col_left:
             st.markdown("#### Perbandingan Panjang Judul")
-            if len(dff):
-                fig_v = go.Figure()
-                for sent in SENTIMENT_ORDER:
-                    vals = dff.loc[dff["sentiment"] == sent, "title_word_count"]
-                    if len(vals) > 0:
-                        fig_v.add_trace(go.Violin(
-                            y=vals,
-                            name=SENTIMENT_LABEL[sent],
+            if n_active:
+                def build_title_violin():
+                    # Violin digambar dari KDE dan statistik box yang sudah dihitung di server
+                    fig_v = go.Figure()
+                    labels = [SENTIMENT_LABEL[sent] for sent in SENTIMENT_ORDER]
+                    for i, sent in enumerate(SENTIMENT_ORDER):
+                        stats = title_summary.loc[sent]
+                        if stats["n"] == 0:
+                            continue
+                        inside = ~np.isnan(title_density[i])
+                        y, half = title_grid[inside], title_density[i, inside] / np.nanmax(title_density[i]) * 0.45
+                        fig_v.add_trace(go.Scatter(
+                            x=np.concatenate([i - half, (i + half)[::-1]]),
+                            y=np.concatenate([y, y[::-1]]),
+                            mode="lines",
+                            fill="toself",
                             fillcolor=rgba_from_hex(COLOR_MAP[sent], 0.2),
-                            line_color=COLOR_MAP[sent],
-                            meanline_visible=True,
-                            box_visible=True,
+                            line=dict(color=COLOR_MAP[sent], width=1.5),
                             opacity=0.8,
+                            name=labels[i],
+                            legendgroup=sent,
+                            hoverinfo="skip",
                         ))
-                fig_v.update_layout(**make_plotly_layout(height=400), yaxis_title="Jumlah kata", violinmode="overlay")
-                st.plotly_chart(fig_v, use_container_width=True)
+                        fig_v.add_trace(go.Box(
+                            x=[i],
+                            q1=[stats["q1"]],
+                            median=[stats["median"]],
+                            q3=[stats["q3"]],
+                            lowerfence=[stats["lowerfence"]],
+                            upperfence=[stats["upperfence"]],
+                            mean=[stats["mean"]],
+                            boxmean=True,
+                            width=0.08,
+                            fillcolor=rgba_from_hex(COLOR_MAP[sent], 0.6),
+                            line=dict(color=COLOR_MAP[sent], width=1),
+                            name=labels[i],
+                            legendgroup=sent,
+                            showlegend=False,
+                        ))
+                    fig_v.update_layout(
+                        **make_plotly_layout(height=400, xaxis_updates={"tickmode": "array", "tickvals": list(range(len(labels))), "ticktext": labels}),
+                        yaxis_title="Jumlah kata",
+                    )
+                    return fig_v
+                cached_plotly_chart("title_violin", (), build_title_violin, use_container_width=True)
             else:
                 st.info("Tidak ada data.")
 
         with col_right:
             st.markdown("#### Distribusi Panjang Judul")
-            if len(dff):
-                title_len_filtered = dff[dff["title_word_count"] <= 25]["title_word_count"]
-                fig_title = px.histogram(title_len_filtered, x="title_word_count", nbins=24, color_discrete_sequence=[COLORS["neutral"]])
-                fig_title.update_layout(**make_plotly_layout(height=400), xaxis_title="Jumlah kata", yaxis_title="Frekuensi")
-                fig_title.update_traces(marker_line_width=0)
-                st.plotly_chart(fig_title, use_container_width=True)
+            if n_active:
+                def build_title_histogram():
+                    # Satu batang per jumlah kata (≤ 25), dari hitungan bincount yang sama
+                    totals = title_counts.sum(axis=0)[:26]
+                    fig_title = go.Figure(go.Bar(
+                        x=np.arange(len(totals)),
+                        y=totals,
+                        marker_color=COLORS["neutral"],
+                        marker_line_width=0,
+                        hovertemplate="%{x} kata: %{y:,} judul<extra></extra>",
+                    ))
+                    fig_title.update_layout(**make_plotly_layout(height=400), xaxis_title="Jumlah kata", yaxis_title="Frekuensi", bargap=0.05)
+                    return fig_title
+                cached_plotly_chart("title_histogram", (), build_title_histogram, use_container_width=True)
             else:
                 st.info("Tidak ada data.")
 
         st.markdown('</div>', unsafe_allow_html=True)
 
+run_tab(tab1, "tren", render_tab1)
+
 # =============================================================================
 # TAB 2 — ANALISIS MEDIA
 # =============================================================================
-with tab2:
+def render_tab2():
     st.markdown("### Top 10 Media Paling Sering Muncul")
-    if len(dff):
-        top_media_counts = dff["Nama Media"].value_counts().head(10).reset_index()
-        top_media_counts.columns = ["Nama Media", "count"]
-        top_media_counts = top_media_counts.sort_values("count", ascending=True)
+    if n_active:
+        # Satu tabel media × sentimen × bulan melayani top 10, daftar media, pie dan tren per media
+        media_table, table_months = compute_media_table(filter_sig, cells)
+        media_totals = media_table.sum(axis=(1, 2))
+        ranked = np.argsort(-media_totals, kind="stable")
+        ranked = ranked[media_totals[ranked] > 0]
+        top_ids = ranked[:10][::-1]
         fig_top = go.Figure(go.Bar(
-            x=top_media_counts["count"],
-            y=top_media_counts["Nama Media"],
+            x=media_totals[top_ids],
+            y=media_index.names[top_ids],
             orientation="h",
-            marker=dict(color=top_media_counts["count"], colorscale=[[0, "#1f2937"], [1, COLORS["info"]]]),
-            text=top_media_counts["count"].map(lambda x: f"{x:,}"),
+            marker=dict(color=media_totals[top_ids], colorscale=[[0, "#1f2937"], [1, COLORS["info"]]]),
+            text=[f"{x:,}" for x in media_totals[top_ids]],
             textposition="outside",
         ))
         fig_top.update_layout(**PLOT_LAYOUT, height=400, xaxis_title="Jumlah berita", yaxis_title=None)
-        st.plotly_chart(fig_top, use_container_width=True)
+        plotly_chart(fig_top, use_container_width=True)
+
+        st.markdown("---")
+        st.markdown("### Konsentrasi Pemberitaan per Bulan")
+        concentration = compute_media_concentration(filter_sig, (media_table, table_months))
+        metric_labels = {
+            "hhi": "HHI (0–10.000)",
+            "top10_share": "Pangsa 10 media teratas",
+            "top5_share": "Pangsa 5 media teratas",
+            "gini": "Koefisien Gini",
+            "effective_media": "Jumlah media efektif (10.000 / HHI)",
+        }
+        metric = st.radio(
+            "Metrik:", list(metric_labels), format_func=metric_labels.get, horizontal=True, key="concentration_metric"
+        )
+        def build_concentration():
+            fig_conc = go.Figure()
+            series_colors = {ALL_SENTIMENTS: COLORS["info"], **COLOR_MAP}
+            for sent in [ALL_SENTIMENTS] + SENTIMENT_ORDER:
+                part = concentration[(concentration["sentiment"] == sent) & (concentration["total"] > 0)]
+                fig_conc.add_trace(line_trace(
+                    part["period_start"], part[metric], mode="lines",
+                    name="Semua berita" if sent == ALL_SENTIMENTS else SENTIMENT_LABEL[sent],
+                    line=dict(color=series_colors[sent], width=3 if sent == ALL_SENTIMENTS else 1.5),
+                    customdata=part[["total", "n_media"]].to_numpy(),
+                    hovertemplate="%{x|%Y-%m}: %{y:,.3f}<br>%{customdata[0]:,.0f} berita dari %{customdata[1]:,.0f} media<extra></extra>",
+                ))
+            fig_conc.update_layout(**make_plotly_layout(height=380), yaxis_title=metric_labels[metric], hovermode="x unified")
+            return fig_conc
+        cached_plotly_chart("concentration", (metric,), build_concentration, use_container_width=True)
+        st.caption("Nilai yang naik (HHI, pangsa top-k, Gini) berarti pemberitaan makin terpusat pada sedikit media.")
 
         st.markdown("---")
         st.markdown("### Proporsi Sentimen per Media")
         # Daftar media diurutkan dari yang paling banyak beritanya
-        media_list = dff["Nama Media"].value_counts().index.tolist()
+        media_list = media_index.names[ranked].tolist()
         selected_media = st.selectbox("Pilih media:", media_list, key="media_select")
         if selected_media:
-            media_df = dff[dff["Nama Media"] == selected_media]
-            sent_counts = media_df["sentiment"].value_counts().reindex(SENTIMENT_ORDER).fillna(0)
+            media_id = media_index.media_id(selected_media)
+            sent_counts = pd.Series(media_table[media_id].sum(axis=1), index=SENTIMENT_ORDER)
             fig_pie = go.Figure(go.Pie(
                 labels=[SENTIMENT_LABEL[s] for s in sent_counts.index],
                 values=sent_counts.values,
@@ -1072,7 +1168,22 @@ with tab2:
                 hovertemplate="%{label}: %{value} berita (%{percent})<extra></extra>"
             ))
             fig_pie.update_layout(**PLOT_LAYOUT, height=350, title=f"Proporsi sentimen untuk {selected_media}")
-            st.plotly_chart(fig_pie, use_container_width=True)
+            col_pie, col_trend = st.columns([2, 3])
+            with col_pie:
+                plotly_chart(fig_pie, use_container_width=True)
+            with col_trend:
+                def build_media_trend():
+                    month_dt = period_start(table_months, "month")
+                    fig_media_trend = go.Figure()
+                    for i, sent in enumerate(SENTIMENT_ORDER):
+                        fig_media_trend.add_trace(go.Bar(x=month_dt, y=media_table[media_id, i], name=SENTIMENT_LABEL[sent], marker_color=COLOR_MAP[sent], marker_line_width=0))
+                    fig_media_trend.update_layout(**make_plotly_layout(height=350), barmode="stack", title=f"Berita bulanan {selected_media}", yaxis_title="Jumlah berita")
+                    return fig_media_trend
+                cached_plotly_chart("media_trend", (selected_media,), build_media_trend, use_container_width=True)
+
+            # Baris media ini (urut tanggal) yang lolos filter global: O(jumlah berita media ini)
+            outlet_rows = media_index.rows(media_id)
+            outlet_rows = outlet_rows[active_mask[outlet_rows]]
 
             # Tombol untuk melihat berita per sentimen
             if "clicked_sentiment_media" not in st.session_state:
@@ -1097,8 +1208,11 @@ with tab2:
                     st.markdown(f"#### Berita dengan sentimen **{SENTIMENT_LABEL[sent_filter]}** dari **{selected_media}**")
                 with col_date:
                     st.markdown("##### Filter Tanggal")
-                    min_date_media = media_df["Waktu Terbit"].min().date() if not media_df.empty else pd.Timestamp.now().date()
-                    max_date_media = media_df["Waktu Terbit"].max().date() if not media_df.empty else pd.Timestamp.now().date()
+                    if len(outlet_rows):
+                        min_date_media = pd.Timestamp(media_index.times[outlet_rows[0]]).date()
+                        max_date_media = pd.Timestamp(media_index.times[outlet_rows[-1]]).date()
+                    else:
+                        min_date_media = max_date_media = pd.Timestamp.now().date()
                     date_range_media = st.date_input(
                         "",
                         value=(min_date_media, max_date_media),
@@ -1110,39 +1224,29 @@ with tab2:
                     else:
                         start_date, end_date = min_date_media, max_date_media
 
-                filtered_media_df = media_df[
-                    (media_df["Waktu Terbit"].dt.date >= start_date) &
-                    (media_df["Waktu Terbit"].dt.date <= end_date)
-                ]
-                news_df = filtered_media_df[filtered_media_df["sentiment"] == sent_filter].sort_values("Waktu Terbit", ascending=False).head(20)
+                media_rows = media_index.rows(media_id, np.datetime64(start_date), np.datetime64(end_date) + np.timedelta64(1, "D"))
+                media_rows = media_rows[active_mask[media_rows] & (df["sentiment"].iloc[media_rows] == sent_filter).to_numpy()]
 
                 # Tampilkan daftar berita
-                if len(news_df) == 0:
+                if len(media_rows) == 0:
                     st.info("Tidak ada berita dengan sentimen tersebut dalam rentang tanggal yang dipilih.")
                 else:
-                    for _, row in news_df.iterrows():
-                        sent = row["sentiment"]
-                        dt = row["Waktu Terbit"].strftime("%Y-%m-%d") if not pd.isna(row["Waktu Terbit"]) else "-"
-                        st.markdown(f"""
-            <div class="news-card news-{sent[:3]}">
-            <div class="news-title">{style_sentiment_badge(sent)} &nbsp; {row["Judul Berita"]}</div>
-            <div class="news-meta">
-                <span>📅 {dt}</span>
-                <span>🌐 {row["Detected Language"]}</span>
-                {"<span>🔗 <a href='" + row["Link Berita"] + "' target='_blank' style='color:#93c5fd;text-decoration:none;'>Buka sumber</a></span>" if str(row["Link Berita"]).strip() else ""}
-            </div>
-            </div>
-            """, unsafe_allow_html=True)
+                    news_pager(
+                        "media", media_rows, (filter_sig, selected_media, sent_filter, start_date, end_date),
+                        page_size=20, show_media=False,
+                    )
                 if st.button("Tutup daftar berita", key="reset_news_media"):
                     st.session_state.clicked_sentiment_media = None
                     st.rerun()
     else:
         plot_blank_message("Tidak ada data media untuk ditampilkan.")
 
+run_tab(tab2, "media", render_tab2)
+
 # =============================================================================
 # TAB 3 — N-GRAM & WORDCLOUD
 # =============================================================================
-with tab3:
+def render_tab3():
     with st.container():
         st.markdown('<div class="tab-content-card">', unsafe_allow_html=True)
         st.markdown("### Wordcloud per Sentimen (Unigram)")
@@ -1158,8 +1262,14 @@ with tab3:
                 continue
             with wc_cols[i]:
                 st.markdown(f"<span class='badge {('badge-pos' if sent=='positive' else 'badge-neu' if sent=='neutral' else 'badge-neg')}'>{wc_cfg[sent][0]}</span>", unsafe_allow_html=True)
-                text_data = " ".join(dff.loc[dff["sentiment"] == sent, "processed_text"].dropna().astype(str).tolist())
-                img = render_wordcloud(text_data, bg_color=wc_cfg[sent][2], cmap=wc_cfg[sent][1], max_words=120)
+                with profiler.stage("wordcloud"):
+                    img = wordcloud_cache.get_or_compute(
+                        (filter_sig, sent, 120),
+                        lambda: render_wordcloud(
+                            wordcloud_frequencies(ngram_index, np.flatnonzero(active_mask & filter_engine.mask(sentiments=[sent])), 120),
+                            bg_color=wc_cfg[sent][2], cmap=wc_cfg[sent][1], max_words=120,
+                        ),
+                    )
                 if img is None:
                     st.info("Tidak cukup teks untuk wordcloud.")
                 else:
@@ -1186,7 +1296,10 @@ with tab3:
             format_func=lambda x: SENTIMENT_LABEL[x],
             key="ngram_focus_sent_tab3",
         )
-        ngram_df_local = ngram_df_from_series(dff.loc[dff["sentiment"] == focus_sent, "processed_text"], n=ngram_level, top_n=top_k_ngram_local, sentiment=focus_sent)
+        # Row id df sama dengan baris matriks n-gram
+        focus_rows = np.flatnonzero(active_mask & filter_engine.mask(sentiments=[focus_sent]))
+        with profiler.stage("ngram_counts"):
+            ngram_df_local = ngram_df_from_index(ngram_index, focus_rows, n=ngram_level, top_n=top_k_ngram_local, sentiment=focus_sent)
         if len(ngram_df_local):
             fig_ng = px.bar(
                 ngram_df_local.sort_values("freq", ascending=True),
@@ -1200,7 +1313,7 @@ with tab3:
             )
             fig_ng.update_traces(textposition="outside")
             fig_ng.update_layout(**PLOT_LAYOUT, height=max(400, 34 * len(ngram_df_local) + 100), showlegend=False, xaxis_title="Frekuensi", yaxis_title=None)
-            st.plotly_chart(fig_ng, use_container_width=True)
+            plotly_chart(fig_ng, use_container_width=True)
 
             st.markdown("#### 🔍 Telusuri berita berdasarkan frasa")
 
@@ -1211,8 +1324,7 @@ with tab3:
                 selected_phrase = st.selectbox("Pilih frasa:", phrase_list, key="phrase_select_ngram")
 
             with col_date:
-                min_date_ngram = dff["Waktu Terbit"].min().date() if not dff.empty else pd.Timestamp.now().date()
-                max_date_ngram = dff["Waktu Terbit"].max().date() if not dff.empty else pd.Timestamp.now().date()
+                min_date_ngram, max_date_ngram = date_bounds(active_rows)
                 date_range_ngram = st.date_input(
                     "📅 Rentang tanggal",
                     value=(min_date_ngram, max_date_ngram),
@@ -1224,77 +1336,69 @@ with tab3:
                     start_ngram, end_ngram = min_date_ngram, max_date_ngram
 
             if selected_phrase:
-                phrase_lower = selected_phrase.lower()
-
                 # Cari berita dengan sentimen focus_sent, mengandung frasa, dan dalam rentang tanggal
-                news_with_phrase = dff[
-                    (dff["sentiment"] == focus_sent) &
-                    (dff["processed_text"].str.contains(phrase_lower, na=False, regex=False)) &
-                    (dff["Waktu Terbit"].dt.date >= start_ngram) &
-                    (dff["Waktu Terbit"].dt.date <= end_ngram)
-                ]
-                if len(news_with_phrase) == 0:
+                focus_mask = active_mask & filter_engine.mask(sentiments=[focus_sent])
+                with profiler.stage("phrase_search"):
+                    phrase_rows = phrase_index.search(selected_phrase, mask=focus_mask)
+                phrase_rows = rows_between_dates(np.asarray(phrase_rows, dtype=np.int64), start_ngram, end_ngram)
+                if len(phrase_rows) == 0:
                     st.info(f"Tidak ditemukan berita dengan sentimen {SENTIMENT_LABEL[focus_sent]} yang mengandung frasa '{selected_phrase}' dalam rentang tanggal tersebut.")
                 else:
-                    st.markdown(f"**{len(news_with_phrase)}** berita ditemukan dengan sentimen **{SENTIMENT_LABEL[focus_sent]}** dan mengandung frasa **'{selected_phrase}'**.")
-                    for _, row in news_with_phrase.head(10).iterrows():
-                        sent = row["sentiment"]
-                        dt = row["Waktu Terbit"].strftime("%Y-%m-%d") if not pd.isna(row["Waktu Terbit"]) else "-"
-                        st.markdown(f"""
-            <div class="news-card news-{sent[:3]}">
-            <div class="news-title">{style_sentiment_badge(sent)} &nbsp; {row["Judul Berita"]}</div>
-            <div class="news-meta">
-                <span>📰 {row["Nama Media"]}</span>
-                <span>📅 {dt}</span>
-                <span>🌐 {row["Detected Language"]}</span>
-                {"<span>🔗 <a href='" + row["Link Berita"] + "' target='_blank' style='color:#93c5fd;text-decoration:none;'>Buka sumber</a></span>" if str(row["Link Berita"]).strip() else ""}
-            </div>
-            </div>
-            """, unsafe_allow_html=True)
+                    st.markdown(f"**{len(phrase_rows)}** berita ditemukan dengan sentimen **{SENTIMENT_LABEL[focus_sent]}** dan mengandung frasa **'{selected_phrase}'**.")
+                    news_pager(
+                        "phrase", phrase_rows, (filter_sig, focus_sent, selected_phrase, start_ngram, end_ngram),
+                        page_size=10,
+                    )
+
+run_tab(tab3, "ngram", render_tab3)
 
 # =============================================================================
 # TAB 4 — RASIO SENTIMEN
 # =============================================================================
-with tab4:
+def render_tab4():
     with st.container():
         st.markdown('<div class="tab-content-card">', unsafe_allow_html=True)
         st.markdown("### Rasio Positif vs Negatif")
-        granularity = st.selectbox("Tampilkan berdasarkan:", ["Bulan", "Kuartal", "Tahun"], index=0)
-        if granularity == "Bulan":
+        granularity = st.selectbox("Tampilkan berdasarkan:", ["Minggu (ISO)", "Bulan", "Kuartal", "Tahun"], index=1)
+        if granularity == "Minggu (ISO)":
+            time_col = "week"
+        elif granularity == "Bulan":
             time_col = "month"
         elif granularity == "Kuartal":
             time_col = "quarter"
         else:
             time_col = "year"
 
-        ratio_df = compute_ratio_by_time(dff, granularity=time_col)
+        ratio_df = compute_ratio_by_time(filter_sig, cells, time_col)
         if len(ratio_df):
-            fig_ratio = go.Figure()
-            fig_ratio.add_trace(go.Scatter(
-                x=ratio_df["time_period"],
-                y=ratio_df["positive_ratio"],
-                mode="lines+markers",
-                name="Positif (%)",
-                line=dict(color=COLORS["positive"], width=3),
-                marker=dict(size=6),
-            ))
-            fig_ratio.add_trace(go.Scatter(
-                x=ratio_df["time_period"],
-                y=ratio_df["negative_ratio"],
-                mode="lines+markers",
-                name="Negatif (%)",
-                line=dict(color=COLORS["negative"], width=3),
-                marker=dict(size=6),
-            ))
-            fig_ratio.add_hline(y=50, line_dash="dash", line_color="rgba(255,255,255,0.3)", annotation_text="Seimbang")
-            fig_ratio.update_layout(
-                **PLOT_LAYOUT,
-                height=400,
-                xaxis_title=None,
-                yaxis_title="Persentase (%)",
-                hovermode="x unified",
-            )
-            st.plotly_chart(fig_ratio, use_container_width=True)
+            def build_ratio():
+                fig_ratio = go.Figure()
+                fig_ratio.add_trace(line_trace(
+                    ratio_df["time_period"],
+                    ratio_df["positive_ratio"],
+                    mode="lines+markers",
+                    name="Positif (%)",
+                    line=dict(color=COLORS["positive"], width=3),
+                    marker=dict(size=6),
+                ))
+                fig_ratio.add_trace(line_trace(
+                    ratio_df["time_period"],
+                    ratio_df["negative_ratio"],
+                    mode="lines+markers",
+                    name="Negatif (%)",
+                    line=dict(color=COLORS["negative"], width=3),
+                    marker=dict(size=6),
+                ))
+                fig_ratio.add_hline(y=50, line_dash="dash", line_color="rgba(255,255,255,0.3)", annotation_text="Seimbang")
+                fig_ratio.update_layout(
+                    **PLOT_LAYOUT,
+                    height=400,
+                    xaxis_title=None,
+                    yaxis_title="Persentase (%)",
+                    hovermode="x unified",
+                )
+                return fig_ratio
+            cached_plotly_chart("ratio", (time_col,), build_ratio, use_container_width=True)
 
             st.markdown("#### Data Rasio")
             display_ratio = ratio_df[["time_period", "positive_ratio", "negative_ratio"]].copy()
@@ -1304,10 +1408,12 @@ with tab4:
             plot_blank_message("Tidak cukup data untuk menghitung rasio.")
         st.markdown('</div>', unsafe_allow_html=True)
 
+run_tab(tab4, "rasio", render_tab4)
+
 # =============================================================================
 # TAB 5 — JELAJAHI BERITA
 # =============================================================================
-with tab5:
+def render_tab5():
     with st.container():
         st.markdown('<div class="tab-content-card">', unsafe_allow_html=True)
         st.markdown("### Jelajahi Berita")
@@ -1324,8 +1430,7 @@ with tab5:
             )
 
         with col2:
-            min_date_all = dff["Waktu Terbit"].min().date() if not dff.empty else pd.Timestamp.now().date()
-            max_date_all = dff["Waktu Terbit"].max().date() if not dff.empty else pd.Timestamp.now().date()
+            min_date_all, max_date_all = date_bounds(active_rows)
             date_range_tab5 = st.date_input(
                 "Rentang tanggal",
                 value=(min_date_all, max_date_all),
@@ -1340,73 +1445,128 @@ with tab5:
             keyword_tab5 = st.text_input("Cari judul", placeholder="misalnya: ekonomi, infrastruktur", key="keyword_tab5")
 
         with col4:
-            n_show_tab5 = st.number_input("Jumlah", min_value=5, max_value=100, value=20, step=5, key="n_show_tab5")
+            n_show_tab5 = st.number_input("Per halaman", min_value=5, max_value=100, value=20, step=5, key="n_show_tab5")
 
-        news_df_tab5 = dff.copy()
+        # Semua filter tab ini bekerja pada row id, tanpa menyalin DataFrame
+        tab5_mask = active_mask
         if sent_filter_tab5 != "Semua":
-            news_df_tab5 = news_df_tab5[news_df_tab5["sentiment"] == sent_filter_tab5]
-        if keyword_tab5.strip():
-            news_df_tab5 = news_df_tab5[news_df_tab5["Judul Berita"].str.contains(keyword_tab5.strip(), case=False, na=False)]
-        # Filter tanggal
-        news_df_tab5 = news_df_tab5[
-            (news_df_tab5["Waktu Terbit"].dt.date >= start_date_tab5) &
-            (news_df_tab5["Waktu Terbit"].dt.date <= end_date_tab5)
-        ]
-        news_df_tab5 = news_df_tab5.sort_values("Waktu Terbit", ascending=False).head(int(n_show_tab5))
-
+            tab5_mask = tab5_mask & filter_engine.mask(sentiments=[sent_filter_tab5])
+        if keyword_tab5.strip() and title_index.tokenize(keyword_tab5):
+            with profiler.stage("title_search"):
+                tab5_rows = np.asarray(title_index.search(keyword_tab5, mask=tab5_mask, prefix=True), dtype=np.int64)
+        else:
+            tab5_rows = np.flatnonzero(tab5_mask)
+            if keyword_tab5.strip():
+                # Kata kunci tanpa huruf/angka (mis. tanda baca saja): pakai pencarian substring
+                titles = df["Judul Berita"].iloc[tab5_rows]
+                tab5_rows = tab5_rows[titles.str.contains(keyword_tab5.strip(), case=False, na=False, regex=False).to_numpy()]
+        tab5_rows = rows_between_dates(tab5_rows, start_date_tab5, end_date_tab5)
+
+        # Metrik dihitung atas semua berita yang cocok, bukan hanya halaman yang tampil
+        tab5_sent = df["sentiment"].iloc[tab5_rows]
         col_m1, col_m2, col_m3 = st.columns(3)
         with col_m1:
-            st.metric("Berita ditemukan", human_int(len(news_df_tab5)))
+            st.metric("Berita ditemukan", human_int(len(tab5_rows)))
         with col_m2:
-            st.metric("Positif", human_int((news_df_tab5["sentiment"] == "positive").sum()))
+            st.metric("Positif", human_int((tab5_sent == "positive").sum()))
         with col_m3:
-            st.metric("Negatif", human_int((news_df_tab5["sentiment"] == "negative").sum()))
+            st.metric("Negatif", human_int((tab5_sent == "negative").sum()))
 
-        if len(news_df_tab5) == 0:
+        if len(tab5_rows) == 0:
             st.info("Tidak ada berita yang cocok dengan filter.")
         else:
-            for _, row in news_df_tab5.iterrows():
-                sent = row["sentiment"]
-                dt = row["Waktu Terbit"].strftime("%Y-%m-%d") if not pd.isna(row["Waktu Terbit"]) else "-"
-                st.markdown(f"""
-<div class="news-card news-{sent[:3]}">
-  <div class="news-title">{style_sentiment_badge(sent)} &nbsp; {row["Judul Berita"]}</div>
-  <div class="news-meta">
-    <span>📰 {row["Nama Media"]}</span>
-    <span>📅 {dt}</span>
-    <span>🌐 {row["Detected Language"]}</span>
-    {"<span>🔗 <a href='" + row["Link Berita"] + "' target='_blank' style='color:#93c5fd;text-decoration:none;'>Buka sumber</a></span>" if str(row["Link Berita"]).strip() else ""}
-  </div>
-</div>
-""", unsafe_allow_html=True)
-
-        st.markdown("### Data Terfilter (CSV Preview)")
-        st.dataframe(
-            news_df_tab5[["Waktu Terbit", "Judul Berita", "Nama Media", "sentiment", "Detected Language", "Link Berita"]].sort_values("Waktu Terbit", ascending=False),
-            use_container_width=True,
-            hide_index=True,
-        )
+            page_rows = news_pager(
+                "tab5", tab5_rows,
+                (filter_sig, sent_filter_tab5, keyword_tab5.strip(), start_date_tab5, end_date_tab5, int(n_show_tab5)),
+                page_size=int(n_show_tab5),
+            )
+            with st.expander("Tabel halaman ini"):
+                st.dataframe(
+                    df.iloc[page_rows][["Waktu Terbit", "Judul Berita", "Nama Media", "sentiment", "Detected Language", "Link Berita"]],
+                    use_container_width=True,
+                    hide_index=True,
+                )
         st.markdown('</div>', unsafe_allow_html=True)
 
+run_tab(tab5, "berita", render_tab5)
+
 # =============================================================================
 # TAB 6 — EXPORT
 # =============================================================================
-with tab6:
+def render_tab6():
     with st.container():
         st.markdown('<div class="tab-content-card">', unsafe_allow_html=True)
         st.markdown("### Export Data")
         st.markdown("<div class='section-note'>Unduh data yang sudah difilter (global) untuk analisis lanjutan.</div>", unsafe_allow_html=True)
-        if len(dff):
-            export_cols = ["Judul Berita", "Nama Media", "Waktu Terbit", "Link Berita", "Detected Language", "confidence", "text_word_count", "sentiment", "year", "month", "year_month", "quarter"]
-            export_cols = [c for c in export_cols if c in dff.columns]
-            export_df = dff[export_cols].copy()
-            st.dataframe(export_df.head(100), use_container_width=True, hide_index=True)
-            csv_bytes = download_csv(export_df)
-            st.download_button("⬇️ Download filtered CSV", data=csv_bytes, file_name="filtered_publik_persepsi.csv", mime="text/csv")
+        if n_active:
+            export_cols = [c for c in EXPORT_COLUMNS if c in df.columns]
+            st.dataframe(df.iloc[active_rows[:100]][export_cols], use_container_width=True, hide_index=True)
+            fmt = st.radio(
+                "Format",
+                list(EXPORT_FORMATS),
+                format_func=lambda f: {"csv.gz": "CSV (gzip)", "parquet": "Parquet", "arrow": "Arrow IPC"}[f],
+                horizontal=True,
+                key="export_format_tab6",
+            )
+            ext, mime = EXPORT_FORMATS[fmt]
+            row_ids = active_rows
+            # File baru dibuat saat tombol diklik (di thread terpisah), ditulis per chunk
+            # ke disk, dan dipakai ulang selama signature filter tidak berubah.
+            # download_button tidak bisa streaming: objek file pun dibaca utuh ke
+            # bytes dan disimpan di media storage Streamlit, jadi puncak memori
+            # saat diklik tetap sebesar file (terkompresi) ini.
+            st.download_button(
+                f"⬇️ Download filtered {ext.lstrip('.').upper()}",
+                data=lambda: export_bytes(export_cache, filter_sig, df, row_ids, fmt, export_cols),
+                file_name=f"filtered_publik_persepsi{ext}",
+                mime=mime,
+            )
         else:
             st.info("Tidak ada data untuk diekspor.")
         st.markdown('</div>', unsafe_allow_html=True)
 
+run_tab(tab6, "export", render_tab6)
+
+# =============================================================================
+# STATISTIK CACHE
+# =============================================================================
+with st.sidebar:
+    with st.expander("⚙️ Statistik cache"):
+        cache_stats = result_cache.stats()
+        st.markdown(
+            f"""
+<div class="small-muted">
+<b>Hit / miss:</b> {cache_stats["hits"]:,} / {cache_stats["misses"]:,} ({cache_stats["hit_rate"] * 100:.0f}%)<br>
+<b>Entri:</b> {cache_stats["entries"]:,} · {cache_stats["bytes"] / 2**20:.1f} MB<br>
+<b>Eviction:</b> {cache_stats["evictions"]:,}<br>
+<b>Wordcloud (disk):</b> {wordcloud_cache.hits:,} hit / {wordcloud_cache.misses:,} miss
+</div>
+""",
+            unsafe_allow_html=True,
+        )
+        # Tab yang tidak aktif tidak dijalankan pada rerun ini (ditandai "–")
+        tab_ms = {rec["stage"][4:]: rec["ms"] for rec in profiler.records.values() if rec["stage"].startswith("tab:")}
+        timing_rows = "".join(
+            f"{name}: {'–' if name in skipped_tabs else f'{tab_ms.get(name, 0):,.0f} ms'}<br>"
+            for name in [*tab_ms, *skipped_tabs]
+        )
+        st.markdown(f"<div class='small-muted'><b>Waktu render tab (rerun terakhir):</b><br>{timing_rows}</div>", unsafe_allow_html=True)
+
+    # Panel profil tersembunyi: buka dengan ?admin=1 atau JOKOWI_ADMIN=1
+    if admin_enabled(st.query_params):
+        with st.expander("🛠️ Profil rerun (admin)"):
+            st.caption(
+                f"Total sejauh ini: {profiler.total_ms():,.0f} ms · tahap bersarang ikut dihitung di induknya"
+                " · kolom RSS adalah selisih memori seluruh proses, jadi ikut memuat alokasi sesi lain yang berjalan bersamaan"
+            )
+            memory = memory_breakdown_mb()
+            if memory:
+                st.caption(
+                    f"Memori proses: {memory['VmRSS']:,.0f} MB · privat {memory['RssAnon']:,.0f} MB"
+                    f" · file ter-mmap (dibagi antarproses) {memory['RssFile']:,.0f} MB"
+                )
+            st.dataframe(pd.DataFrame(list(profiler.records.values())), hide_index=True, use_container_width=True)
+
 # =============================================================================
 # FOOTER
 # =============================================================================
@@ -1419,4 +1579,12 @@ st.markdown("""
     DASHBOARD ANALISIS SENTIMEN MEDIA · STREAMLIT + PLOTLY
   </div>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+# Satu baris JSON per rerun bila JOKOWI_PROFILE_LOG diisi path file
+profiler.emit(
+    os.environ.get("JOKOWI_PROFILE_LOG"),
+    dataset_version=data_version,
+    active_tab=st.session_state.get("active_tab"),
+    rows=n_active,
+)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SQLITE_MAX_VARS = 900
+
+# =============================================================================
+# TEXT HASH
+# =============================================================================
+def text_hash(text):
+    """Signed 64-bit hash of a text, usable as an SQLite INTEGER key."""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+# =============================================================================
+# LABEL STORE
+# =============================================================================
+class LabelCache:
+    """Persistent text-hash → (label, confidence) store in SQLite.
+
+    Entries are keyed by a model id as well, so a retrained or swapped model
+    never serves the predictions of another one. Every ``put_many`` is its own
+    transaction, which makes each stored batch a checkpoint.
+    """
+
+    def __init__(self, path, table):
+        self.path = Path(path)
+        self.table = table
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " model TEXT NOT NULL, hash INTEGER NOT NULL, label TEXT NOT NULL, confidence REAL,"
+            " PRIMARY KEY (model, hash)) WITHOUT ROWID"
+        )
+
+    def get_many(self, model_id, hashes):
+        """Return {hash: (label, confidence)} for the hashes present in the cache."""
+        found = {}
+        hashes = list(hashes)
+        for i in range(0, len(hashes), SQLITE_MAX_VARS):
+            chunk = hashes[i:i + SQLITE_MAX_VARS]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT hash, label, confidence FROM {self.table} WHERE model = ? AND hash IN ({placeholders})",
+                [model_id, *chunk],
+            )
+            for h, label, conf in rows:
+                found[h] = (label, np.nan if conf is None else conf)
+        return found
+
+    def put_many(self, model_id, items):
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (model, hash, label, confidence) VALUES (?, ?, ?, ?)",
+                ((model_id, h, str(label), None if pd.isna(conf) else float(conf)) for h, label, conf in items),
+            )
+
+    def close(self):
+        self.conn.close()
+
+# =============================================================================
+# BATCHED PREDICTION
+# =============================================================================
+def cached_predict(texts, predict, model_id, cache=None, batch_size=1000, progress=None):
+    """Run ``predict(list_of_texts) -> (labels, confidence)`` over unique texts only.
+
+    Texts already in ``cache`` are not predicted again; new results are stored
+    batch by batch, so an interrupted run resumes after the last stored batch.
+    Returns (labels, confidence) arrays aligned with ``texts``.
+    """
+    texts = pd.Series(texts).fillna("").astype(str)
+    codes, unique = pd.factorize(texts)
+    hashes = [text_hash(t) for t in unique]
+    known = cache.get_many(model_id, hashes) if cache is not None else {}
+
+    missing = [i for i, h in enumerate(hashes) if h not in known]
+    if progress is not None and len(unique):
+        progress(f"{len(unique) - len(missing)}/{len(unique)} teks unik sudah ada di cache")
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        labels, conf = predict([unique[i] for i in batch])
+        fresh = [(hashes[i], label, c) for i, label, c in zip(batch, labels, conf)]
+        known.update((h, (label, c)) for h, label, c in fresh)
+        if cache is not None:
+            cache.put_many(model_id, fresh)
+        if progress is not None:
+            progress(f"{min(start + batch_size, len(missing))}/{len(missing)} teks baru diproses")
+
+    unique_labels = np.array([known[h][0] for h in hashes], dtype=object)
+    unique_conf = np.array([known[h][1] for h in hashes], dtype=float)
+    return unique_labels[codes], unique_conf[codes]
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dataset import SENTIMENT_ORDER, cache_dir_for, dataset_version
+
+# =============================================================================
+# MEDIA INDEX
+# =============================================================================
+class MediaIndex:
+    """Media names dictionary-encoded to integer ids, with a row-range per outlet.
+
+    ``Nama Media`` is categorical, so an outlet's id is its category code.
+    ``order`` lists the dataset's row ids sorted by (media id, publish time)
+    and the rows of outlet ``m`` are ``order[offsets[m]:offsets[m+1]]``, oldest
+    first. Row ids themselves stay those of ``load_dataset`` (the n-gram and
+    search indexes depend on them), so the sort lives in this permutation
+    instead of in the dataset.
+    """
+
+    def __init__(self, names, codes, order, offsets, times):
+        self.names = pd.Index(names)
+        self.codes = codes
+        self.order = order
+        self.offsets = offsets
+        self.times = times
+
+    @property
+    def n_media(self):
+        return len(self.names)
+
+    def media_id(self, name):
+        return int(self.names.get_loc(name))
+
+    def rows(self, media_id, start=None, end=None):
+        """Row ids of one outlet, oldest first, optionally only ``start <= time < end``.
+
+        ``start``/``end`` are ``datetime64`` values; the date range is two binary
+        searches inside the outlet's range, so the cost is O(rows of the outlet).
+        """
+        rows = self.order[self.offsets[media_id]:self.offsets[media_id + 1]]
+        if start is None and end is None:
+            return rows
+        t = self.times[rows]
+        lo = 0 if start is None else np.searchsorted(t, start, side="left")
+        hi = len(rows) if end is None else np.searchsorted(t, end, side="left")
+        return rows[lo:hi]
+
+def build_media_index(df):
+    media = df["Nama Media"].astype("category")
+    codes = media.cat.codes.to_numpy().astype(np.int32)
+    times = df["Waktu Terbit"].to_numpy()
+    # Baris tanpa media (kode -1) berada di depan dan tidak masuk rentang mana pun
+    order = np.lexsort((times.view(np.int64), codes)).astype(np.int64)
+    counts = np.bincount(codes[codes >= 0], minlength=len(media.cat.categories))
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    offsets += int((codes < 0).sum())
+    return MediaIndex(media.cat.categories, codes, order, offsets, times)
+
+# =============================================================================
+# MEDIA × SENTIMENT × MONTH COUNTS
+# =============================================================================
+def media_sentiment_month(cells, names):
+    """Dense counts ``[media id, sentiment (SENTIMENT_ORDER), month]`` of count-cube cells.
+
+    One ``np.bincount`` over the (already filtered) cells. Returns the table
+    and the sorted ``month_key`` values of its last axis.
+    """
+    media = pd.Index(names).get_indexer(cells["Nama Media"].astype(str).to_numpy())
+    sentiment = pd.Index(SENTIMENT_ORDER).get_indexer(cells["sentiment"].astype(str).to_numpy())
+    months, month = np.unique(cells["month_key"].to_numpy(), return_inverse=True)
+    keep = (media >= 0) & (sentiment >= 0)
+    shape = (len(names), len(SENTIMENT_ORDER), len(months))
+    flat = np.ravel_multi_index((media[keep], sentiment[keep], month[keep]), shape)
+    table = np.bincount(flat, weights=cells["count"].to_numpy()[keep], minlength=int(np.prod(shape)))
+    return table.reshape(shape).astype(np.int64), months
+
+# =============================================================================
+# PERSISTENCE
+# =============================================================================
+def media_index_cache_path(path):
+    path = Path(path)
+    return cache_dir_for(path) / f"{path.stem}-{dataset_version(path)}.media-index.npz"
+
+def save_media_index(index, target):
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, order=index.order, offsets=index.offsets)
+    os.replace(tmp, target)
+
+def load_media_index(path, df):
+    """Load the cached permutation of dataset ``path``, building it from ``df`` if needed.
+
+    Names, codes and times come from ``df`` itself; only the sort is cached.
+    """
+    target = media_index_cache_path(path)
+    media = df["Nama Media"].astype("category")
+    if target.exists():
+        try:
+            with np.load(target) as z:
+                order, offsets = z["order"], z["offsets"]
+            if len(order) == len(df) and len(offsets) == len(media.cat.categories) + 1:
+                codes = media.cat.codes.to_numpy().astype(np.int32)
+                return MediaIndex(media.cat.categories, codes, order, offsets, df["Waktu Terbit"].to_numpy())
+        except (OSError, ValueError, KeyError):
+            pass
+
+    index = build_media_index(df)
+    try:
+        save_media_index(index, target)
+    except OSError:
+        pass
+    return index
+
+if __name__ == "__main__":
+    # Pemakaian: python media_index.py "publik persepsi.csv"
+    # Membandingkan filter string per media dengan rentang baris dari indeks.
+    from cube import build_cube
+    from dataset import load_dataset
+
+    df = load_dataset(sys.argv[1])
+    t0 = time.perf_counter()
+    index = build_media_index(df)
+    t1 = time.perf_counter()
+    table, months = media_sentiment_month(build_cube(df), index.names)
+    print(f"{len(df):,} rows, {index.n_media:,} media · index built in {(t1 - t0) * 1000:.0f} ms · table {table.shape}")
+
+    totals = table.sum(axis=(1, 2))
+    # Media peringkat 1, 11 dan 101; dipotong ke media terakhir bila media lebih sedikit
+    ranks = np.unique(np.minimum([0, 10, 100], index.n_media - 1))
+    for m in np.argsort(-totals, kind="stable")[ranks]:
+        name = index.names[m]
+        t2 = time.perf_counter()
+        expected = df[df["Nama Media"] == name]
+        t3 = time.perf_counter()
+        rows = index.rows(m)
+        t4 = time.perf_counter()
+        assert np.array_equal(np.sort(rows), expected.index.to_numpy())
+        assert np.array_equal(table[m].sum(axis=1), expected["sentiment"].value_counts().reindex(SENTIMENT_ORDER, fill_value=0).to_numpy())
+        print(f"{name}: {len(rows):,} rows · string filter {(t3 - t2) * 1000:.1f} ms -> index {(t4 - t3) * 1000:.3f} ms")
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import html
+import sys
+import time
+
+import numpy as np
+
+SENTIMENT_BADGES = {
+    "positive": ("badge-pos", "Positif"),
+    "neutral": ("badge-neu", "Netral"),
+    "negative": ("badge-neg", "Negatif"),
+}
+LINK_STYLE = "color:#93c5fd;text-decoration:none;"
+
+# =============================================================================
+# NEWEST-FIRST PAGING
+# =============================================================================
+# Urutan daftar berita: Waktu Terbit menurun, lalu row id menaik. Kursor
+# adalah (waktu, row id) dari kartu terakhir di halaman sebelumnya, jadi
+# halaman berikutnya adalah k baris pertama yang "lebih lama" dari kursor.
+
+def publish_times(df):
+    """``Waktu Terbit`` as int64 ticks (no copy); only the order matters."""
+    return df["Waktu Terbit"].to_numpy().view(np.int64)
+
+def newest_page(times, rows, page_size, cursor=None):
+    """Return ``(page_rows, next_cursor)`` for the page after ``cursor``.
+
+    ``rows`` are the matching row ids and ``times`` the ``publish_times`` of the
+    whole dataset. Instead of sorting every match, the page is picked with one
+    ``np.partition`` over the matches (linear time), and only the ``page_size``
+    picked rows are sorted. ``next_cursor`` is None on the last page.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    t = times[rows]
+    if cursor is not None:
+        ct, crow = cursor
+        after = (t < ct) | ((t == ct) & (rows > crow))
+        rows, t = rows[after], t[after]
+    has_more = len(rows) > page_size
+    if has_more:
+        # Ambil semua baris yang waktunya >= waktu ke-page_size (termasuk yang seri),
+        # lalu urutkan himpunan kecil itu saja
+        kth = -np.partition(-t, page_size - 1)[page_size - 1]
+        keep = t >= kth
+        rows, t = rows[keep], t[keep]
+    page = rows[np.lexsort((rows, -t))[:page_size]]
+    next_cursor = (int(times[page[-1]]), int(page[-1])) if has_more else None
+    return page, next_cursor
+
+# =============================================================================
+# HTML
+# =============================================================================
+def news_cards_html(df, rows, show_media=True):
+    """All cards of ``rows`` as one HTML string (one Streamlit element per page).
+
+    Columns are gathered once per page instead of boxing each article into a
+    Series with ``iterrows``.
+    """
+    page = df.iloc[np.asarray(rows, dtype=np.int64)]
+    dates = page["Waktu Terbit"].dt.strftime("%Y-%m-%d").fillna("-")
+
+    cards = []
+    for title, medium, sent, lang, link, dt in zip(
+        page["Judul Berita"].tolist(), page["Nama Media"].tolist(), page["sentiment"].tolist(),
+        page["Detected Language"].tolist(), page["Link Berita"].tolist(), dates.tolist(),
+    ):
+        sent = str(sent)
+        badge_cls, badge_label = SENTIMENT_BADGES.get(sent, ("badge-neu", sent))
+        link = str(link).strip()
+        meta = [f"<span>📰 {html.escape(str(medium))}</span>"] if show_media else []
+        meta += [f"<span>📅 {dt}</span>", f"<span>🌐 {html.escape(str(lang))}</span>"]
+        if link:
+            meta.append(
+                f"<span>🔗 <a href='{html.escape(link, quote=True)}' target='_blank' style='{LINK_STYLE}'>Buka sumber</a></span>"
+            )
+        cards.append(
+            f'<div class="news-card news-{sent[:3]}">'
+            f'<div class="news-title"><span class="badge {badge_cls}">{badge_label}</span> &nbsp; {html.escape(str(title))}</div>'
+            f'<div class="news-meta">{"".join(meta)}</div>'
+            "</div>"
+        )
+    return "".join(cards)
+
+if __name__ == "__main__":
+    # Pemakaian: python news_cards.py "publik persepsi.csv"
+    # Membandingkan sort_values + head lama dengan pemilihan halaman per kursor.
+    from dataset import load_dataset
+
+    df = load_dataset(sys.argv[1])
+    times = publish_times(df)
+    rows = np.arange(len(df))
+    expected = df.sort_values(["Waktu Terbit"], ascending=False, kind="stable").index.to_numpy()
+
+    cursor, pages = None, []
+    for _ in range(3):
+        page, cursor = newest_page(times, rows, 20, cursor)
+        pages.append(page)
+    assert (np.concatenate(pages) == expected[:60]).all(), "page order differs from sort_values"
+    print("Parity OK on the first 3 pages")
+
+    t0 = time.perf_counter()
+    df.sort_values("Waktu Terbit", ascending=False).head(20)
+    t1 = time.perf_counter()
+    page, _ = newest_page(times, rows, 20)
+    t2 = time.perf_counter()
+    news_cards_html(df, page)
+    t3 = time.perf_counter()
+    print(
+        f"{len(df):,} matches · sort_values+head {(t1 - t0) * 1000:.1f} ms"
+        f" · newest_page {(t2 - t1) * 1000:.1f} ms · one HTML page {(t3 - t2) * 1000:.1f} ms"
+    )
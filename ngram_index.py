@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer
+
+from dataset import cache_dir_for, dataset_version
+
+NGRAM_ORDERS = (1, 2, 3)
+
+# =============================================================================
+# N-GRAM COUNT MATRIX
+# =============================================================================
+class NgramIndex:
+    """Document × n-gram count matrices, one CSR matrix per n-gram order.
+
+    Row i corresponds to row i of the dataset returned by ``load_dataset``, so
+    the top n-grams of any filtered subset are a column sum over its row ids.
+    N-grams never span two articles.
+    """
+
+    def __init__(self, matrices, vocabs):
+        self.matrices = matrices
+        self.vocabs = vocabs
+
+    @property
+    def n_docs(self):
+        return next(iter(self.matrices.values())).shape[0]
+
+    def counts(self, rows, n):
+        """Total count of every n-gram of order ``n`` over ``rows``."""
+        X = self.matrices[n]
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) == 0:
+            return np.zeros(X.shape[1], dtype=np.int64)
+        if len(rows) * 4 < X.shape[0]:
+            return np.asarray(X[rows].sum(axis=0)).ravel()
+        mask = np.zeros(X.shape[0], dtype=np.int64)
+        mask[rows] = 1
+        return X.T @ mask
+
+    def top(self, rows, n=2, top_n=20):
+        """Return ``[(phrase, freq), ...]`` sorted by descending frequency."""
+        counts = self.counts(rows, n)
+        nonzero = np.flatnonzero(counts)
+        if len(nonzero) == 0:
+            return []
+        if len(nonzero) > top_n:
+            # Ambil semua kolom yang frekuensinya >= frekuensi ke-top_n, supaya
+            # frasa yang seri di batas dipilih secara alfabetis, bukan urutan kolom
+            threshold = -np.partition(-counts[nonzero], top_n - 1)[top_n - 1]
+            nonzero = nonzero[counts[nonzero] >= threshold]
+        vocab = self.vocabs[n]
+        # Urutkan berdasarkan frekuensi menurun, lalu frasa secara alfabetis
+        order = sorted(nonzero.tolist(), key=lambda j: (-int(counts[j]), vocab[j]))[:top_n]
+        return [(vocab[j], int(counts[j])) for j in order]
+
+def build_ngram_index(texts, orders=NGRAM_ORDERS):
+    """Build the count matrices from already-normalized texts (processed_text)."""
+    texts = ["" if t is None else str(t) for t in texts]
+    matrices, vocabs = {}, {}
+    for n in orders:
+        vec = CountVectorizer(
+            tokenizer=str.split,
+            token_pattern=None,
+            lowercase=False,
+            ngram_range=(n, n),
+            dtype=np.int32,
+        )
+        try:
+            X = vec.fit_transform(texts)
+            vocab = vec.get_feature_names_out().tolist()
+        except ValueError:
+            # Korpus kosong / tidak ada n-gram dengan panjang ini
+            X = sp.csr_matrix((len(texts), 0), dtype=np.int32)
+            vocab = []
+        matrices[n] = X.tocsr()
+        vocabs[n] = vocab
+    return NgramIndex(matrices, vocabs)
+
+def extend_ngram_index(index, texts):
+    """Append documents to ``index`` without recounting the existing ones.
+
+    N-grams not seen before get column ids after the current vocabulary, so
+    the stored matrices are only widened and stacked, never rebuilt.
+    """
+    added = build_ngram_index(texts, orders=tuple(index.matrices))
+    matrices, vocabs = {}, {}
+    for n, X in index.matrices.items():
+        vocab = list(index.vocabs[n])
+        lookup = {t: j for j, t in enumerate(vocab)}
+        cols = np.empty(len(added.vocabs[n]), dtype=np.int64)
+        for j, t in enumerate(added.vocabs[n]):
+            if t not in lookup:
+                lookup[t] = len(vocab)
+                vocab.append(t)
+            cols[j] = lookup[t]
+        Y = added.matrices[n]
+        Y = sp.csr_matrix((Y.data, cols[Y.indices], Y.indptr), shape=(Y.shape[0], len(vocab)))
+        X = sp.csr_matrix((X.data, X.indices, X.indptr), shape=(X.shape[0], len(vocab)))
+        matrices[n] = sp.vstack([X, Y], format="csr")
+        matrices[n].sort_indices()
+        vocabs[n] = vocab
+    return NgramIndex(matrices, vocabs)
+
+# =============================================================================
+# PERSISTENCE
+# =============================================================================
+def ngram_cache_path(path):
+    path = Path(path)
+    return cache_dir_for(path) / f"{path.stem}-{dataset_version(path)}.ngrams.npz"
+
+def save_ngram_index(index, target):
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    arrays = {}
+    for n, X in index.matrices.items():
+        arrays[f"data_{n}"] = X.data
+        arrays[f"indices_{n}"] = X.indices
+        arrays[f"indptr_{n}"] = X.indptr
+        arrays[f"shape_{n}"] = np.array(X.shape, dtype=np.int64)
+        arrays[f"vocab_{n}"] = np.frombuffer("\n".join(index.vocabs[n]).encode("utf-8"), dtype=np.uint8)
+    tmp = target.with_name(target.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, target)
+
+def read_ngram_index(source):
+    with np.load(source) as z:
+        orders = sorted(int(k.split("_")[1]) for k in z.files if k.startswith("shape_"))
+        matrices, vocabs = {}, {}
+        for n in orders:
+            shape = tuple(z[f"shape_{n}"].tolist())
+            matrices[n] = sp.csr_matrix((z[f"data_{n}"], z[f"indices_{n}"], z[f"indptr_{n}"]), shape=shape)
+            raw = z[f"vocab_{n}"].tobytes().decode("utf-8")
+            vocabs[n] = raw.split("\n") if raw else []
+    return NgramIndex(matrices, vocabs)
+
+def load_ngram_index(path, texts):
+    """Load the cached n-gram index of dataset ``path``, building it if needed.
+
+    ``texts`` must be the processed_text column of ``load_dataset(path)``.
+    """
+    target = ngram_cache_path(path)
+    if target.exists():
+        try:
+            index = read_ngram_index(target)
+            if index.n_docs == len(texts):
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+
+    index = build_ngram_index(texts)
+    try:
+        save_ngram_index(index, target)
+    except OSError:
+        pass
+    return index
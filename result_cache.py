@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+# =============================================================================
+# FILTER SIGNATURE
+# =============================================================================
+def filter_signature(version, year_range=None, sentiments=None, languages=None, **extra):
+    """Compact, hashable description of a filtered view of the dataset.
+
+    Selections are order-insensitive, so the same filter picked in a different
+    widget order maps to the same key.
+    """
+    return (
+        version,
+        tuple(year_range) if year_range else None,
+        tuple(sorted(sentiments)) if sentiments else None,
+        tuple(sorted(languages)) if languages else None,
+        tuple(sorted(extra.items())),
+    )
+
+# =============================================================================
+# LRU CACHE
+# =============================================================================
+def estimate_size(obj):
+    """Rough memory footprint of a cached value in bytes."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, (bytes, bytearray)):
+        return len(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_size(k) + estimate_size(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(estimate_size(v) for v in obj)
+    return sys.getsizeof(obj)
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entry count and estimated memory.
+
+    Values are shared between callers (and Streamlit sessions) without copying,
+    so they must be treated as read-only.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key][0]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._data:
+                self.bytes -= self._data.pop(key)[1]
+            if size > self.max_bytes:
+                # Terlalu besar untuk disimpan sama sekali
+                return
+            self._data[key] = (value, size)
+            self.bytes += size
+            while len(self._data) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, old_size) = self._data.popitem(last=False)
+                self.bytes -= old_size
+                self.evictions += 1
+
+    def get_or_compute(self, key, fn):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = fn()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+def cached_by_signature(cache):
+    """Decorator for ``fn(signature, data, *params)`` keyed on the signature.
+
+    ``data`` is only used on a miss and never hashed, so looking up a result
+    costs a tuple hash instead of hashing a DataFrame.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(signature, data, *params, **kwargs):
+            key = (fn.__qualname__, signature, params, tuple(sorted(kwargs.items())))
+            return cache.get_or_compute(key, lambda: fn(data, *params, **kwargs))
+        return wrapper
+    return decorator
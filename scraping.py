@@ -3,10 +3,20 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import time
+from selenium.common.exceptions import WebDriverException
+import argparse
 import csv
+import json
+import os
+import queue
+import threading
+from pathlib import Path
 from datetime import datetime, timedelta
 
+CSV_HEADER = ['Judul Berita', 'Nama Media', 'Waktu Terbit', 'Link Berita']
+DEFAULT_BASE_URL = "https://www.google.com"
+MAX_RETRIES_PER_RANGE = 3
+
 # Fungsi untuk membagi tanggal menjadi rentang 1 hari
 def generate_date_ranges(start_date, end_date, interval_days=1):
     date_ranges = []
@@ -17,42 +27,49 @@ def generate_date_ranges(start_date, end_date, interval_days=1):
         current_start_date = current_end_date + timedelta(days=1)
     return date_ranges
 
-# Setup untuk menggunakan Edge WebDriver
-driver = webdriver.Edge()  # Ganti path_to_msedgedriver dengan path aktual ke Edge WebDriver
-
-# Buka halaman Google dalam bahasa Inggris dengan parameter hl=en
-driver.get("https://www.google.com/?hl=en")
+def range_key(start, end):
+    return f"{start.strftime('%Y-%m-%d')}_{end.strftime('%Y-%m-%d')}"
 
-# Cari input box dan masukkan kata kunci
-search_box = driver.find_element(By.NAME, "q")
-search_box.send_keys("jokowi")
-search_box.send_keys(Keys.RETURN)  # Simulasi menekan Enter
+# =============================================================================
+# BROWSER
+# =============================================================================
+def make_driver(browser="edge", headless=False):
+    """Buat satu instance WebDriver (satu proses browser) untuk satu worker."""
+    if browser == "chrome":
+        options = webdriver.ChromeOptions()
+        if headless:
+            options.add_argument("--headless=new")
+        return webdriver.Chrome(options=options)
+    options = webdriver.EdgeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    return webdriver.Edge(options=options)
 
-# Klik tab "News" berdasarkan href yang berisi "tbm=nws"
-news_tab = driver.find_element(By.CSS_SELECTOR, 'a[href*="tbm=nws"]')
-news_tab.click()
+def open_news_search(driver, base_url=DEFAULT_BASE_URL, query="jokowi"):
+    # Buka halaman Google dalam bahasa Inggris dengan parameter hl=en
+    driver.get(f"{base_url}/?hl=en")
 
-# Klik tombol "Tools"
-tools_button = driver.find_element(By.XPATH, '//div[text()="Tools"]')
-tools_button.click()
+    # Cari input box dan masukkan kata kunci
+    search_box = driver.find_element(By.NAME, "q")
+    search_box.send_keys(query)
+    search_box.send_keys(Keys.RETURN)  # Simulasi menekan Enter
 
-# Klik span untuk mengubah urutan berita
-sort_span = driver.find_element(By.XPATH, '//div[@class="AozSsc"]//span')
-sort_span.click()
+    # Klik tab "News" berdasarkan href yang berisi "tbm=nws"
+    news_tab = driver.find_element(By.CSS_SELECTOR, 'a[href*="tbm=nws"]')
+    news_tab.click()
 
-# Data berita
-news_data = []
+    # Klik tombol "Tools"
+    tools_button = driver.find_element(By.XPATH, '//div[text()="Tools"]')
+    tools_button.click()
 
-# Rentang waktu awal dan akhir
-start_date = datetime(2022, 1, 1)
-end_date = datetime(2024, 10, 5)
+    # Klik span untuk mengubah urutan berita
+    sort_span = driver.find_element(By.XPATH, '//div[@class="AozSsc"]//span')
+    sort_span.click()
 
-# Menghasilkan rentang waktu 1 hari
-date_ranges = generate_date_ranges(start_date, end_date)
+def scrape_range(driver, start, end, page_timeout=10):
+    """Kumpulkan semua berita untuk satu rentang tanggal, mengikuti semua halaman."""
+    rows = []
 
-for start, end in date_ranges:
-    print(f"Processing range: {start.strftime('%Y-%m-%d')} to {end.strftime('%Y-%m-%d')}")
-    
     # Scroll halaman ke atas
     driver.execute_script("window.scrollTo(0, 0);")
 
@@ -91,7 +108,7 @@ for start, end in date_ranges:
                 link_element = news_element.find_element(By.CSS_SELECTOR, 'a.WlydOe')  # Mengambil link berita
 
                 # Menggunakan tanggal dari `start` untuk kolom waktu terbit
-                news_data.append([
+                rows.append([
                     title_element.text,
                     source_element.text,
                     start.strftime("%Y-%m-%d"),
@@ -100,23 +117,274 @@ for start, end in date_ranges:
         except Exception as e:
             print(f"Error occurred while collecting news data: {e}")
 
-        # Cek jika ada tombol untuk halaman berikutnya
+        # Cek jika ada tombol untuk halaman berikutnya. Halaman terakhir tidak punya
+        # tombol Next, jadi langsung berhenti tanpa menunggu timeout.
+        if not driver.find_elements(By.ID, 'pnnext'):
+            break
         try:
-            next_page_button = WebDriverWait(driver, 10).until(
+            next_page_button = WebDriverWait(driver, page_timeout).until(
                 EC.element_to_be_clickable((By.ID, 'pnnext'))  # Tombol Next berdasarkan ID
             )
             next_page_button.click()  # Klik tombol Next
         except Exception as e:
             print(f"No more pages or error occurred: {e}")
             break  # Jika tidak ada halaman berikutnya, keluar dari loop
-    
-# Menyimpan data ke dalam file CSV
-with open('jokowi 2019-2024.csv', 'w', newline='', encoding='utf-8') as csvfile:
-    csv_writer = csv.writer(csvfile)
-    # Menulis header
-    csv_writer.writerow(['Judul Berita', 'Nama Media', 'Waktu Terbit', 'Link Berita'])
-    # Menulis data berita
-    csv_writer.writerows(news_data)
-
-# Optional: Tutup browser
-driver.quit()
+    return rows
+
+# =============================================================================
+# STREAMING SINK
+# =============================================================================
+class CsvSink:
+    """Tulis hasil scraping langsung ke CSV (mode append) setiap kali satu rentang selesai.
+
+    Link Berita yang sudah ada di file disimpan di indeks dedup, sehingga halaman
+    yang di-scrape ulang (misalnya setelah resume) tidak menambah baris ganda.
+    File selalu berisi CSV yang valid, jadi bisa dibaca selagi scraper berjalan.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.seen = set()
+        self.lock = threading.Lock()
+        new_file = not self.path.exists() or self.path.stat().st_size == 0
+        if not new_file:
+            with open(self.path, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    if row.get('Link Berita'):
+                        self.seen.add(row['Link Berita'])
+        self.file = open(self.path, 'a', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        if new_file:
+            self.writer.writerow(CSV_HEADER)
+            self.file.flush()
+
+    def _dedup(self, rows):
+        fresh = []
+        for row in rows:
+            link = row[3]
+            if link:
+                if link in self.seen:
+                    continue
+                self.seen.add(link)
+            fresh.append(row)
+        return fresh
+
+    def write(self, rows):
+        """Append rows not seen before and flush them to disk; returns the count written."""
+        with self.lock:
+            fresh = self._dedup(rows)
+            self.writer.writerows(fresh)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            return len(fresh)
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+class ParquetSink(CsvSink):
+    """Varian Parquet: setiap pemanggilan ``write`` (satu rentang tanggal) menjadi satu file part.
+
+    ``path`` adalah direktori. Part ditulis ke file sementara, di-fsync, lalu
+    di-rename, jadi saat ``write`` kembali baris rentang itu sudah ada di disk
+    dan rentangnya aman dicatat di checkpoint. Setiap ``part-NNNNN.parquet``
+    bisa langsung dibaca (misalnya dengan ``pd.read_parquet(path)``).
+    """
+
+    def __init__(self, path):
+        import pyarrow.parquet as pq
+
+        self.pq = pq
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.seen = set()
+        self.lock = threading.Lock()
+        parts = sorted(self.path.glob("part-*.parquet"))
+        for part in parts:
+            for link in pq.read_table(part, columns=['Link Berita']).column(0).to_pylist():
+                if link:
+                    self.seen.add(link)
+        self.next_part = int(parts[-1].stem.split("-")[1]) + 1 if parts else 0
+
+    def _write_part(self, rows):
+        import pyarrow as pa
+
+        table = pa.table({col: [row[i] for row in rows] for i, col in enumerate(CSV_HEADER)})
+        target = self.path / f"part-{self.next_part:05d}.parquet"
+        tmp = target.with_name(target.name + ".tmp")
+        with open(tmp, "wb") as f:
+            self.pq.write_table(table, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, target)
+        self.next_part += 1
+
+    def write(self, rows):
+        """Write rows not seen before as one durable part; returns the count written."""
+        with self.lock:
+            fresh = self._dedup(rows)
+            if fresh:
+                self._write_part(fresh)
+            return len(fresh)
+
+    def close(self):
+        pass
+
+def open_sink(output, fmt="csv"):
+    return ParquetSink(output) if fmt == "parquet" else CsvSink(output)
+
+# =============================================================================
+# CHECKPOINT
+# =============================================================================
+class ShardCheckpoint:
+    """Progres satu worker (shard) di direktori checkpoint.
+
+    Baris sebuah rentang ditulis dulu ke sink, baru kemudian rentang itu dicatat
+    di ``shard-<id>.done``. Saat dijalankan ulang, rentang yang sudah tercatat di
+    shard mana pun dilewati; rentang yang sedang dikerjakan saat crash diulang
+    dan baris gandanya dibuang oleh indeks dedup sink.
+    """
+
+    def __init__(self, checkpoint_dir, shard_id):
+        self.done_path = Path(checkpoint_dir) / f"shard-{shard_id}.done"
+
+    def commit(self, start, end, n_rows):
+        with open(self.done_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({"range": range_key(start, end), "rows": n_rows}) + "\n")
+
+def completed_ranges(checkpoint_dir):
+    done = set()
+    for path in Path(checkpoint_dir).glob("shard-*.done"):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["range"])
+                except (ValueError, KeyError):
+                    pass  # Baris terakhir terpotong karena crash
+    return done
+
+# =============================================================================
+# PARALLEL RUNNER
+# =============================================================================
+def scrape_worker(shard_id, work, sink, checkpoint_dir, base_url, query, browser, headless, page_timeout, failed):
+    """Ambil rentang dari antrean sampai habis; rentang yang gagal dicatat di ``failed``."""
+    checkpoint = ShardCheckpoint(checkpoint_dir, shard_id)
+    driver = None
+    try:
+        while True:
+            try:
+                start, end, attempt = work.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                if driver is None:
+                    driver = make_driver(browser, headless)
+                    open_news_search(driver, base_url, query)
+                print(f"[shard {shard_id}] Processing range: {start.strftime('%Y-%m-%d')} to {end.strftime('%Y-%m-%d')}")
+                rows = scrape_range(driver, start, end, page_timeout)
+                checkpoint.commit(start, end, sink.write(rows))
+            except WebDriverException as e:
+                # Browser macet/crash: buang driver, kembalikan rentang ke antrean
+                print(f"[shard {shard_id}] Browser error on {range_key(start, end)}: {e}")
+                if driver is not None:
+                    try:
+                        driver.quit()
+                    except Exception:
+                        pass
+                    driver = None
+                if attempt + 1 < MAX_RETRIES_PER_RANGE:
+                    work.put((start, end, attempt + 1))
+                else:
+                    failed.append(range_key(start, end))
+            except Exception as e:
+                # Error lain (parsing, sink penuh, ...) tidak akan hilang dengan retry:
+                # catat rentangnya dan lanjut ke rentang berikutnya
+                print(f"[shard {shard_id}] Failed on {range_key(start, end)}: {e!r}")
+                failed.append(range_key(start, end))
+            finally:
+                work.task_done()
+    finally:
+        if driver is not None:
+            driver.quit()
+
+def scrape_parallel(date_ranges, sink, workers=1, checkpoint_dir="scrape_checkpoints", base_url=DEFAULT_BASE_URL,
+                    query="jokowi", browser="edge", headless=True, page_timeout=10):
+    """Bagi rentang tanggal ke beberapa browser lewat satu antrean kerja bersama.
+
+    Returns the sorted keys of the ranges that failed on this run; they are not
+    checkpointed, so running again retries them.
+    """
+    Path(checkpoint_dir).mkdir(parents=True, exist_ok=True)
+    done = completed_ranges(checkpoint_dir)
+    work = queue.Queue()
+    failed = []
+    pending = 0
+    for start, end in date_ranges:
+        if range_key(start, end) not in done:
+            work.put((start, end, 0))
+            pending += 1
+    print(f"{len(date_ranges) - pending} range sudah selesai, {pending} tersisa")
+
+    threads = [
+        threading.Thread(
+            target=scrape_worker,
+            args=(i, work, sink, checkpoint_dir, base_url, query, browser, headless, page_timeout, failed),
+            daemon=True,
+        )
+        for i in range(max(1, min(workers, pending)))
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sorted(failed)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scraping berita Google News per hari.")
+    parser.add_argument("--start", default="2022-01-01", help="Tanggal awal (YYYY-MM-DD)")
+    parser.add_argument("--end", default="2024-10-05", help="Tanggal akhir (YYYY-MM-DD)")
+    parser.add_argument("--query", default="jokowi")
+    parser.add_argument("--workers", type=int, default=1, help="Jumlah browser paralel")
+    parser.add_argument("--checkpoint-dir", default="scrape_checkpoints")
+    parser.add_argument("--output", default="jokowi 2019-2024.csv", help="File CSV, atau direktori untuk --format parquet")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="Ganti dengan URL fixture server untuk uji offline")
+    parser.add_argument("--browser", choices=["edge", "chrome"], default="edge")
+    parser.add_argument("--headless", action="store_true", help="Selalu aktif jika --workers > 1")
+    parser.add_argument("--page-timeout", type=float, default=10)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Rentang waktu awal dan akhir
+    start_date = datetime.strptime(args.start, "%Y-%m-%d")
+    end_date = datetime.strptime(args.end, "%Y-%m-%d")
+
+    # Menghasilkan rentang waktu 1 hari
+    date_ranges = generate_date_ranges(start_date, end_date)
+
+    # Baris langsung dialirkan ke file output setiap rentang selesai
+    sink = open_sink(args.output, args.format)
+    try:
+        failed = scrape_parallel(
+            date_ranges,
+            sink,
+            workers=args.workers,
+            checkpoint_dir=args.checkpoint_dir,
+            base_url=args.base_url.rstrip("/"),
+            query=args.query,
+            browser=args.browser,
+            headless=args.headless or args.workers > 1,
+            page_timeout=args.page_timeout,
+        )
+    finally:
+        sink.close()
+
+    if failed:
+        print(f"{len(failed)} range gagal: {', '.join(failed)}")
+        print("Jalankan ulang perintah yang sama untuk melanjutkan.")
+    print(f"{len(sink.seen)} link berita unik tersimpan di {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Server HTML lokal yang meniru halaman Google News yang dipakai scraping.py.
+
+Dipakai untuk menguji scraping secara offline:
+
+    python scraping_fixture.py --port 8765
+    python scraping.py --base-url http://127.0.0.1:8765 --start 2022-01-01 --end 2022-01-10 --workers 3
+
+Setiap tanggal menghasilkan berita deterministik yang tersebar di beberapa
+halaman, dengan class/ID elemen yang sama seperti yang dicari scraping.py.
+"""
+from __future__ import annotations
+
+import argparse
+import html
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+MEDIA = ["Kompas.com", "detikNews", "CNN Indonesia", "Tempo.co English", "The Jakarta Post", "Antara News"]
+PAGE_SIZE = 10
+
+HOME_PAGE = """<!doctype html><html><body>
+<form action="/search" method="get"><input name="q" type="text"><input type="hidden" name="hl" value="en"></form>
+</body></html>"""
+
+SEARCH_PAGE = """<!doctype html><html><body>
+<div><a href="/search?{news_qs}">News</a></div>
+</body></html>"""
+
+NEWS_PAGE = """<!doctype html><html><body>
+<div>Tools</div>
+<div class="AozSsc"><span>Sorted by relevance</span></div>
+<span class="gTl8xb">Any time</span>
+<span>Custom range...</span>
+<input class="OouJcb" type="text" value="{cd_min}">
+<input class="rzG2be" type="text" value="{cd_max}">
+<g-button onclick="goRange()">Go</g-button>
+<script>
+function goRange() {{
+  var min = document.querySelector('.OouJcb').value;
+  var max = document.querySelector('.rzG2be').value;
+  location.href = '/search?q={q}&tbm=nws&tbs=' + encodeURIComponent('cdr:1,cd_min:' + min + ',cd_max:' + max);
+}}
+</script>
+<div id="results">{results}</div>
+{next_link}
+</body></html>"""
+
+def articles_for_day(day, query="jokowi"):
+    """Berita deterministik untuk satu tanggal: 5-24 item tergantung tanggalnya."""
+    n = 5 + (day.toordinal() * 7) % 20
+    stamp = day.strftime("%Y-%m-%d")
+    return [
+        {
+            "title": f"{query.title()} dan berita ke-{i + 1} pada {stamp}",
+            "media": MEDIA[(day.toordinal() + i) % len(MEDIA)],
+            "link": f"https://news.example/{stamp}/{i + 1}",
+        }
+        for i in range(n)
+    ]
+
+def parse_range(tbs):
+    """Ambil tanggal cd_min dari parameter tbs=cdr:1,cd_min:MM/DD/YYYY,cd_max:..."""
+    parts = dict(p.split(":", 1) for p in tbs.split(",") if ":" in p)
+    try:
+        return datetime.strptime(parts["cd_min"], "%m/%d/%Y")
+    except (KeyError, ValueError):
+        return None
+
+def render_news(q, tbs, start):
+    day = parse_range(tbs) if tbs else None
+    results, next_link, cd_min, cd_max = "", "", "", ""
+    if day is not None:
+        cd_min = cd_max = day.strftime("%m/%d/%Y")
+        items = articles_for_day(day, q)
+        for item in items[start:start + PAGE_SIZE]:
+            results += (
+                '<div class="SoaBEf"><a class="WlydOe" href="{link}">'
+                '<div class="MgUUmf">{media}</div><div class="n0jPhd">{title}</div></a></div>'
+            ).format(**{k: html.escape(v) for k, v in item.items()})
+        if start + PAGE_SIZE < len(items):
+            qs = urlencode({"q": q, "tbm": "nws", "tbs": tbs, "start": start + PAGE_SIZE})
+            next_link = f'<a id="pnnext" href="/search?{html.escape(qs)}">Next</a>'
+    return NEWS_PAGE.format(q=html.escape(q), cd_min=cd_min, cd_max=cd_max, results=results, next_link=next_link)
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path == "/search" and params.get("tbm") == "nws":
+            body = render_news(params.get("q", ""), params.get("tbs", ""), int(params.get("start", 0)))
+        elif url.path == "/search":
+            body = SEARCH_PAGE.format(news_qs=html.escape(urlencode({"q": params.get("q", ""), "tbm": "nws"})))
+        elif url.path == "/":
+            body = HOME_PAGE
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve_fixture(host="127.0.0.1", port=0):
+    """Start the fixture server in a background thread; returns (server, base_url)."""
+    server = ThreadingHTTPServer((host, port), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), FixtureHandler)
+    print(f"Fixture server di http://{args.host}:{args.port}")
+    server.serve_forever()
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import os
+import re
+from bisect import bisect_left
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dataset import cache_dir_for, dataset_version
+
+TITLE_TOKEN_RE = re.compile(r"\w+")
+# Token terakhir yang lebih pendek dari ini dicocokkan persis, bukan sebagai awalan:
+# awalan satu-dua huruf mencakup sebagian besar kosakata
+MIN_PREFIX_CHARS = 3
+
+def split_tokens(text):
+    """Tokenizer for text that is already normalized (processed_text)."""
+    return str(text).split()
+
+def title_tokens(text):
+    """Tokenizer for raw titles: lowercase word characters, digits kept."""
+    return TITLE_TOKEN_RE.findall(str(text).lower())
+
+TOKENIZERS = {
+    "phrase": split_tokens,
+    "title": title_tokens,
+}
+
+# =============================================================================
+# INVERTED INDEX
+# =============================================================================
+class InvertedIndex:
+    """Positional inverted index over one text column of the dataset.
+
+    Postings of token ``vocab[i]`` are ``docs[offsets[i]:offsets[i+1]]`` with the
+    matching word positions in ``positions``, sorted by (doc, position). Because
+    the vocabulary is sorted, all tokens sharing a prefix occupy one contiguous
+    range of the posting arrays.
+    """
+
+    def __init__(self, kind, vocab, offsets, docs, positions, n_docs):
+        self.kind = kind
+        self.vocab = vocab
+        self.offsets = offsets
+        self.docs = docs
+        self.positions = positions
+        self.n_docs = n_docs
+        self._lookup = {t: i for i, t in enumerate(vocab)}
+        self._stride = np.int64(positions.max(initial=0)) + 1
+
+    def tokenize(self, text):
+        return TOKENIZERS[self.kind](text)
+
+    def _bounds(self, token, prefix=False):
+        """Slice of the posting arrays for ``token`` (or every token starting with it)."""
+        if prefix:
+            lo = bisect_left(self.vocab, token)
+            hi = bisect_left(self.vocab, token + "\uffff")
+        else:
+            lo = self._lookup.get(token)
+            hi = None if lo is None else lo + 1
+        if lo is None or lo >= hi:
+            return None
+        return self.offsets[lo], self.offsets[hi]
+
+    def _postings(self, token, prefix=False, mask=None):
+        bounds = self._bounds(token, prefix)
+        if bounds is None:
+            return None
+        start, end = bounds
+        docs, pos = self.docs[start:end], self.positions[start:end]
+        if mask is not None:
+            keep = mask[docs]
+            docs, pos = docs[keep], pos[keep]
+        if prefix:
+            # Posting beberapa token digabung: urutkan ulang per (doc, posisi), setelah mask
+            order = np.lexsort((pos, docs))
+            docs, pos = docs[order], pos[order]
+        return docs, pos
+
+    def search(self, query, mask=None, prefix=False):
+        """Row ids (ascending) whose text contains ``query`` as a token phrase.
+
+        ``mask`` is an optional boolean array over all rows (the active filter);
+        postings outside it are dropped before intersecting. With ``prefix`` the
+        last query token matches any token starting with it, once it has at
+        least ``MIN_PREFIX_CHARS`` characters; shorter ones match exactly.
+        """
+        tokens = self.tokenize(query)
+        if not tokens:
+            return np.empty(0, dtype=np.int64)
+        prefix = prefix and len(tokens[-1]) >= MIN_PREFIX_CHARS
+
+        if len(tokens) == 1:
+            # Satu token tidak butuh posisi: tandai doc di bitmap, tanpa sort
+            bounds = self._bounds(tokens[0], prefix)
+            if bounds is None:
+                return np.empty(0, dtype=np.int64)
+            hit = np.zeros(self.n_docs, dtype=bool)
+            hit[self.docs[bounds[0]:bounds[1]]] = True
+            if mask is not None:
+                hit &= mask
+            return np.flatnonzero(hit)
+
+        stride = self._stride
+        keys = None
+        for i, tok in enumerate(tokens):
+            postings = self._postings(tok, prefix=prefix and i == len(tokens) - 1, mask=mask)
+            if postings is None:
+                return np.empty(0, dtype=np.int64)
+            docs, pos = postings
+            if i:
+                keep = pos >= i
+                docs, pos = docs[keep], pos[keep]
+            # Kunci (doc, posisi awal frasa): token ke-i harus berada di posisi awal + i.
+            # Posting sudah terurut per (doc, posisi), jadi kunci selalu terurut dan unik.
+            k = docs.astype(np.int64) * stride + (pos.astype(np.int64) - i)
+            keys = k if keys is None else np.intersect1d(keys, k, assume_unique=True)
+            if len(keys) == 0:
+                return np.empty(0, dtype=np.int64)
+        return np.unique(keys // stride)
+
+def build_inverted_index(texts, kind):
+    tokenize = TOKENIZERS[kind]
+    token_lists = [tokenize(t) if isinstance(t, str) else [] for t in texts]
+    lengths = np.fromiter((len(t) for t in token_lists), dtype=np.int64, count=len(token_lists))
+    flat = [t for toks in token_lists for t in toks]
+
+    token_ids, vocab = pd.factorize(pd.Series(flat, dtype=object), sort=True)
+    vocab = [str(v) for v in vocab]
+    docs = np.repeat(np.arange(len(token_lists), dtype=np.int32), lengths)
+    starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    positions = (np.arange(len(flat), dtype=np.int64) - starts).astype(np.int32)
+
+    # argsort stabil: dalam satu token urutan (doc, posisi) dari flatten tetap terjaga
+    order = np.argsort(token_ids, kind="stable")
+    offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(token_ids, minlength=len(vocab)), out=offsets[1:])
+    return InvertedIndex(kind, vocab, offsets, docs[order], positions[order], len(token_lists))
+
+def extend_inverted_index(index, texts):
+    """Append documents to ``index`` without re-tokenizing the existing ones.
+
+    The new documents get row ids after the current ones, so each token's
+    merged postings are its old postings followed by its new ones and stay
+    sorted by (doc, position).
+    """
+    added = build_inverted_index(texts, index.kind)
+    vocab = pd.Index(index.vocab, dtype=object).union(pd.Index(added.vocab, dtype=object))
+    token_ids = np.concatenate([
+        np.repeat(vocab.get_indexer(index.vocab), np.diff(index.offsets)),
+        np.repeat(vocab.get_indexer(added.vocab), np.diff(added.offsets)),
+    ])
+    docs = np.concatenate([index.docs, added.docs + np.int32(index.n_docs)])
+    positions = np.concatenate([index.positions, added.positions])
+
+    order = np.argsort(token_ids, kind="stable")
+    offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(token_ids, minlength=len(vocab)), out=offsets[1:])
+    return InvertedIndex(index.kind, [str(v) for v in vocab], offsets, docs[order], positions[order], index.n_docs + added.n_docs)
+
+# =============================================================================
+# PERSISTENCE
+# =============================================================================
+def index_cache_path(path, kind):
+    path = Path(path)
+    return cache_dir_for(path) / f"{path.stem}-{dataset_version(path)}.{kind}-index.npz"
+
+def save_inverted_index(index, target):
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez(
+            f,
+            vocab=np.frombuffer("\n".join(index.vocab).encode("utf-8"), dtype=np.uint8),
+            offsets=index.offsets,
+            docs=index.docs,
+            positions=index.positions,
+            n_docs=np.array([index.n_docs], dtype=np.int64),
+        )
+    os.replace(tmp, target)
+
+def read_inverted_index(source, kind):
+    with np.load(source) as z:
+        raw = z["vocab"].tobytes().decode("utf-8")
+        return InvertedIndex(
+            kind,
+            raw.split("\n") if raw else [],
+            z["offsets"],
+            z["docs"],
+            z["positions"],
+            int(z["n_docs"][0]),
+        )
+
+def load_inverted_index(path, texts, kind):
+    """Load the cached ``kind`` index ("phrase" or "title") of dataset ``path``."""
+    target = index_cache_path(path, kind)
+    if target.exists():
+        try:
+            index = read_inverted_index(target, kind)
+            if index.n_docs == len(texts):
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+
+    index = build_inverted_index(texts, kind)
+    try:
+        save_inverted_index(index, target)
+    except OSError:
+        pass
+    return index
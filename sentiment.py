@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from dataset import SENTIMENT_ORDER, cache_dir_for, norm_sentiment
+from label_cache import LabelCache, cached_predict
+from text_normalize import normalize_texts
+
+MODEL_FILENAME = "sentiment-model.pkl"
+CACHE_FILENAME = "sentiment-cache.sqlite"
+DEFAULT_BATCH_SIZE = 256
+
+# Prompt yang sama dengan notebook (get_sentiment)
+PROMPT = (
+    "As a political expert fluent in both English and Indonesian, analyze the public perception reflected in the "
+    "following text regarding Jokowi's presidency from 2019 to 2024. "
+    "Respond in the exact format: 'The sentiment is: Positive', 'The sentiment is: Negative', or 'The sentiment is: Neutral'.\n"
+    "Text: \"{sentence}\"\n"
+    "The sentiment is:"
+)
+
+# =============================================================================
+# BACKENDS
+# =============================================================================
+# Backend adalah objek dengan atribut ``model_id`` (kunci cache) dan metode
+# ``predict(texts) -> (labels, confidence)``; label selalu salah satu SENTIMENT_ORDER.
+
+def parse_generation(resp):
+    """Map the generated answer to a label, falling back to neutral like the notebook."""
+    if "Negative" in resp:
+        return "negative"
+    if "Positive" in resp:
+        return "positive"
+    return "neutral"
+
+class TransformersBackend:
+    """The notebook's instruction-tuned LLM prompt, run in batches on CPU.
+
+    Generation is greedy (the notebook's ``top_k=1`` sampling), and it yields
+    no probability, so confidence is NaN.
+    """
+
+    def __init__(self, model_name, batch_size=8, device=-1):
+        from transformers import AutoTokenizer, pipeline
+
+        tokenizer = AutoTokenizer.from_pretrained(model_name, padding_side="left")
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        self.pipe = pipeline("text-generation", model=model_name, tokenizer=tokenizer, device=device)
+        self.batch_size = batch_size
+        self.model_id = f"transformers:{model_name}"
+
+    def predict(self, texts):
+        prompts = [
+            self.pipe.tokenizer.apply_chat_template(
+                [{"role": "user", "content": PROMPT.format(sentence=t)}], tokenize=False, add_generation_prompt=True
+            )
+            for t in texts
+        ]
+        outputs = self.pipe(
+            prompts, batch_size=self.batch_size, do_sample=False, max_new_tokens=5, return_full_text=False
+        )
+        labels = [parse_generation(out[0]["generated_text"]) for out in outputs]
+        return np.array(labels, dtype=object), np.full(len(labels), np.nan)
+
+class LocalClassifierBackend:
+    """Small TF-IDF + logistic regression model trained on already labelled articles.
+
+    A fast CPU stand-in for the LLM (tests, offline runs, bootstrapping new
+    rows); confidence is the predicted class probability.
+    """
+
+    def __init__(self):
+        self.vectorizer = TfidfVectorizer(tokenizer=str.split, token_pattern=None, ngram_range=(1, 2), min_df=2, sublinear_tf=True)
+        self.model = LogisticRegression(max_iter=1000)
+
+    def fit(self, texts, labels):
+        X = self.vectorizer.fit_transform(normalize_texts(list(texts)))
+        self.model.fit(X, np.asarray(labels, dtype=object))
+        digest = hashlib.sha256(pickle.dumps((self.vectorizer, self.model), protocol=pickle.HIGHEST_PROTOCOL))
+        self.model_id = f"local:{digest.hexdigest()[:16]}"
+        return self
+
+    def predict(self, texts):
+        if len(texts) == 0:
+            return np.array([], dtype=object), np.array([], dtype=float)
+        proba = self.model.predict_proba(self.vectorizer.transform(normalize_texts(list(texts))))
+        best = proba.argmax(axis=1)
+        return self.model.classes_[best].astype(object), proba[np.arange(len(best)), best]
+
+def train_local_classifier(df):
+    """Train the stand-in on the labelled ``Clean Text`` / ``sentiment`` of an existing dataset."""
+    labels = df["sentiment"].apply(norm_sentiment)
+    keep = labels.notna()
+    return LocalClassifierBackend().fit(df.loc[keep, "Clean Text"].fillna("").astype(str).tolist(), labels[keep].to_numpy())
+
+def load_local_classifier(path, retrain=False):
+    """Load the stand-in stored next to dataset ``path``, training it from the CSV if needed."""
+    target = cache_dir_for(path) / MODEL_FILENAME
+    if target.exists() and not retrain:
+        try:
+            with open(target, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            pass
+
+    backend = train_local_classifier(pd.read_csv(path, usecols=["Clean Text", "sentiment"]))
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(".tmp")
+    tmp.write_bytes(pickle.dumps(backend, protocol=pickle.HIGHEST_PROTOCOL))
+    tmp.replace(target)
+    return backend
+
+# =============================================================================
+# LABELLING
+# =============================================================================
+def open_sentiment_cache(path):
+    return LabelCache(cache_dir_for(path) / CACHE_FILENAME, "sentiment")
+
+def label_sentiments(texts, backend, cache=None, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """Label every text with ``sentiment`` and ``confidence``.
+
+    Identical texts are inferred once and results are cached by text hash per
+    backend, batch by batch, so rerunning after an interruption only infers
+    the batches that were not stored yet.
+    """
+    texts = pd.Series(texts).fillna("").astype(str)
+    labels, conf = cached_predict(texts, backend.predict, backend.model_id, cache, batch_size, progress)
+    return pd.DataFrame({"sentiment": labels, "confidence": conf}, index=texts.index)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Label sentiment berita per batch, dengan cache dan resume.")
+    parser.add_argument("input", help="CSV dengan kolom Clean Text (atau Judul Berita)")
+    parser.add_argument("--output", help="CSV hasil; default menimpa input")
+    parser.add_argument("--backend", choices=["local", "transformers"], default="local")
+    parser.add_argument("--model", default="google/gemma-2-2b-it", help="Model untuk --backend transformers")
+    parser.add_argument("--train-from", default="publik persepsi.csv", help="Dataset berlabel untuk --backend local")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    data = pd.read_csv(args.input)
+    if "Clean Text" not in data.columns:
+        data["Clean Text"] = normalize_texts(data["Judul Berita"].fillna("").astype(str).tolist())
+
+    if args.backend == "transformers":
+        backend = TransformersBackend(args.model)
+    else:
+        backend = load_local_classifier(args.train_from)
+
+    cache = open_sentiment_cache(args.input)
+    t0 = time.perf_counter()
+    try:
+        result = label_sentiments(data["Clean Text"], backend, cache, args.batch_size, progress=print)
+    finally:
+        cache.close()
+    data[["sentiment", "confidence"]] = result
+    data.to_csv(args.output or args.input, index=False)
+    print(f"{len(data)} baris dilabeli dalam {time.perf_counter() - t0:.1f} s: {data['sentiment'].value_counts().reindex(SENTIMENT_ORDER, fill_value=0).to_dict()}")
+
+if __name__ == "__main__":
+    main()
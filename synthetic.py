@@ -0,0 +1,159 @@
+"""Generator korpus sintetis dengan skema ``publik persepsi.csv``.
+
+Dipakai oleh benchmark.py untuk mengukur performa pada 10 ribu sampai 10 juta
+baris tanpa dataset asli:
+
+    python synthetic.py 1000000 --output "bench/publik persepsi.csv"
+
+Hasilnya deterministik untuk (jumlah baris, seed, chunk_rows) yang sama.
+Proporsi mengikuti arsip asli: ±99% judul berbahasa Indonesia, media
+berekor panjang (beberapa media besar, ribuan media kecil), tanggal terbit
+20 Okt 2019 – 19 Okt 2024, dan sentimen ±47% netral / 35% positif / 18% negatif.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = [
+    "Judul Berita", "Nama Media", "Waktu Terbit", "Link Berita", "Clean Text", "Detected Language",
+    "confidence", "stopword", "sentiment", "text_word_count", "word_count",
+]
+START_DATE = "2019-10-20"
+END_DATE = "2024-10-19"
+DEFAULT_CHUNK_ROWS = 200_000
+
+LANGUAGES = ["id", "en"]
+LANGUAGE_P = [0.988, 0.012]
+SENTIMENTS = ["neutral", "positive", "negative"]
+SENTIMENT_P = [0.47, 0.35, 0.18]
+
+WORDS_ID = (
+    "jokowi presiden joko widodo pemerintah rakyat indonesia ekonomi infrastruktur pembangunan jalan tol "
+    "ibu kota nusantara ikn kebijakan subsidi bbm harga beras pangan naik turun pemilu pilpres prabowo gibran "
+    "menteri kabinet reshuffle dpr mpr partai pdip golkar gerindra relawan projo investasi hilirisasi nikel "
+    "smelter bansos blt vaksin covid pandemi pemulihan inflasi rupiah utang apbn pajak bandara pelabuhan "
+    "bendungan kereta cepat whoosh mudik lebaran istana negara kunjungan kerja resmi meresmikan meninjau "
+    "kritik demo mahasiswa omnibus cipta kerja kpk korupsi hukum mk putusan dinasti politik kaesang iriana "
+    "lengser pensiun pidato sidang tahunan hut ri upacara desa petani nelayan umkm digital startup"
+).split()
+STOPWORDS_ID = "yang di dan ke dari untuk ini itu dengan soal jadi akan pada tak".split()
+WORDS_EN = (
+    "president jokowi widodo indonesia government economy growth capital city nusantara policy election "
+    "prabowo infrastructure nickel investment inflation rupiah jakarta parliament cabinet minister court "
+    "ruling dynasty protest students reform legacy visit summit trade"
+).split()
+STOPWORDS_EN = "the of to in and for on as with".split()
+
+MEDIA_HEAD = [
+    "Kompas.com", "detikNews", "CNN Indonesia", "CNBC Indonesia", "Tempo.co", "Suara.com", "Okezone.com",
+    "Tribunnews.com", "Liputan6.com", "Kumparan", "KOMPAS.tv", "Bisnis.com", "Medcom.id", "Antara News",
+    "Republika Online", "Sindonews", "Pikiran Rakyat", "VOI.ID", "Sekretariat Kabinet Republik Indonesia",
+    "Kementerian Sekretariat Negara", "BBC", "The Jakarta Post", "Tempo.co English", "Jakarta Globe", "Reuters",
+]
+N_MEDIA = 2_000
+MEDIA_ZIPF_S = 1.1
+
+# =============================================================================
+# GENERATOR
+# =============================================================================
+def _media_names():
+    return np.array(MEDIA_HEAD + [f"Media Lokal {i}" for i in range(N_MEDIA - len(MEDIA_HEAD))], dtype=object)
+
+def _media_weights():
+    w = 1.0 / np.arange(1, N_MEDIA + 1) ** MEDIA_ZIPF_S
+    return w / w.sum()
+
+def _texts(rng, n, words, stopwords):
+    """Titles, Clean Text and stopword-free text for ``n`` articles of one language."""
+    vocab = np.array(words + stopwords, dtype=object)
+    is_stop = np.arange(len(vocab)) >= len(words)
+    lengths = rng.integers(5, 15, size=n)
+    ids = rng.integers(0, len(vocab), size=(n, 14))
+    # Kira-kira separuh judul menyebut tahun, yang dibuang oleh clean text
+    years = np.where(rng.random(n) < 0.5, rng.integers(2019, 2025, size=n), 0)
+    colon = rng.random(n) < 0.3
+
+    titles, clean, content = [], [], []
+    for row, length, year, c in zip(ids, lengths, years, colon):
+        row = row[:length]
+        tokens = vocab[row].tolist()
+        clean.append(" ".join(tokens))
+        content.append(" ".join(vocab[row[~is_stop[row]]].tolist()))
+        shown = [t.capitalize() for t in tokens]
+        if c:
+            shown[0] += ":"
+        if year:
+            shown.append(str(year))
+        titles.append(" ".join(shown))
+    return titles, clean, content
+
+def generate_chunk(rng, start, n_rows, media_names=None, media_weights=None):
+    """``n_rows`` synthetic articles with row numbers ``start .. start + n_rows - 1``."""
+    media_names = _media_names() if media_names is None else media_names
+    media_weights = _media_weights() if media_weights is None else media_weights
+    lang = rng.choice(LANGUAGES, size=n_rows, p=LANGUAGE_P)
+    titles = np.empty(n_rows, dtype=object)
+    clean = np.empty(n_rows, dtype=object)
+    content = np.empty(n_rows, dtype=object)
+    for code, words, stopwords in (("id", WORDS_ID, STOPWORDS_ID), ("en", WORDS_EN, STOPWORDS_EN)):
+        where = np.flatnonzero(lang == code)
+        t, c, s = _texts(rng, len(where), words, stopwords)
+        titles[where], clean[where], content[where] = t, c, s
+
+    days = pd.date_range(START_DATE, END_DATE, freq="D")
+    published = days[rng.integers(0, len(days), size=n_rows)]
+    media = media_names[rng.choice(len(media_names), size=n_rows, p=media_weights)]
+    word_count = np.fromiter((len(c.split()) for c in clean), dtype=np.int64, count=n_rows)
+    return pd.DataFrame({
+        "Judul Berita": titles,
+        "Nama Media": media,
+        "Waktu Terbit": published.strftime("%Y-%m-%d"),
+        "Link Berita": [f"https://berita.example/read/{i}" for i in range(start, start + n_rows)],
+        "Clean Text": clean,
+        "Detected Language": lang,
+        "confidence": np.round(rng.uniform(0.6, 1.0, size=n_rows), 4),
+        "stopword": content,
+        "sentiment": rng.choice(SENTIMENTS, size=n_rows, p=SENTIMENT_P),
+        "text_word_count": word_count,
+        "word_count": word_count,
+    }, columns=COLUMNS)
+
+def generate_corpus(n_rows, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield the corpus as DataFrame chunks, so 10M rows never sit in memory at once."""
+    rng = np.random.default_rng(seed)
+    media_names, media_weights = _media_names(), _media_weights()
+    for start in range(0, n_rows, chunk_rows):
+        yield generate_chunk(rng, start, min(chunk_rows, n_rows - start), media_names, media_weights)
+
+def write_corpus(path, n_rows, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Write an ``n_rows`` corpus to the CSV ``path`` chunk by chunk; returns the path."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        for i, chunk in enumerate(generate_corpus(n_rows, seed, chunk_rows)):
+            chunk.to_csv(f, index=False, header=i == 0)
+    tmp.replace(path)
+    return path
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Buat korpus sintetis dengan skema publik persepsi.csv.")
+    parser.add_argument("rows", type=int, help="Jumlah baris, mis. 10000 sampai 10000000")
+    parser.add_argument("--output", default="synthetic/publik persepsi.csv")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    t0 = time.perf_counter()
+    path = write_corpus(args.output, args.rows, args.seed, args.chunk_rows)
+    print(f"{args.rows:,} baris ditulis ke {path} ({path.stat().st_size / 2**20:.1f} MB) dalam {time.perf_counter() - t0:.1f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Modul dashboard berada di root repo (tanpa paket), jadi root dimasukkan ke path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
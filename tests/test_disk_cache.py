@@ -0,0 +1,63 @@
+import os
+
+from disk_cache import DiskLRU
+
+
+def fill(cache, n, size=100):
+    # mtime berurutan agar urutan LRU pasti
+    for i in range(n):
+        cache.put(("old", i), bytes(size))
+        os.utime(cache._path(("old", i)), ns=(i * 10**9, i * 10**9))
+
+
+def cached_bytes(cache):
+    return sum(p.stat().st_size for p in cache.directory.glob("*" + cache.suffix))
+
+
+def test_oversized_write_is_returned_but_not_cached(tmp_path):
+    cache = DiskLRU(tmp_path, max_bytes=1000)
+    fill(cache, 5)
+
+    data = cache.get_or_write("big", lambda tmp: tmp.write_bytes(b"x" * 1500))
+
+    assert data == b"x" * 1500
+    assert cache.evictions == 0
+    assert all(cache.get(("old", i)) is not None for i in range(5))
+    assert not cache._path("big").exists()
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_oversized_put_keeps_other_entries(tmp_path):
+    cache = DiskLRU(tmp_path, max_bytes=1000)
+    fill(cache, 5)
+
+    cache.put("big", bytes(1500))
+
+    assert cache.evictions == 0
+    assert cache.get("big") is None
+    assert all(cache.get(("old", i)) is not None for i in range(5))
+
+
+def test_write_evicts_only_as_many_old_entries_as_needed(tmp_path):
+    cache = DiskLRU(tmp_path, max_bytes=1000)
+    fill(cache, 5)
+
+    data = cache.get_or_write("new", lambda tmp: tmp.write_bytes(b"y" * 700))
+
+    assert data == b"y" * 700
+    # 700 + 3 × 100 = 1000: dua entri tertua dibuang, entri baru tetap ada
+    assert cache.evictions == 2
+    assert cache.get(("old", 0)) is None and cache.get(("old", 1)) is None
+    assert cache.get("new") == data
+    assert cached_bytes(cache) <= 1000
+
+
+def test_put_respects_entry_limit(tmp_path):
+    cache = DiskLRU(tmp_path, max_entries=3, max_bytes=10_000)
+    fill(cache, 3)
+
+    cache.put("new", b"z")
+
+    assert cache.evictions == 1
+    assert cache.get(("old", 0)) is None
+    assert cache.get("new") == b"z"
@@ -0,0 +1,256 @@
+import csv
+import re
+from datetime import datetime
+from html.parser import HTMLParser
+from urllib.parse import parse_qs, urlencode, urljoin, urlparse
+from urllib.request import urlopen
+
+import pytest
+
+pytest.importorskip("selenium")
+
+import scraping
+from scraping_fixture import articles_for_day, serve_fixture
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+DAYS = [datetime(2022, 1, d) for d in (1, 2, 3, 4)]
+
+
+# =============================================================================
+# FAKE DRIVER
+# =============================================================================
+# Cukup untuk halaman fixture: HTML diambil lewat HTTP dan di-parse menjadi pohon
+# elemen sederhana. Satu-satunya JavaScript fixture (tombol "Go") ditiru di click().
+
+class Element:
+    def __init__(self, driver, tag, attrs, parent=None):
+        self.driver = driver
+        self.tag = tag
+        self.attrs = dict(attrs)
+        self.parent = parent
+        self.children = []
+        self.own_text = ""
+
+    @property
+    def text(self):
+        return (self.own_text + "".join(c.text for c in self.children)).strip()
+
+    def iter(self):
+        for child in self.children:
+            yield child
+            yield from child.iter()
+
+    def matches(self, by, value):
+        if by == By.CLASS_NAME:
+            return value in self.attrs.get("class", "").split()
+        if by == By.ID:
+            return self.attrs.get("id") == value
+        if by == By.NAME:
+            return self.attrs.get("name") == value
+        if by == By.CSS_SELECTOR:
+            tag, cls, attr, part = re.fullmatch(r'(\w+)?(?:\.([\w-]+))?(?:\[(\w+)\*="([^"]*)"\])?', value).groups()
+            return ((tag is None or self.tag == tag)
+                    and (cls is None or self.matches(By.CLASS_NAME, cls))
+                    and (attr is None or part in self.attrs.get(attr, "")))
+        raise NotImplementedError(by)
+
+    def find_elements(self, by, value):
+        if by == By.XPATH:
+            m = re.fullmatch(r'//([\w-]+)\[text\(\)="(.*)"\]', value)
+            if m:
+                return [e for e in self.iter() if e.tag == m[1] and e.text == m[2]]
+            m = re.fullmatch(r'//(\w+)\[@class="(.*)"\]//(\w+)', value)
+            outer = [e for e in self.iter() if e.tag == m[1] and e.attrs.get("class") == m[2]]
+            return [e for o in outer for e in o.iter() if e.tag == m[3]]
+        return [e for e in self.iter() if e.matches(by, value)]
+
+    def find_element(self, by, value):
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"{by}={value}")
+        return found[0]
+
+    def get_attribute(self, name):
+        value = self.attrs.get(name)
+        return urljoin(self.driver.url, value) if name == "href" and value else value
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def clear(self):
+        self.attrs["value"] = ""
+
+    def send_keys(self, keys):
+        if keys == Keys.RETURN:
+            form = self.parent
+            while form.tag != "form":
+                form = form.parent
+            params = {e.attrs["name"]: e.attrs.get("value", "") for e in form.iter() if e.tag == "input" and "name" in e.attrs}
+            self.driver.get(urljoin(self.driver.url, form.attrs["action"]) + "?" + urlencode(params))
+        else:
+            self.attrs["value"] = self.attrs.get("value", "") + keys
+
+    def click(self):
+        if self.tag == "a":
+            self.driver.get(self.get_attribute("href"))
+        elif self.tag == "g-button":
+            # goRange() milik fixture
+            q = parse_qs(urlparse(self.driver.url).query)["q"][0]
+            cd_min = self.driver.find_element(By.CLASS_NAME, "OouJcb").attrs["value"]
+            cd_max = self.driver.find_element(By.CLASS_NAME, "rzG2be").attrs["value"]
+            self.driver.get(urljoin(self.driver.url, "/search?" + urlencode(
+                {"q": q, "tbm": "nws", "tbs": f"cdr:1,cd_min:{cd_min},cd_max:{cd_max}"})))
+
+
+class TreeBuilder(HTMLParser):
+    VOID = {"input", "meta", "br", "img"}
+
+    def __init__(self, driver):
+        super().__init__()
+        self.root = self.current = Element(driver, "document", {})
+
+    def handle_starttag(self, tag, attrs):
+        element = Element(self.root.driver, tag, attrs, self.current)
+        self.current.children.append(element)
+        if tag not in self.VOID:
+            self.current = element
+
+    def handle_endtag(self, tag):
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        if self.current.tag != "script":
+            self.current.own_text += data
+
+
+class FakeDriver:
+    def __init__(self):
+        self.url = None
+        self.document = None
+
+    def get(self, url):
+        self.url = url
+        with urlopen(url, timeout=10) as response:
+            builder = TreeBuilder(self)
+            builder.feed(response.read().decode("utf-8"))
+        self.document = builder.root
+
+    def find_elements(self, by, value):
+        return self.document.find_elements(by, value)
+
+    def find_element(self, by, value):
+        return self.document.find_element(by, value)
+
+    def execute_script(self, script):
+        pass
+
+    def quit(self):
+        pass
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+@pytest.fixture(scope="module")
+def base_url():
+    server, url = serve_fixture()
+    yield url
+    server.shutdown()
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    created = []
+
+    def make_driver(browser="edge", headless=False):
+        created.append(FakeDriver())
+        return created[-1]
+
+    monkeypatch.setattr(scraping, "make_driver", make_driver)
+    return created
+
+
+def expected_links(days):
+    return {a["link"] for day in days for a in articles_for_day(day)}
+
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def run(tmp_path, base_url):
+    sink = scraping.CsvSink(tmp_path / "out.csv")
+    try:
+        return scraping.scrape_parallel(
+            [(d, d) for d in DAYS], sink, workers=2, checkpoint_dir=tmp_path / "ckpt",
+            base_url=base_url, page_timeout=1,
+        )
+    finally:
+        sink.close()
+
+
+def test_scrape_range_follows_every_page(base_url):
+    driver = FakeDriver()
+    scraping.open_news_search(driver, base_url)
+    day = DAYS[0]
+
+    rows = scraping.scrape_range(driver, day, day, page_timeout=1)
+
+    expected = articles_for_day(day)
+    assert len(expected) > 10  # lebih dari satu halaman fixture
+    assert [r[3] for r in rows] == [a["link"] for a in expected]
+    assert rows[0][:3] == [expected[0]["title"], expected[0]["media"], "2022-01-01"]
+
+
+def test_scrape_parallel_writes_rows_and_resumes(tmp_path, base_url, drivers):
+    assert run(tmp_path, base_url) == []
+    rows = read_rows(tmp_path / "out.csv")
+    assert len(rows) == len(expected_links(DAYS))
+    assert {r["Link Berita"] for r in rows} == expected_links(DAYS)
+    assert scraping.completed_ranges(tmp_path / "ckpt") == {scraping.range_key(d, d) for d in DAYS}
+
+    # Jalan kedua: semua shard sudah selesai, tidak ada browser dibuka dan tidak ada baris baru
+    n_drivers = len(drivers)
+    assert run(tmp_path, base_url) == []
+    assert len(drivers) == n_drivers
+    assert len(read_rows(tmp_path / "out.csv")) == len(rows)
+
+
+def test_sink_drops_duplicate_links(tmp_path):
+    sink = scraping.CsvSink(tmp_path / "out.csv")
+    row = ["judul", "media", "2022-01-01", "https://news.example/x"]
+    assert sink.write([row, row]) == 1
+    sink.close()
+
+    reopened = scraping.CsvSink(tmp_path / "out.csv")
+    assert reopened.write([row]) == 0
+    reopened.close()
+    assert len(read_rows(tmp_path / "out.csv")) == 1
+
+
+def test_failed_range_is_reported_and_retried(tmp_path, base_url, drivers, monkeypatch):
+    scrape_range = scraping.scrape_range
+    broken = scraping.range_key(DAYS[1], DAYS[1])
+
+    def flaky(driver, start, end, page_timeout=10):
+        if scraping.range_key(start, end) == broken:
+            raise ValueError("unexpected markup")
+        return scrape_range(driver, start, end, page_timeout)
+
+    monkeypatch.setattr(scraping, "scrape_range", flaky)
+    assert run(tmp_path, base_url) == [broken]
+    assert broken not in scraping.completed_ranges(tmp_path / "ckpt")
+
+    monkeypatch.setattr(scraping, "scrape_range", scrape_range)
+    assert run(tmp_path, base_url) == []
+    assert {r["Link Berita"] for r in read_rows(tmp_path / "out.csv")} == expected_links(DAYS)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from search_index import build_inverted_index
+
+TITLES = [
+    "Jokowi resmikan pembangunan jalan tol",
+    "Pembangunan ekonomi naik, kata Jokowi",
+    "Jokowi pembangunan",
+    "Harga pangan naik lagi",
+    "pe",
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return build_inverted_index(TITLES, "title")
+
+
+@pytest.mark.parametrize("query, prefix, expected", [
+    ("jokowi", False, [0, 1, 2]),
+    ("pemb", True, [0, 1, 2]),
+    ("pemb", False, []),
+    # Awalan pendek dicocokkan persis
+    ("pe", True, [4]),
+    ("jokowi pemb", True, [2]),
+    ("jokowi pe", True, []),
+    ("naik", True, [1, 3]),
+])
+def test_search(index, query, prefix, expected):
+    assert index.search(query, prefix=prefix).tolist() == expected
+
+
+def test_mask_is_applied(index):
+    mask = np.array([False, True, True, True, True])
+    assert index.search("pemb", mask=mask, prefix=True).tolist() == [1, 2]
+    assert index.search("jokowi pemb", mask=mask, prefix=True).tolist() == [2]
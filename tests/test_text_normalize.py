@@ -0,0 +1,61 @@
+import random
+
+import pandas as pd
+import pytest
+
+from text_normalize import DOC_SEP, check_parity, clean_text, normalize_series, normalize_texts
+
+PARITY_CASES = [
+    None,
+    float("nan"),
+    "",
+    "   ",
+    "Jokowi Resmikan Jalan Tol Trans-Sumatera!",
+    "Harga BBM naik 10% di 2022, kata menteri",
+    "Lihat https://example.com/berita?id=1 dan www.kompas.com/x sekarang",
+    "a b cd 12 3x x3 1234",
+    "Baris\npertama\tdan   kedua",
+    "Ibu Kota Nusantara (IKN) — «proyek» strategis…",
+    "İstanbul ÇAĞ naïve café Ünïcödé",
+    "httpfoo bar wwwdotcom www.a",
+    "under_score dash-ed dot.ted",
+    " nbsp em　ideographic",
+    "KELVIN K sign",
+    42,
+    3.5,
+]
+
+# Potongan teks yang sering memicu beda perilaku: URL, angka, whitespace aneh,
+# huruf non-ASCII yang berubah panjang saat lowercase, dan pemisah dokumen.
+FUZZ_PIECES = [
+    "a", "ab", "Jokowi", "IKN", "2024", "7", "x1", "1x", " ", "  ", "\n", "\t", " ", "　",
+    "http://a.b/c?d=1", "https://x", "www.kompas.com", "www.", "http", "-", "_", ".", ",", "%",
+    "é", "İ", "Ç", "ß", "K", "ñ", "中文", "😀", DOC_SEP,
+]
+
+def random_text(rng):
+    if rng.random() < 0.05:
+        return rng.choice([None, float("nan"), 12, 0.5])
+    return "".join(rng.choice(FUZZ_PIECES) for _ in range(rng.randint(0, 12)))
+
+@pytest.mark.parametrize("text", PARITY_CASES)
+def test_edge_case_matches_clean_text(text):
+    assert normalize_texts([text]) == [clean_text(text)]
+
+def test_edge_cases_as_one_batch():
+    assert check_parity(PARITY_CASES) is None
+
+def test_random_batches_match_clean_text():
+    rng = random.Random(0)
+    for _ in range(500):
+        batch = [random_text(rng) for _ in range(rng.randint(1, 20))]
+        assert check_parity(batch) is None, batch
+
+def test_normalize_series_keeps_index_across_chunks():
+    series = pd.Series(PARITY_CASES * 3, index=range(100, 100 + 3 * len(PARITY_CASES)))
+    out = normalize_series(series, chunk_size=5)
+    assert out.index.equals(series.index)
+    assert out.tolist() == [clean_text(t) for t in series]
+
+def test_empty_batch():
+    assert normalize_texts([]) == []
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# Pemisah antar dokumen di dalam buffer gabungan. Karakter ini termasuk
+# whitespace (jadi URL dan token tidak bisa "menyeberang" ke dokumen lain)
+# tetapi bukan spasi biasa, sehingga batas dokumen tetap bisa dipulihkan.
+DOC_SEP = "\x1e"
+
+URL_RE = re.compile(r"http\S+|www\.\S+")
+
+# Tabel translate untuk buffer UTF-8: huruf/angka ASCII dan DOC_SEP dipertahankan,
+# semua byte lain (tanda baca, whitespace, byte karakter non-ASCII) menjadi spasi.
+_KEEP_BYTES = b"0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ" + DOC_SEP.encode()
+ALNUM_TABLE = bytes(c if c in _KEEP_BYTES else ord(" ") for c in range(256))
+SEP_BYTES = DOC_SEP.encode()
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+# =============================================================================
+# REFERENCE (PER-ROW) IMPLEMENTATION
+# =============================================================================
+def safe_lower(x):
+    if pd.isna(x):
+        return ""
+    return str(x).lower()
+
+def clean_text(text):
+    text = safe_lower(text)
+    text = text.replace("\n", " ").replace("\t", " ")
+    text = re.sub(r"http\S+|www\.\S+", " ", text)
+    text = re.sub(r"[^0-9a-zA-Z\s]", " ", text)
+    tokens = [t for t in text.split() if len(t) > 1]
+    tokens = [t for t in tokens if not t.isdigit()]
+    return " ".join(tokens)
+
+def tokenize_text(text):
+    text = clean_text(text)
+    return [t for t in text.split() if t]
+
+# =============================================================================
+# BATCH ENGINE
+# =============================================================================
+def normalize_texts(texts):
+    """Vectorized ``clean_text`` over a list of strings.
+
+    All documents are joined into one buffer separated by DOC_SEP and every
+    regex pass runs once over that buffer instead of once per row. Output is
+    identical to ``[clean_text(t) for t in texts]``: after lowercasing and URL
+    removal every non-ASCII-alphanumeric byte of the UTF-8 buffer becomes a
+    space via a single ``bytes.translate``, so only the short/numeric token
+    filter remains a Python-level loop.
+    """
+    texts = [t if isinstance(t, str) else safe_lower(t) for t in texts]
+    if not texts:
+        return []
+    buf = DOC_SEP.join(texts)
+    if buf.count(DOC_SEP) != len(texts) - 1:
+        # Teks mentah sudah mengandung DOC_SEP: batas dokumen tidak bisa dipercaya
+        return [clean_text(t) for t in texts]
+
+    buf = buf.lower()
+    if "http" in buf or "www." in buf:
+        buf = URL_RE.sub(" ", buf)
+    raw = buf.encode("utf-8").translate(ALNUM_TABLE)
+
+    tokens = raw.replace(SEP_BYTES, b" " + SEP_BYTES + b" ").split()
+    kept = [t for t in tokens if (len(t) > 1 and not t.isdigit()) or t == SEP_BYTES]
+    out = b" ".join(kept).replace(b" " + SEP_BYTES, SEP_BYTES).replace(SEP_BYTES + b" ", SEP_BYTES)
+    return out.decode("ascii").split(DOC_SEP)
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def normalize_series(series, n_jobs=1, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Normalize a whole text column, optionally across worker processes."""
+    values = series.astype(object).tolist()
+    chunks = list(_chunks(values, chunk_size))
+    if n_jobs > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            parts = list(pool.map(normalize_texts, chunks))
+    else:
+        parts = [normalize_texts(c) for c in chunks]
+    out = [t for part in parts for t in part]
+    return pd.Series(out, index=series.index, dtype=object)
+
+# =============================================================================
+# PARITY CHECK & BENCHMARK
+# =============================================================================
+def check_parity(texts):
+    """Return the first (index, expected, got) mismatch, or None."""
+    got = normalize_texts(texts)
+    for i, (t, g) in enumerate(zip(texts, got)):
+        expected = clean_text(t)
+        if expected != g:
+            return i, expected, g
+    return None
+
+def benchmark(texts, n_jobs=1):
+    t0 = time.perf_counter()
+    ref = [clean_text(t) for t in texts]
+    t1 = time.perf_counter()
+    fast = normalize_series(pd.Series(texts, dtype=object), n_jobs=n_jobs).tolist()
+    t2 = time.perf_counter()
+    assert ref == fast, "batch output differs from clean_text"
+    n = len(texts)
+    return {
+        "rows": n,
+        "per_row_rows_per_sec": n / max(t1 - t0, 1e-9),
+        "batch_rows_per_sec": n / max(t2 - t1, 1e-9),
+    }
+
+if __name__ == "__main__":
+    # Pemakaian: python text_normalize.py "publik persepsi.csv" [kolom] [n_jobs]
+    # Kasus tepi dan fuzz ada di tests/test_text_normalize.py; skrip ini untuk data nyata.
+    if len(sys.argv) < 2:
+        sys.exit('Pemakaian: python text_normalize.py "publik persepsi.csv" [kolom] [n_jobs]')
+    col = sys.argv[2] if len(sys.argv) > 2 else "Judul Berita"
+    n_jobs = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    texts = pd.read_csv(sys.argv[1], usecols=[col])[col].tolist()
+    mismatch = check_parity(texts)
+    if mismatch:
+        sys.exit(f"Parity mismatch on row {mismatch[0]}: expected {mismatch[1]!r}, got {mismatch[2]!r}")
+    res = benchmark(texts, n_jobs=n_jobs)
+    print(
+        f"{res['rows']:,} rows · clean_text: {res['per_row_rows_per_sec']:,.0f} rows/s"
+        f" · normalize_series: {res['batch_rows_per_sec']:,.0f} rows/s"
+        f" ({res['batch_rows_per_sec'] / res['per_row_rows_per_sec']:.1f}x)"
+    )
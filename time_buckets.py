@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+PERIODS = ("month", "quarter", "week", "year")
+# Kolom kunci periode di dataset dan cube
+PERIOD_COLUMNS = {period: f"{period}_key" for period in PERIODS}
+
+# =============================================================================
+# INTEGER PERIOD KEYS
+# =============================================================================
+# Kunci berupa int32 yang urutannya sama dengan urutan waktu dan tetap mudah
+# dibaca: bulan 202403, kuartal 20241, minggu ISO 202409, tahun 2024. Grouping
+# dan sorting memakai kunci ini; label dan tanggal awal periode hanya dibuat
+# untuk kunci unik hasil groupby.
+
+def period_keys(dates):
+    """Return ``{period: int32 array}`` for a datetime Series without missing values."""
+    year = dates.dt.year.to_numpy(dtype=np.int32)
+    month = dates.dt.month.to_numpy(dtype=np.int32)
+    iso = dates.dt.isocalendar()
+    return {
+        "month": year * 100 + month,
+        "quarter": year * 10 + (month - 1) // 3 + 1,
+        "week": iso["year"].to_numpy(dtype=np.int32) * 100 + iso["week"].to_numpy(dtype=np.int32),
+        "year": year,
+    }
+
+def add_period_keys(df, date_col):
+    """Add the ``*_key`` columns of every period, computed from ``df[date_col]``."""
+    for period, keys in period_keys(df[date_col]).items():
+        df[PERIOD_COLUMNS[period]] = keys
+    return df
+
+def period_labels(keys, period):
+    """Display labels: ``2024-03``, ``2024Q1`` (as ``to_period("Q")``), ``2024-W09``, ``2024``."""
+    keys = np.asarray(keys, dtype=np.int64)
+    if period == "month":
+        return [f"{k // 100}-{k % 100:02d}" for k in keys.tolist()]
+    if period == "quarter":
+        return [f"{k // 10}Q{k % 10}" for k in keys.tolist()]
+    if period == "week":
+        return [f"{k // 100}-W{k % 100:02d}" for k in keys.tolist()]
+    if period == "year":
+        return [str(k) for k in keys.tolist()]
+    raise ValueError(f"unknown period: {period}")
+
+def period_start(keys, period):
+    """First day of every period key, as a DatetimeIndex."""
+    keys = np.asarray(keys, dtype=np.int64)
+    if period == "week":
+        # Senin dari minggu ISO tersebut
+        return pd.to_datetime([f"{k // 100}-W{k % 100:02d}-1" for k in keys.tolist()], format="%G-W%V-%u")
+    if period == "month":
+        year, month = keys // 100, keys % 100
+    elif period == "quarter":
+        year, month = keys // 10, (keys % 10 - 1) * 3 + 1
+    elif period == "year":
+        year, month = keys, np.ones_like(keys)
+    else:
+        raise ValueError(f"unknown period: {period}")
+    return pd.DatetimeIndex(pd.to_datetime(pd.DataFrame({"year": year, "month": month, "day": 1})))
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from io import BytesIO
+
+from wordcloud import STOPWORDS, WordCloud
+
+# =============================================================================
+# WORDCLOUD
+# =============================================================================
+def wordcloud_frequencies(index, row_ids, max_words=120):
+    # Frekuensi unigram dari matriks n-gram; stopword Inggris dibuang seperti WordCloud.generate
+    pairs = index.top(row_ids, n=1, top_n=max_words + len(STOPWORDS))
+    return dict([(w, c) for w, c in pairs if w not in STOPWORDS][:max_words])
+
+def render_wordcloud(frequencies, bg_color, cmap, max_words=120):
+    if not frequencies:
+        return None
+    try:
+        wc = WordCloud(
+            width=1000,
+            height=560,
+            background_color=bg_color,
+            max_words=max_words,
+            prefer_horizontal=0.86,
+            colormap=cmap,
+            min_font_size=8,
+        ).generate_from_frequencies(frequencies)
+        buf = BytesIO()
+        wc.to_image().save(buf, format="PNG")
+        return buf.getvalue()
+    except Exception:
+        return None